@@ -1,9 +1,24 @@
+import time
+import logging
 from flask_restful import Resource
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from core.extensions import db
+from core.extensions import db, cache
 from datetime import datetime
-from database.models import Users, Orders, SpareParts, Reviews, ReviewReactions
+from database.models import Users, Orders, OrderItems, SpareParts, Reviews, ReviewReactions
+from sqlalchemy.orm import selectinload, contains_eager
+from apis.pagination import keyset_paginate, REVIEW_REACTIONS, ADMIN_REVIEWS
+from apis.serializers import SPAREPART
+from apis.streaming import wants_stream, stream_query, ndjson_response
+from database.catalog_import import import_format, import_spareparts
+from database.repricing import reprice_spareparts
+from database.reactions import viewer_reactions
+from apis.filters import sparepart_filters, review_moderation_filters
+from utils.snapshot import schedule_snapshot_refresh
+from core.routing import read_replica
+from utils.pool_metrics import pool_metrics
+
+logger = logging.getLogger(__name__)
 
      
  # ---------------------------------- Account Management ----------------------------------------------
@@ -119,10 +134,11 @@ class AdminSpareParts(Resource):
 
             db.session.add(spare)
             db.session.commit()
+            schedule_snapshot_refresh()
 
             return {
                 "message": "Spare part created successfully",
-                "sparepart": spare.to_dict()
+                "sparepart": SPAREPART(spare)
             }, 201
 
         except Exception as e:
@@ -170,10 +186,11 @@ class AdminSpareParts(Resource):
             spare.calculate_discount()
 
             db.session.commit()
+            schedule_snapshot_refresh()
 
             return {
                 "message": "Spare part updated successfully",
-                "sparepart": spare.to_dict()
+                "sparepart": SPAREPART(spare)
             }, 200
 
         except Exception as e:
@@ -197,6 +214,7 @@ class AdminSpareParts(Resource):
         try:
             db.session.delete(spare)
             db.session.commit()
+            schedule_snapshot_refresh()
 
             return {"message": "Spare part deleted successfully"}, 200
 
@@ -205,108 +223,302 @@ class AdminSpareParts(Resource):
             return {"error": str(e)}, 400
         
 
-class AdminReviewsResource(Resource):
+class AdminSparePartsImport(Resource):
     @jwt_required()
-    def get(self):
+    def post(self):
+        """Bulk import spare parts from a CSV or NDJSON upload (file field or raw body)"""
         current_user = Users.query.get(get_jwt_identity())
 
         if current_user.role not in ["admin", "super_admin"]:
             return {"error": "Admins only"}, 403
 
-        reviews = Reviews.query.order_by(Reviews.created_at.desc()).all()
-        result = []
+        upload = request.files.get("file")
+        if upload:
+            stream, mimetype, filename = upload.stream, upload.mimetype, upload.filename
+        else:
+            stream, mimetype, filename = request.stream, request.mimetype, None
 
-        for r in reviews:
-            r_dict = r.to_dict()
+        fmt = import_format(request.args.get("format"), mimetype, filename)
+        if fmt is None:
+            return {"error": "Upload a CSV or NDJSON file (or pass ?format=csv|ndjson)"}, 400
 
-            r_dict["sparepart_id"] = r.sparepart_id
+        report = import_spareparts(db.session, stream, fmt)
+        if report["inserted"]:
+            schedule_snapshot_refresh()
 
-            sparepart = r.spareparts
-            r_dict["sparepart_image"] = (
-                sparepart.image if sparepart and sparepart.image else None
-            )
+        return report, 201 if report["inserted"] else 400
 
-            user = r.users
-            r_dict["user_display_name"] = (
-                f"{r.user_display_name} ({user.email if user else 'unknown'})"
-            )
 
-            r_dict["total_likes"] = r.total_likes
-            r_dict["total_dislikes"] = r.total_dislikes
+class AdminSparePartsReprice(Resource):
+    @jwt_required()
+    def post(self):
+        """Reprice every part matching category / brand / vehicle_type in one UPDATE"""
+        current_user = Users.query.get(get_jwt_identity())
+
+        if current_user.role not in ["admin", "super_admin"]:
+            return {"error": "Admins only"}, 403
+
+        data = request.get_json() or {}
+
+        criteria = sparepart_filters({
+            name: data.get(name) for name in ("category", "brand", "vehicle_type", "match")
+        })
+        if not criteria:
+            return {"error": "At least one of category, brand or vehicle_type is required"}, 400
+
+        try:
+            value = float(data.get("value"))
+        except (TypeError, ValueError):
+            return {"error": "Invalid value"}, 400
 
-            # (ISO format timestamp)
-            r_dict["created_at"] = (
-                r.created_at.isoformat() if r.created_at else None
+        started = time.perf_counter()
+        try:
+            updated = reprice_spareparts(
+                db.session,
+                criteria,
+                mode=data.get("mode"),
+                value=value,
+                target=data.get("target") or "buying_price",
             )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        except Exception:
+            db.session.rollback()
+            # driver errors carry SQL and values: logged, not returned
+            logger.exception("Spare parts reprice failed")
+            return {"error": "Could not reprice spare parts"}, 500
 
-            r_dict["likes"] = [
-                {"user_id": l.user_id, "is_like": l.is_like}
-                for l in r.likes
-            ]
+        if updated:
+            schedule_snapshot_refresh()
 
-            result.append(r_dict)
+        return {
+            "message": "Spare parts repriced successfully",
+            "updated": updated,
+            "seconds": round(time.perf_counter() - started, 3),
+        }, 200
 
-        return result, 200
+
+def admin_review_dict(r):
+    """Flat review for the admin listings (users and spareparts must be eager loaded)."""
+    r_dict = r.to_lean_dict()
+
+    sparepart = r.spareparts
+    r_dict["sparepart_image"] = (
+        sparepart.image if sparepart and sparepart.image else None
+    )
+
+    user = r.users
+    r_dict["user_display_name"] = (
+        f"{r.user_display_name} ({user.email if user else 'unknown'})"
+    )
+
+    # (ISO format timestamp)
+    r_dict["created_at"] = (
+        r.created_at.isoformat() if r.created_at else None
+    )
+
+    return r_dict
+
+def admin_reviews_query():
+    # author and part come from the same joined query, and only the columns
+    # admin_review_dict reads (not the users' hashes / OTPs or the part rows)
+    return (
+        Reviews.query
+        .join(Reviews.users)
+        .join(Reviews.spareparts)
+        .options(
+            contains_eager(Reviews.users).load_only(Users.email),
+            contains_eager(Reviews.spareparts).load_only(SpareParts.image),
+        )
+    )
+
+class AdminReviewsResource(Resource):
+    @jwt_required()
+    @read_replica
+    def get(self):
+        """Moderation feed, newest first (?cursor=, ?per_page=, filters in review_moderation_filters)"""
+        current_user = Users.query.get(get_jwt_identity())
+
+        if current_user.role not in ["admin", "super_admin"]:
+            return {"error": "Admins only"}, 403
+
+        try:
+            criteria = review_moderation_filters(request.args)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        query = admin_reviews_query().filter(*criteria)
+
+        if wants_stream():
+            # the whole filtered feed, one review per line
+            query = query.order_by(Reviews.created_at.desc(), Reviews.id.desc())
+            return ndjson_response(stream_query(query), admin_review_dict)
+
+        # moderation feed: newest first, keyset pages on (created_at, id)
+        per_page = min(max(request.args.get("per_page", 50, type=int), 1), 200)
+        try:
+            reviews, next_cursor = keyset_paginate(
+                query,
+                [Reviews.created_at, Reviews.id],
+                cursor=request.args.get("cursor"),
+                per_page=per_page,
+                descending=True,
+                scope=ADMIN_REVIEWS,
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
+        return {
+            "items": [admin_review_dict(r) for r in reviews],
+            "next_cursor": next_cursor,
+            "per_page": per_page,
+        }, 200
     
 class AdminReviewsBySparePartResource(Resource):
     @jwt_required()
+    @read_replica
     def get(self, sparepart_id):
         """Fetch all reviews for a given spare part (admin only)"""
         current_user = Users.query.get(get_jwt_identity())
         if current_user.role not in ["admin", "super_admin"]:
             return {"error": "Unauthorized"}, 403
 
-        reviews = Reviews.query.filter_by(sparepart_id=sparepart_id).order_by(Reviews.id.desc()).all()
-        result = []
+        # newest first on the (sparepart_id, created_at, id) index
+        reviews = (
+            admin_reviews_query()
+            .filter(Reviews.sparepart_id == sparepart_id)
+            .order_by(Reviews.created_at.desc(), Reviews.id.desc())
+            .all()
+        )
+
+        # the admin's own reactions, in one query
+        mine = viewer_reactions(db.session, current_user.id, [r.id for r in reviews])
 
+        result = []
         for r in reviews:
-            r_dict = r.to_dict()
-            r_dict["sparepart_id"] = r.sparepart_id
-            user = r.users
-            r_dict["user_display_name"] = f"{r.user_display_name} ({user.email if user else 'unknown'})"
-            r_dict["total_likes"] = r.total_likes
-            r_dict["total_dislikes"] = r.total_dislikes
-            r_dict["likes"] = [{"user_id": l.user_id, "is_like": l.is_like} for l in r.likes]
+            r_dict = admin_review_dict(r)
+            r_dict["my_reaction"] = mine.get(r.id)
             result.append(r_dict)
 
         return result, 200
     
 class AdminReviewReactionsResource(Resource):
     @jwt_required()
+    @read_replica
     def get(self, review_id):
+        """One page of the reactions on a review (?per_page=, ?cursor=), admins only"""
         current_user_id = get_jwt_identity()
         current_user = Users.query.get(current_user_id)
 
-        if current_user.role not in ["admin", "superadmin"]:
+        if current_user.role not in ["admin", "super_admin"]:
             return {"error": "Unauthorized"}, 403
 
         review = Reviews.query.get_or_404(review_id)
 
-        reactions = ReviewReactions.query.filter_by(review_id=review.id).all()
+        per_page = min(max(request.args.get("per_page", 50, type=int), 1), 200)
+
+        # keyset pages on the (review_id, id) index; totals come from the
+        # review's counters instead of counting the rows
+        query = (
+            ReviewReactions.query
+            .options(selectinload(ReviewReactions.users))
+            .filter(ReviewReactions.review_id == review.id)
+        )
+        try:
+            reactions, next_cursor = keyset_paginate(
+                query,
+                [ReviewReactions.id],
+                cursor=request.args.get("cursor"),
+                per_page=per_page,
+                scope=REVIEW_REACTIONS,
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
+
         reaction_list = [
             {
                 "user_id": r.user_id,
-                "username": r.users.username,  
+                "user_display_name": r.users.display_name if r.users else "unknown",
+                "email": r.users.email if r.users else None,
                 "is_like": r.is_like
             }
             for r in reactions
         ]
 
-        total_likes = sum(1 for r in reactions if r.is_like)
-        total_dislikes = sum(1 for r in reactions if not r.is_like)
-
         return {
             "review_id": review.id,
-            "review_text": review.text,
-            "total_likes": total_likes,
-            "total_dislikes": total_dislikes,
-            "reactions": reaction_list
+            "total_likes": review.total_likes or 0,
+            "total_dislikes": review.total_dislikes or 0,
+            "reactions": reaction_list,
+            "next_cursor": next_cursor,
+            "per_page": per_page,
         }, 200
     
+# ------------------------------ Cache Stats -------------------------------------------
+class AdminCacheStats(Resource):
+    @jwt_required()
+    def get(self):
+        current_user = Users.query.get(get_jwt_identity())
+
+        if current_user.role not in ["admin", "super_admin"]:
+            return {"error": "Admins only"}, 403
+
+        return cache.stats(), 200
+
+class AdminPoolStats(Resource):
+    @jwt_required()
+    def get(self):
+        """Connection pool usage per database (primary and replicas)"""
+        current_user = Users.query.get(get_jwt_identity())
+
+        if current_user.role not in ["admin", "super_admin"]:
+            return {"error": "Admins only"}, 403
+
+        return {"engines": pool_metrics(db.engines)}, 200
+
  # ------------------------------ Orders Management -------------------------------------------
+def order_summary(order):
+    # Dynamically calculates total price from order_items
+    total_price = sum(float(item.subtotal) for item in order.order_items)
+
+    order_data = {
+        "id": order.id,
+        "status": order.status,
+        "paid": order.paid,
+        "total_items": sum(item.quantity for item in order.order_items),
+        "total_price": total_price,  
+
+        "address": f"{order.street}, {order.city}, {order.country}",
+
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+        "shipped_at": order.shipped_at.isoformat() if order.shipped_at else None,
+        "delivered_at": order.delivered_at.isoformat() if order.delivered_at else None,
+
+        # Order items
+        "order_items": [
+            {
+                "id": item.id,
+                "quantity": item.quantity,
+                "price": float(item.unit_price),
+                "subtotal": float(item.subtotal),
+                "sparepart": {
+                    "id": item.sparepart.id,
+                    "brand": item.sparepart.brand,
+                    "category": item.sparepart.category,
+                    "vehicle_type": item.sparepart.vehicle_type,
+                    "image_url": item.sparepart.image
+                }
+            }
+            for item in order.order_items
+        ]
+    }
+
+    return order_data
+
 class AdminOrders(Resource):
     # View all orders (admin and super_admin only)
     @jwt_required()
+    @read_replica
     def get(self):
         current_user = Users.query.get(get_jwt_identity())
 
@@ -314,50 +526,16 @@ class AdminOrders(Resource):
             return {"error": "Admins only"}, 403
 
         # Fetch all orders, newest first
-        orders = Orders.query.order_by(Orders.created_at.desc()).all()
-
-        summary = []
-
-        for order in orders:
-
-            # Dynamically calculates total price from order_items
-            total_price = sum(float(item.subtotal) for item in order.order_items)
-
-            order_data = {
-                "id": order.id,
-                "status": order.status,
-                "paid": order.paid,
-                "total_items": sum(item.quantity for item in order.order_items),
-                "total_price": total_price,  
-
-                "address": f"{order.street}, {order.city}, {order.country}",
-
-                "created_at": order.created_at.isoformat() if order.created_at else None,
-                "shipped_at": order.shipped_at.isoformat() if order.shipped_at else None,
-                "delivered_at": order.delivered_at.isoformat() if order.delivered_at else None,
-
-                # Order items
-                "order_items": [
-                    {
-                        "id": item.id,
-                        "quantity": item.quantity,
-                        "price": float(item.unit_price),
-                        "subtotal": float(item.subtotal),
-                        "sparepart": {
-                            "id": item.sparepart.id,
-                            "brand": item.sparepart.brand,
-                            "category": item.sparepart.category,
-                            "vehicle_type": item.sparepart.vehicle_type,
-                            "image_url": item.sparepart.image
-                        }
-                    }
-                    for item in order.order_items
-                ]
-            }
+        query = (
+            Orders.query
+            .options(selectinload(Orders.order_items).selectinload(OrderItems.sparepart))
+            .order_by(Orders.created_at.desc())
+        )
 
-            summary.append(order_data)
+        if wants_stream():
+            return ndjson_response(stream_query(query), order_summary)
 
-        return {"orders": summary}, 200
+        return {"orders": [order_summary(order) for order in query.all()]}, 200
 
     # Update order status
     @jwt_required()
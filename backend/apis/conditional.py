@@ -0,0 +1,31 @@
+from flask import request, current_app, Response
+from utils.cache import params_digest
+
+# ------------------ Conditional GET (ETag / If-None-Match) ------------------
+
+
+def catalog_etag(namespace, params, version):
+    """Strong ETag for a catalog read: catalog version + normalized request params."""
+    return f"{namespace}-v{version}-{params_digest(params)[:16]}"
+
+
+def part_etag(part_id, version, params=None):
+    """Strong ETag for a part detail: part version (+ any params shaping the body)."""
+    etag = f"part-{part_id}-v{version}"
+    return f"{etag}-{params_digest(params)[:16]}" if params else etag
+
+
+def cache_headers(etag):
+    return {
+        "ETag": f'"{etag}"',
+        "Cache-Control": current_app.config.get("CATALOG_CACHE_CONTROL", "public, max-age=0, must-revalidate"),
+    }
+
+
+def is_not_modified(etag):
+    """True when the client's If-None-Match already holds this (strong) ETag."""
+    return request.if_none_match.contains(etag)
+
+
+def not_modified(etag):
+    return Response(status=304, headers=cache_headers(etag))
@@ -0,0 +1,100 @@
+from sqlalchemy import select, func, literal, union_all, tuple_
+from database.models import SpareParts
+
+FACETS = ("category", "brand", "vehicle_type", "colour", "price")
+
+# facet -> column of the filtered subquery holding its display label
+LABELS = {
+    "category": "category_label",
+    "brand": "brand_label",
+    "vehicle_type": "vehicle_type",
+    "colour": "colour_label",
+    "price": "price",
+}
+
+
+def _filtered_subquery(criteria):
+    return (
+        select(
+            SpareParts.category_key.label("category"),
+            SpareParts.category.label("category_label"),
+            SpareParts.brand_key.label("brand"),
+            SpareParts.brand.label("brand_label"),
+            SpareParts.vehicle_type.label("vehicle_type"),
+            SpareParts.colour_key.label("colour"),
+            SpareParts.colour.label("colour_label"),
+            SpareParts.price_bucket.label("price"),
+        )
+        .where(*criteria)
+        .subquery("filtered")
+    )
+
+
+def _grouping_sets_rows(session, sub):
+    """Postgres: one scan, one GROUP BY GROUPING SETS ((category), (brand), ..., ())."""
+    columns = [sub.c[name] for name in FACETS]
+
+    stmt = select(
+        *columns,
+        *[func.min(sub.c[LABELS[name]]).label(f"{name}_label") for name in FACETS],
+        *[func.grouping(sub.c[name]).label(f"{name}_grouping") for name in FACETS],
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*columns, tuple_()))
+
+    for row in session.execute(stmt).mappings():
+        facet = next((name for name in FACETS if row[f"{name}_grouping"] == 0), None)
+        if facet is None:
+            yield None, None, None, row["count"]
+        else:
+            yield facet, row[facet], row[f"{facet}_label"], row["count"]
+
+
+def _union_rows(session, sub):
+    """Other databases: the same groups as one UNION ALL statement (single round trip)."""
+    branches = [
+        select(
+            literal(name).label("facet"),
+            sub.c[name].label("value"),
+            func.min(sub.c[LABELS[name]]).label("label"),
+            func.count().label("count"),
+        ).group_by(sub.c[name])
+        for name in FACETS
+    ]
+    branches.append(
+        select(
+            literal(None).label("facet"),
+            literal(None).label("value"),
+            literal(None).label("label"),
+            func.count().label("count"),
+        ).select_from(sub)
+    )
+
+    for row in session.execute(union_all(*branches)):
+        yield row.facet, row.value, row.label, row.count
+
+
+def facet_counts(session, criteria):
+    """
+    Counts per category, brand, vehicle type, colour and price bucket for the
+    rows matching `criteria` (the same criteria the listing uses).
+    """
+    sub = _filtered_subquery(criteria)
+
+    if session.get_bind().dialect.name == "postgresql":
+        rows = _grouping_sets_rows(session, sub)
+    else:
+        rows = _union_rows(session, sub)
+
+    facets = {name: [] for name in FACETS}
+    total = 0
+
+    for facet, value, label, count in rows:
+        if facet is None:
+            total = count
+        elif value is not None:
+            facets[facet].append({"value": value, "label": label, "count": count})
+
+    for values in facets.values():
+        values.sort(key=lambda v: (-v["count"], v["value"]))
+
+    return {"total": total, "facets": facets}
@@ -0,0 +1,206 @@
+from datetime import datetime
+from sqlalchemy import or_
+from database.models import SpareParts, Reviews, normalize_key
+from database.price_buckets import PRICE_BUCKETS
+from apis.pagination import REVIEWS_NEWEST
+
+# ---------------- Filter Match Modes ----------------
+#   exact    -> equality on the normalized key columns (default, index friendly)
+#   prefix   -> range scan on the normalized key columns (index friendly)
+#   contains -> legacy substring match (full scan, kept for free typing)
+MATCH_MODES = ("exact", "prefix", "contains")
+
+# Query arg -> normalized column used for filtering
+FILTER_COLUMNS = {
+    "category": SpareParts.category_key,
+    "brand": SpareParts.brand_key,
+    "vehicle_type": SpareParts.vehicle_type,
+    "colour": SpareParts.colour_key,
+}
+
+def _prefix_upper_bound(value):
+    """Smallest string greater than every string starting with value."""
+    return value[:-1] + chr(ord(value[-1]) + 1)
+
+
+def _match(column, value, mode):
+    if mode == "prefix":
+        # A closed range instead of LIKE 'x%' so the btree is usable
+        # regardless of the database collation / case_sensitive_like.
+        return [column >= value, column < _prefix_upper_bound(value)]
+
+    if mode == "contains":
+        return [column.like(f"%{value}%")]
+
+    return [column == value]
+
+
+def normalize_filter_args(args):
+    """Extract the catalog filter args as normalized values."""
+    match = (args.get("match") or "exact").lower()
+    if match not in MATCH_MODES:
+        match = "exact"
+
+    filters = {
+        name: normalize_key(args.get(name))
+        for name in FILTER_COLUMNS
+    }
+
+    return {
+        "match": match,
+        "price": (args.get("price") or "").lower() or None,
+        **filters,
+    }
+
+
+def sparepart_filters(args):
+    """
+    Build the SQLAlchemy criteria for a catalog listing.
+
+    Returns a list of criteria, so the same filters can be applied to an
+    ORM query (query.filter(*criteria)) or to a Core select.
+    """
+    params = normalize_filter_args(args)
+    mode = params["match"]
+    criteria = []
+
+    # ---------------- Basic Filters ----------------
+    for name, column in FILTER_COLUMNS.items():
+        value = params[name]
+        if value:
+            criteria.extend(_match(column, value, mode))
+
+    # ---------------- Price Filter ----------------
+    # Stored per part (quantiles per category + vehicle type), so this is an
+    # equality on the (category_key, vehicle_type, price_bucket) index
+    if params["price"] in PRICE_BUCKETS:
+        criteria.append(SpareParts.price_bucket == params["price"])
+
+    return criteria
+
+
+# ---------------- Sorting ----------------
+# ?sort=price|-price|rating|-rating ; id is always the tie breaker so the
+# order is total (required by keyset cursors)
+SORT_COLUMNS = {
+    "price": SpareParts.buying_price,
+    "rating": SpareParts.average_rating,
+}
+
+DEFAULT_SORT = "price"
+
+
+def sparepart_ordering(args):
+    """Return (sort_name, columns, descending) for the requested sort."""
+    sort = (args.get("sort") or DEFAULT_SORT).lower()
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+
+    if name not in SORT_COLUMNS:
+        name, descending = DEFAULT_SORT, False
+
+    sort_name = f"-{name}" if descending else name
+    return sort_name, [SORT_COLUMNS[name], SpareParts.id], descending
+
+
+# ---------------- Review Sorting ----------------
+# ?sort=newest|oldest|highest|lowest|helpful -> (columns, descending); each
+# one is backed by a (sparepart_id, <columns>) index on reviews.
+# highest / lowest only list rated reviews (comment-only reviews have no rating).
+REVIEW_SORTS = {
+    "newest": ([Reviews.created_at, Reviews.id], True),
+    "oldest": ([Reviews.created_at, Reviews.id], False),
+    "highest": ([Reviews.rating, Reviews.created_at, Reviews.id], True),
+    "lowest": ([Reviews.rating, Reviews.created_at, Reviews.id], False),
+    "helpful": ([Reviews.total_likes, Reviews.created_at, Reviews.id], True),
+}
+
+DEFAULT_REVIEW_SORT = "newest"
+
+
+def review_ordering(args):
+    """Return (sort_name, columns, descending, criteria, cursor_scope) for the requested review sort."""
+    sort = (args.get("sort") or DEFAULT_REVIEW_SORT).lower()
+    if sort not in REVIEW_SORTS:
+        sort = DEFAULT_REVIEW_SORT
+
+    columns, descending = REVIEW_SORTS[sort]
+    criteria = [Reviews.rating.isnot(None)] if sort in ("highest", "lowest") else []
+
+    # newest shares its cursors with the part detail review pages
+    scope = REVIEWS_NEWEST if sort == "newest" else f"reviews:{sort}"
+    return sort, columns, descending, criteria, scope
+
+
+# ---------------- Review Moderation Filters ----------------
+# Admin feed (newest first, keyset on created_at, id). Each filter has an
+# index starting with its column and ending in (created_at, id):
+#   sparepart_id -> ix_reviews_sparepart_created / ix_reviews_sparepart_rating
+#   user_id      -> ix_reviews_user_created
+#   min/max_rating -> ix_reviews_rating_created
+#   since / until, has_comment, no filter -> ix_reviews_created
+def _parse_date(value, name):
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name} (expected an ISO date or datetime)")
+
+
+def _parse_rating(value, name):
+    if not value:
+        return None
+    try:
+        rating = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}")
+    if not 1 <= rating <= 5:
+        raise ValueError(f"{name} must be between 1 and 5")
+    return rating
+
+
+def review_moderation_filters(args):
+    """
+    Criteria for the admin review feed:
+    ?min_rating= / ?max_rating= (1-5), ?since= / ?until= (ISO, until is
+    exclusive), ?sparepart_id=, ?user_id=, ?has_comment=1|0.
+    Raises ValueError for malformed values.
+    """
+    criteria = []
+
+    min_rating = _parse_rating(args.get("min_rating"), "min_rating")
+    if min_rating is not None:
+        criteria.append(Reviews.rating >= min_rating)
+    max_rating = _parse_rating(args.get("max_rating"), "max_rating")
+    if max_rating is not None:
+        criteria.append(Reviews.rating <= max_rating)
+
+    if args.get("since"):
+        criteria.append(Reviews.created_at >= _parse_date(args["since"], "since"))
+    if args.get("until"):
+        criteria.append(Reviews.created_at < _parse_date(args["until"], "until"))
+
+    if args.get("sparepart_id"):
+        criteria.append(Reviews.sparepart_id == args["sparepart_id"])
+    if args.get("user_id"):
+        criteria.append(Reviews.user_id == args["user_id"])
+
+    has_comment = args.get("has_comment")
+    if has_comment in ("1", "true"):
+        criteria.extend([Reviews.comment.isnot(None), Reviews.comment != ""])
+    elif has_comment in ("0", "false"):
+        criteria.append(or_(Reviews.comment.is_(None), Reviews.comment == ""))
+
+    return criteria
+
+
+def catalog_cache_params(args):
+    """Everything that shapes a listing response, normalized for cache keys."""
+    sort, _, _ = sparepart_ordering(args)
+    return {
+        **normalize_filter_args(args),
+        "page": args.get("page", 1, type=int),
+        "per_page": args.get("per_page", 16, type=int),
+        "cursor": args.get("cursor"),
+        "sort": sort if (args.get("sort") or "cursor" in args) else None,
+        "include_total": bool(args.get("include_total", type=int)),
+    }
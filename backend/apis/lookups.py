@@ -0,0 +1,26 @@
+from database.models import SpareParts
+
+# ------------------ Batch Lookups ------------------
+# Loading many parts by id (cart hydration, checkout) with one IN query
+# instead of one query per id.
+
+# ids per IN (...) list; stays under the bound parameter limit of older SQLite builds
+IN_CHUNK_SIZE = 500
+
+
+def load_spareparts(ids, options=()):
+    """
+    Spare parts for `ids`, in the order asked for (repeated ids once),
+    plus the ids that do not exist: (parts, missing_ids).
+    """
+    ids = list(dict.fromkeys(str(i) for i in ids if i))
+
+    found = {}
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        chunk = ids[start:start + IN_CHUNK_SIZE]
+        query = SpareParts.query.options(*options).filter(SpareParts.id.in_(chunk))
+        found.update((part.id, part) for part in query)
+
+    parts = [found[i] for i in ids if i in found]
+    missing = [i for i in ids if i not in found]
+    return parts, missing
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_, DateTime
+
+
+# Cursor scopes shared by every endpoint paging the same ordering
+REVIEWS_NEWEST = "reviews:newest"
+REVIEW_REACTIONS = "review:reactions"
+ADMIN_REVIEWS = "admin:reviews"
+
+
+# ---------------- Opaque Cursors ----------------
+def encode_cursor(values, scope=None):
+    """Encode the last row's sort values (plus a scope label) as a url-safe token."""
+    payload = json.dumps(
+        {"s": scope, "v": [v.isoformat() if isinstance(v, datetime) else v for v in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, scope=None):
+    """Inverse of encode_cursor. Raises ValueError for tampered or foreign cursors."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        values = payload["v"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if payload.get("s") != scope or not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+# ---------------- Keyset Pagination ----------------
+def keyset_paginate(query, columns, cursor=None, per_page=16, descending=False, scope=None):
+    """
+    Fetch one page ordered by `columns` (last column must be unique, eg. id).
+
+    Instead of OFFSET, the page starts right after the row the cursor points
+    at: WHERE (col1, col2) > (:v1, :v2) ORDER BY col1, col2 LIMIT n+1.
+    Every page therefore costs the same index range scan.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        values = decode_cursor(cursor, scope)
+        if len(values) != len(columns):
+            raise ValueError("Invalid cursor")
+
+        values = [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) and v is not None else v
+            for col, v in zip(columns, values)
+        ]
+
+        key, bound = tuple_(*columns), tuple_(*values)
+        query = query.filter(key < bound if descending else key > bound)
+
+    query = query.order_by(*[c.desc() if descending else c.asc() for c in columns])
+
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page and items:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns], scope)
+
+    return items, next_cursor
@@ -1,11 +1,27 @@
 from flask_restful import Resource
-from flask import request
+import os
+import gzip
+from flask import request, abort, send_file, Response, current_app
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, verify_jwt_in_request,get_jwt_identity
 from datetime import timedelta
-from core.extensions import db
+from core.extensions import db, cache
 from utils.tasks import send_email_task
 from datetime import datetime
-from database.models import Users, SpareParts, Orders, Reviews, ReviewReactions
+from database.models import Users, SpareParts, Orders, Reviews
+from apis.filters import sparepart_filters, sparepart_ordering, review_ordering, catalog_cache_params, normalize_filter_args
+from apis.facets import facet_counts
+from apis.pagination import keyset_paginate, REVIEWS_NEWEST
+from apis.lookups import load_spareparts
+from database.search import SEARCH_FIELDS, tokenize, search_sparepart_ids
+from database.suggest import suggestions
+from database.reactions import toggle_reaction, viewer_reactions
+from database.review_stats import histogram
+from sqlalchemy import or_, select
+from sqlalchemy.orm import selectinload
+from apis.conditional import catalog_etag, part_etag, cache_headers, is_not_modified, not_modified
+from apis.serializers import SPAREPART_WITHOUT_REVIEWS, REVIEW
+from utils.snapshot import ENCODINGS, current_snapshot, snapshot_dir
+from core.routing import read_replica
 
 # ------------------ Auth ------------------
 class Register(Resource):
@@ -253,90 +269,124 @@ class DeleteAccount(Resource):
 # ------------------ Spare Parts ------------------
 class SparePartsList(Resource):
     @jwt_required(optional=True)
+    @read_replica
     def get(self, part_id=None):
 
         # ---------------- Single Item ----------------
         if part_id:
-            part = SpareParts.query.get_or_404(part_id)
-            result = part.to_dict()
-            result["reviews"] = [r.to_dict() for r in part.reviews]
-            return result, 200
-
-        args = request.args
-        page = args.get("page", 1, type=int)
-        per_page = args.get("per_page", 16, type=int)
+            # Version lookup only: a matching If-None-Match never loads the part
+            version = db.session.execute(
+                select(SpareParts.version).where(SpareParts.id == part_id)
+            ).scalar()
+            if version is None:
+                abort(404)
 
-        query = SpareParts.query
+            reviews_cursor = request.args.get("reviews_cursor")
+            reviews_limit = min(max(request.args.get("reviews_limit", 10, type=int), 1), 50)
 
-        # ---------------- Basic Filters ----------------
-        category = (args.get("category") or "").lower()
-        vehicle_type = (args.get("vehicle_type") or "").lower()
-        brand = args.get("brand")
-        colour = args.get("colour")
+            etag = part_etag(part_id, version, {"cursor": reviews_cursor, "limit": reviews_limit})
+            if is_not_modified(etag):
+                return not_modified(etag)
 
-        if category:
-            query = query.filter(SpareParts.category.ilike(f"%{category}%"))
+            part = SpareParts.query.get_or_404(part_id)
 
-        if brand:
-            query = query.filter(SpareParts.brand.ilike(f"%{brand}%"))
+            # One bounded page of reviews (newest first) instead of every review
+            # with its nested user / reactions; authors come in one extra query.
+            reviews_query = (
+                Reviews.query
+                .options(selectinload(Reviews.users))
+                .filter(Reviews.sparepart_id == part.id)
+            )
+            try:
+                reviews, next_cursor = keyset_paginate(
+                    reviews_query,
+                    [Reviews.created_at, Reviews.id],
+                    cursor=reviews_cursor,
+                    per_page=reviews_limit,
+                    descending=True,
+                    scope=REVIEWS_NEWEST,
+                )
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            result = SPAREPART_WITHOUT_REVIEWS(part)
+            result["reviews"] = [r.to_lean_dict() for r in reviews]
+            result["reviews_next_cursor"] = next_cursor
+            result["rating_summary"] = {
+                "average_rating": part.average_rating,
+                "total_reviews": part.total_reviews,
+                "histogram": histogram(part),
+            }
+            return result, 200, cache_headers(etag)
 
-        if vehicle_type:
-            query = query.filter(SpareParts.vehicle_type.ilike(f"%{vehicle_type}%"))
+        args = request.args
+        params = catalog_cache_params(args)
+        version = cache.catalog_version()
+
+        # ---------------- Conditional GET ----------------
+        etag = catalog_etag("spareparts", params, version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        # ---------------- Response Cache ----------------
+        # Keyed on the normalized args and scoped to the catalog version,
+        # so any spare part write invalidates it.
+        cache_key = cache.make_key("spareparts", params, version)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, 200, {"X-Cache": "HIT", **cache_headers(etag)}
+
+        result, status = self._list(args)
+        if status != 200:
+            return result, status
+
+        cache.set(cache_key, result)
+        return result, status, {"X-Cache": "MISS", **cache_headers(etag)}
+
+    def _list(self, args):
+        # Listing items carry the part's totals but no reviews: a review or a
+        # reaction would otherwise leave stale copies in every cached page
+        page = args.get("page", 1, type=int)
+        per_page = args.get("per_page", 16, type=int)
 
-        if colour:
-            query = query.filter(SpareParts.colour.ilike(f"%{colour}%"))
+        # Filters run on the normalized, indexed key columns
+        # (?match=exact|prefix|contains, exact by default)
+        query = SpareParts.query.filter(*sparepart_filters(args))
 
-        # ---------------- Price Filter (Category + Vehicle Type aware) ----------------
-        price_filter = args.get("price")
+        # ---------------- Keyset Pagination (opt-in) ----------------
+        # ?cursor= (empty for the first page) switches to cursor mode:
+        # no COUNT(*) and no OFFSET, so every page costs the same.
+        if "cursor" in args:
+            sort, columns, descending = sparepart_ordering(args)
 
-        PRICE_RANGES = {
-            "tyre": {
-                "sedan": {"low": 15000, "medium": 30000},
-                "suv": {"low": 25000, "medium": 40000},
-                "truck": {"low": 35000, "medium": 45000},
-                "bus": {"low": 25000, "medium": 30000},
-            },
-            "rim": {
-                "sedan": {"low": 20000, "medium": 30000},
-                "suv": {"low": 25000, "medium": 35000},
-                "truck": {"low": 30000, "medium": 35000},
-                "bus": {"low": 25000, "medium": 30000},
-            },
-            "battery": {
-                "sedan": {"low": 20000, "medium": 30000},
-                "suv": {"low": 26000, "medium": 35000},
-                "truck": {"low": 26000, "medium": 35000},
-                "bus": {"low": 35000, "medium": 40000},
-            },
-            "oil filter": {
-                "default": {"low": 7500, "medium": 8500},
+            try:
+                items, next_cursor = keyset_paginate(
+                    query,
+                    columns,
+                    cursor=args.get("cursor"),
+                    per_page=max(per_page, 1),
+                    descending=descending,
+                    scope=sort,
+                )
+            except ValueError as e:
+                return {"error": str(e)}, 400
+
+            result = {
+                "items": SPAREPART_WITHOUT_REVIEWS.many(items),
+                "next_cursor": next_cursor,
+                "per_page": per_page,
+                "sort": sort,
             }
-        }
 
-        ranges = None
-        category_ranges = PRICE_RANGES.get(category)
+            # The total is optional in cursor mode
+            if args.get("include_total", type=int):
+                result["total"] = query.order_by(None).count()
 
-        if category_ranges:
-            ranges = (
-                category_ranges.get(vehicle_type)
-                or category_ranges.get("default")
-            )
-
-        if price_filter and ranges:
-            low = ranges["low"]
-            medium = ranges["medium"]
-
-            if price_filter == "low":
-                query = query.filter(SpareParts.buying_price < low)
-
-            elif price_filter == "medium":
-                query = query.filter(
-                    SpareParts.buying_price >= low,
-                    SpareParts.buying_price <= medium
-                )
+            return result, 200
 
-            elif price_filter == "high":
-                query = query.filter(SpareParts.buying_price > medium)
+        if args.get("sort"):
+            _, columns, descending = sparepart_ordering(args)
+            query = query.order_by(*[c.desc() if descending else c.asc() for c in columns])
 
         # ---------------- Pagination ----------------
         pagination = query.paginate(
@@ -346,35 +396,184 @@ class SparePartsList(Resource):
         )
 
         return {
-            "items": [p.to_dict() for p in pagination.items],
+            "items": SPAREPART_WITHOUT_REVIEWS.many(pagination.items),
             "total": pagination.total,
             "page": pagination.page,
             "pages": pagination.pages
         }, 200
     
+class SparePartsFacets(Resource):
+    @read_replica
+    def get(self):
+        """Filter counts (category, brand, vehicle type, colour, price bucket) for the current filters"""
+        args = request.args
+
+        cache_key = cache.make_key("spareparts-facets", normalize_filter_args(args))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, 200, {"X-Cache": "HIT"}
+
+        # Same criteria as the /spareparts listing, so the counts always match it
+        result = facet_counts(db.session, sparepart_filters(args))
+        cache.set(cache_key, result)
+
+        return result, 200, {"X-Cache": "MISS"}
+
+class SparePartsSearch(Resource):
+    def get(self):
+        """Ranked full text search over brand, category, vehicle type, colour and description"""
+        args = request.args
+        q = " ".join(tokenize(args.get("q")))
+        if not q:
+            return {"error": "Search query (q) is required"}, 400
+
+        limit = min(max(args.get("limit", 16, type=int), 1), 100)
+        offset = max(args.get("offset", 0, type=int), 0)
+
+        cache_key = cache.make_key("spareparts-search", {"q": q, "limit": limit, "offset": offset})
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached, 200, {"X-Cache": "HIT"}
+
+        ids = search_sparepart_ids(db.session.connection(), q, limit=limit, offset=offset)
+
+        if ids is None:
+            # No inverted index on this database: every token must appear in one of the fields
+            query = SpareParts.query
+            for token in q.split():
+                query = query.filter(or_(*[
+                    getattr(SpareParts, field).ilike(f"%{token}%") for field in SEARCH_FIELDS
+                ]))
+            parts = query.order_by(SpareParts.id).offset(offset).limit(limit).all()
+        else:
+            # keep the rank order of the index
+            by_id = {p.id: p for p in SpareParts.query.filter(SpareParts.id.in_(ids)).all()} if ids else {}
+            parts = [by_id[i] for i in ids if i in by_id]
+
+        result = {
+            "query": q,
+            "items": SPAREPART_WITHOUT_REVIEWS.many(parts),
+            "limit": limit,
+            "offset": offset,
+        }
+        cache.set(cache_key, result)
+
+        return result, 200, {"X-Cache": "MISS"}
+
+class SparePartsBatch(Resource):
+    MAX_IDS = 500
+
+    @read_replica
+    def get(self):
+        """Many parts at once (cart hydration): ?ids=a,b,c in request order, unknown ids listed in `missing`"""
+        ids = [
+            part_id.strip()
+            for value in request.args.getlist("ids")
+            for part_id in value.split(",")
+            if part_id.strip()
+        ]
+        if not ids:
+            return {"error": "ids is required"}, 400
+        if len(ids) > self.MAX_IDS:
+            return {"error": f"At most {self.MAX_IDS} ids per request"}, 400
+
+        parts, missing = load_spareparts(ids)
+
+        return {"items": SPAREPART_WITHOUT_REVIEWS.many(parts), "missing": missing}, 200
+
+class SparePartsSuggest(Resource):
+    def get(self):
+        """Typeahead: popular brands, categories and brand + category + vehicle type phrases for a prefix"""
+        prefix = request.args.get("prefix", "")
+        limit = min(max(request.args.get("limit", 8, type=int), 1), 20)
+
+        # only touches the database (even a pool checkout) to build the index:
+        # first call / periodic rebuild
+        suggestions.ensure_built(db.session.connection, current_app.config.get("SUGGEST_REBUILD_SECONDS"))
+
+        return {"prefix": prefix, "suggestions": suggestions.suggest(prefix, limit)}, 200
+
+class SparePartsSnapshot(Resource):
+    def get(self):
+        """The whole public catalog as one pre-compressed JSON file (for client side filtering)"""
+        manifest = current_snapshot(db.session, cache.catalog_version())
+
+        encoding = next(
+            (e for e in ENCODINGS if e in manifest["files"] and request.accept_encodings[e]),
+            None,
+        )
+
+        etag = f"snapshot-{manifest['sha256'][:32]}-{encoding or 'identity'}"
+        if is_not_modified(etag):
+            return not_modified(etag)
+
+        path = os.path.join(snapshot_dir(), manifest["files"][encoding or "gzip"])
+
+        if encoding:
+            # file handed to the server as is (wsgi.file_wrapper / X-Sendfile)
+            response = send_file(path, mimetype="application/json", etag=False, conditional=False)
+            response.headers["Content-Encoding"] = encoding
+        else:
+            # rare: client without gzip support
+            def decompressed():
+                with gzip.open(path, "rb") as f:
+                    yield from iter(lambda: f.read(64 * 1024), b"")
+
+            response = Response(decompressed(), mimetype="application/json")
+
+        response.headers.update(cache_headers(etag))
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["X-Catalog-Version"] = str(manifest["version"])
+        return response
+
 # ------------------ Reviews ------------------
 class ReviewsResource(Resource):
+    @jwt_required(optional=True)
+    @read_replica
     def get(self, part_id):
-        """Get all reviews for a spare part"""
+        """One page of a spare part's reviews (?sort=newest|oldest|highest|lowest|helpful, ?cursor=)"""
         part = SpareParts.query.get_or_404(part_id)
-        reviews = Reviews.query.filter_by(sparepart_id=part.id).order_by(Reviews.id.desc()).all()
 
-        result = []
-        for r in reviews:
-            r_dict = r.to_dict()
-            # Use property to get proper display name
-            r_dict["user_display_name"] = r.user_display_name
+        per_page = min(max(request.args.get("per_page", 20, type=int), 1), 100)
+        sort, columns, descending, criteria, scope = review_ordering(request.args)
 
-            # Include total likes/dislikes
-            r_dict["total_likes"] = r.total_likes
-            r_dict["total_dislikes"] = r.total_dislikes
+        # keyset pages on (sparepart_id, <sort columns>, id) indexes: the first
+        # page costs the same with 10 or 10k reviews; authors in one extra query
+        query = (
+            Reviews.query
+            .options(selectinload(Reviews.users))
+            .filter(Reviews.sparepart_id == part.id, *criteria)
+        )
+        try:
+            reviews, next_cursor = keyset_paginate(
+                query,
+                columns,
+                cursor=request.args.get("cursor"),
+                per_page=per_page,
+                descending=descending,
+                scope=scope,
+            )
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
-            # Include individual reactions for frontend
-            r_dict["likes"] = [{"user_id": l.user_id, "is_like": l.is_like} for l in r.likes]
+        # Only the viewer's own reaction ships (one query for the page); the
+        # full reaction lists are on the admin reactions endpoint
+        mine = viewer_reactions(db.session, get_jwt_identity(), [r.id for r in reviews])
 
+        result = []
+        for r in reviews:
+            # flat review with display name and like counts (REVIEW would pull
+            # in the author's whole order history per review)
+            r_dict = r.to_lean_dict()
+            r_dict["my_reaction"] = mine.get(r.id)
             result.append(r_dict)
 
-        return result, 200
+        return {
+            "items": result,
+            "next_cursor": next_cursor,
+            "per_page": per_page,
+            "sort": sort,
+        }, 200
 
     @jwt_required()
     def post(self, part_id):
@@ -421,22 +620,19 @@ class ReviewsResource(Resource):
         )
 
         try:
+            # the part's totals are adjusted in the same flush (review_stats)
             db.session.add(review)
             db.session.commit()
-
-            # Update spare part stats
-            part.update_review_stats()
-            db.session.commit()
         except Exception:
             db.session.rollback()
             return {"error": "Failed to save review"}, 500
 
         # Return dict with display name and initial likes/dislikes
-        review_dict = review.to_dict()
+        review_dict = REVIEW(review)
         review_dict["user_display_name"] = review.user_display_name
         review_dict["total_likes"] = 0
         review_dict["total_dislikes"] = 0
-        review_dict["likes"] = []
+        review_dict["my_reaction"] = None
 
         return review_dict, 201
 
@@ -479,15 +675,11 @@ class ReviewEditResource(Resource):
 
         try:
             db.session.commit()
-
-            # Update spare part stats
-            review.spareparts.update_review_stats()
-            db.session.commit()
         except Exception:
             db.session.rollback()
             return {"error": "Failed to update review"}, 500
 
-        return review.to_dict(), 200
+        return REVIEW(review), 200
 
     @jwt_required()
     def delete(self, review_id):
@@ -499,13 +691,8 @@ class ReviewEditResource(Resource):
             return {"error": "Cannot delete others' reviews"}, 403
 
         try:
-            sparepart = review.spareparts
             db.session.delete(review)
             db.session.commit()
-
-            # Update spare part stats
-            sparepart.update_review_stats()
-            db.session.commit()
         except Exception:
             db.session.rollback()
             return {"error": "Failed to delete review"}, 500
@@ -528,42 +715,22 @@ class ReviewReactionsResource(Resource):
 
         is_like = bool(data.get("is_like"))
 
-        existing = ReviewReactions.query.filter_by(
-            user_id=current_user_id,
-            review_id=review.id
-        ).first()
-
-        action = "added"
-
-        if existing:
-            # TOGGLE OFF
-            if existing.is_like == is_like:
-                db.session.delete(existing)
-                action = "removed"
-            else:
-                # SWITCH reaction
-                existing.is_like = is_like
-                action = "switched"
-        else:
-            new_reaction = ReviewReactions(
-                user_id=current_user_id,
-                review_id=review.id,
-                is_like=is_like,
-            )
-            db.session.add(new_reaction)
-
-        # update counters
-        review.update_reaction_stats()
-        review.spareparts.update_review_stats()
-
-        db.session.commit()
+        # delete / insert toggle with atomic counter deltas, applied now or
+        # queued for the batched flush (database/reactions.py)
+        result = toggle_reaction(
+            db.session,
+            current_user_id,
+            review.id,
+            is_like,
+            write_behind=current_app.config.get("REACTIONS_WRITE_BEHIND", False),
+        )
 
         return {
-            "action": action,
+            "action": result["action"],
             "review": {
                 "id": review.id,
-                "total_likes": review.total_likes,
-                "total_dislikes": review.total_dislikes,
+                "total_likes": result["total_likes"],
+                "total_dislikes": result["total_dislikes"],
             },
         }, 200
     
@@ -571,6 +738,7 @@ class ReviewReactionsResource(Resource):
 # ------------------ Orders ------------------
 class OrdersResource(Resource):
     @jwt_required()
+    @read_replica
     def get(self):
         """Get summary of orders for the logged-in user, including order items."""
         current_user = Users.query.get(get_jwt_identity())
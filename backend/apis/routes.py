@@ -1,13 +1,14 @@
 from apis.resources import (
     Register, VerifyAccount, ResendOTP,  Login, ChangePassword , DeleteAccount ,TokenRefresh,
-    SparePartsList,
+    SparePartsList, SparePartsSearch, SparePartsBatch, SparePartsSuggest, SparePartsFacets, SparePartsSnapshot,
     ReviewsResource, ReviewEditResource, ReviewReactionsResource,
     OrdersResource
 )
 
 from apis.admin_resources import (
     CreateAdmin, ListAdmins, DeleteAdmin, AdminOrders, AdminSpareParts,
-    AdminReviewsResource, AdminReviewReactionsResource, AdminReviewsBySparePartResource
+    AdminReviewsResource, AdminReviewReactionsResource, AdminReviewsBySparePartResource,
+    AdminCacheStats, AdminSparePartsImport, AdminSparePartsReprice, AdminPoolStats
 )
 
 
@@ -19,6 +20,11 @@ def register_routes(api):
     api.add_resource(ChangePassword, '/change-password')
     api.add_resource(DeleteAccount, '/delete-account')
     api.add_resource(TokenRefresh, '/refresh')
+    api.add_resource(SparePartsSearch, '/spareparts/search')
+    api.add_resource(SparePartsBatch, '/spareparts/batch')
+    api.add_resource(SparePartsSuggest, '/spareparts/suggest')
+    api.add_resource(SparePartsFacets, '/spareparts/facets')
+    api.add_resource(SparePartsSnapshot, '/spareparts/snapshot')
     api.add_resource(SparePartsList, '/spareparts', '/spareparts/<string:part_id>')
     api.add_resource(ReviewsResource, '/reviews/<string:part_id>')
     api.add_resource(ReviewEditResource, '/reviews/edit/<string:review_id>')
@@ -30,10 +36,11 @@ def register_routes(api):
     api.add_resource(ListAdmins, '/admin/admins')
     api.add_resource(DeleteAdmin, '/admin/delete-admin/<string:admin_id>')  
     api.add_resource(AdminOrders, '/admin/orders', '/admin/orders/<string:order_id>')
+    api.add_resource(AdminSparePartsImport, '/admin/spareparts/import')
+    api.add_resource(AdminSparePartsReprice, '/admin/spareparts/reprice')
     api.add_resource(AdminSpareParts, '/admin/spareparts', '/admin/spareparts/<string:spare_id>')
     api.add_resource(AdminReviewsResource, '/admin/reviews')
     api.add_resource(AdminReviewReactionsResource,"/admin/reviews/<string:review_id>/reactions")
     api.add_resource(AdminReviewsBySparePartResource, '/admin/reviews/sparepart/<string:sparepart_id>')
-
-    
-
+    api.add_resource(AdminCacheStats, '/admin/cache/stats')
+    api.add_resource(AdminPoolStats, '/admin/db/pool')
@@ -0,0 +1,134 @@
+import time
+from sqlalchemy import inspect as sa_inspect, DateTime, Date, Time, select
+from sqlalchemy_serializer.lib.schema import Schema
+from database.models import Users, SpareParts, Reviews, Orders, OrderItems
+
+# ------------------ Compiled Serializers ------------------
+# SerializerMixin.to_dict() rebuilds its rule tree and walks every attribute
+# reflectively (isinstance chain per value) on each call. The rules only
+# depend on the model classes, so the same walk is done once here, at import,
+# producing a static plan: (key, formatter) per column + (key, many, child)
+# per relationship. Output is the same dict to_dict() returns.
+
+
+def _formatter(model, column):
+    """Same string formats SerializerMixin applies (no tzinfo is configured)."""
+    if isinstance(column.type, DateTime):
+        fmt = model.datetime_format
+    elif isinstance(column.type, Date):
+        fmt = model.date_format
+    elif isinstance(column.type, Time):
+        fmt = model.time_format
+    else:
+        return None
+
+    return lambda value: value.strftime(fmt)
+
+
+class CompiledSerializer:
+    __slots__ = ("model", "fields", "relations", "columns")
+
+    def __init__(self, model, fields, relations, columns):
+        self.model = model
+        self.fields = fields
+        self.relations = relations
+        self.columns = columns
+
+    def __call__(self, obj):
+        """Serialize a model instance, or a Core row selected with `self.select()` (flat plans only)."""
+        result = {}
+
+        for key, fmt in self.fields:
+            value = getattr(obj, key)
+            result[key] = value if fmt is None or value is None else fmt(value)
+
+        for key, many, child in self.relations:
+            value = getattr(obj, key)
+            if value is None:
+                result[key] = None
+            elif many:
+                result[key] = [child(v) for v in value]
+            else:
+                result[key] = child(value)
+
+        return result
+
+    def many(self, objs):
+        return [self(obj) for obj in objs]
+
+    def select(self):
+        """Core select of exactly the serialized columns."""
+        return select(*self.columns)
+
+
+def _compile(model, schema):
+    # mirrors Serializer.serialize_model, on the class instead of an instance
+    schema.update(only=model.serialize_only, extend=model.serialize_rules)
+
+    mapper = sa_inspect(model)
+    keys = schema.keys
+    if schema.is_greedy:
+        keys.update(a.key for a in mapper.attrs)
+
+    fields, relations, columns = [], [], []
+
+    # mapper order, so the emitted dicts are stable
+    for attr in mapper.attrs:
+        if attr.key not in keys or not schema.is_included(attr.key):
+            continue
+
+        if attr.key in mapper.relationships:
+            child = _compile(attr.mapper.class_, schema.fork(attr.key))
+            relations.append((attr.key, attr.uselist, child))
+        else:
+            column = attr.columns[0]
+            fields.append((attr.key, _formatter(model, column)))
+            columns.append(column.label(attr.key))
+
+    unknown = keys - {a.key for a in mapper.attrs}
+    if any(schema.is_included(k) for k in unknown):
+        raise ValueError(f"{model.__name__}: only mapped attributes can be compiled ({', '.join(sorted(unknown))})")
+
+    return CompiledSerializer(model, tuple(fields), tuple(relations), tuple(columns))
+
+
+def compile_serializer(model, rules=(), only=()):
+    """Plan equivalent to `instance.to_dict(only=only, rules=rules)`."""
+    schema = Schema()
+    schema.update(only=only, extend=rules)
+    return _compile(model, schema)
+
+
+# Precompiled plans used by the resources
+SPAREPART = compile_serializer(SpareParts)
+SPAREPART_WITHOUT_REVIEWS = compile_serializer(SpareParts, rules=("-reviews",))
+REVIEW = compile_serializer(Reviews)
+ORDER = compile_serializer(Orders)
+ORDER_ITEM = compile_serializer(OrderItems)
+USER = compile_serializer(Users)
+
+
+# ------------------ Micro Benchmark ------------------
+def benchmark(serializer, objs, number=100, rules=()):
+    """
+    Time `to_dict()` against the compiled plan over the same instances.
+    Returns seconds per pass for both and whether the outputs matched.
+    """
+    objs = list(objs)
+
+    start = time.perf_counter()
+    for _ in range(number):
+        expected = [o.to_dict(rules=rules) for o in objs]
+    to_dict_seconds = (time.perf_counter() - start) / number
+
+    start = time.perf_counter()
+    for _ in range(number):
+        compiled = serializer.many(objs)
+    compiled_seconds = (time.perf_counter() - start) / number
+
+    return {
+        "rows": len(objs),
+        "to_dict": to_dict_seconds,
+        "compiled": compiled_seconds,
+        "identical": expected == compiled,
+    }
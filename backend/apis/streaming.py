@@ -0,0 +1,33 @@
+import json
+from flask import request, Response, stream_with_context
+
+# ------------------ Streaming (NDJSON) Responses ------------------
+# Large admin listings can be streamed one JSON document per line instead of
+# being built as one list: rows come from a server side cursor in batches of
+# STREAM_BATCH_SIZE and are written as soon as they are serialized, so memory
+# stays flat however many rows exist.
+
+NDJSON = "application/x-ndjson"
+
+STREAM_BATCH_SIZE = 500
+
+
+def wants_stream():
+    """`?stream=1` or an Accept header preferring application/x-ndjson."""
+    if request.args.get("stream", type=int) == 1:
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON]) == NDJSON
+
+
+def stream_query(query, batch_size=STREAM_BATCH_SIZE):
+    """Iterate an ORM query through a server side cursor, batch_size rows at a time."""
+    return query.yield_per(batch_size)
+
+
+def ndjson_response(rows, serialize):
+    """Stream `serialize(row)` for every row as newline delimited JSON."""
+    def generate():
+        for row in rows:
+            yield json.dumps(serialize(row)) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
@@ -2,7 +2,8 @@ from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 import stripe
 from core.extensions import db
-from database.models import Users, Orders, OrderItems, SpareParts
+from database.models import Users, Orders, OrderItems
+from apis.lookups import load_spareparts
 
 def init_stripe(app):
     stripe.api_key = app.config["STRIPE_SECRET_KEY"]
@@ -42,8 +43,18 @@ def init_stripe(app):
 
         stripe_items = []
 
+        # load_spareparts skips empty ids: reject them before the lookup
+        if not all(isinstance(item, dict) and item.get("sparepart_id") for item in items):
+            return {"error": "Every cart item needs a sparepart_id"}, 400
+
+        # every part of the cart in one query
+        parts, missing = load_spareparts(item["sparepart_id"] for item in items)
+        if missing:
+            return {"error": "Spare parts not found", "missing": missing}, 404
+        parts_by_id = {part.id: part for part in parts}
+
         for item in items:
-            part = SpareParts.query.get_or_404(item["sparepart_id"])
+            part = parts_by_id[str(item["sparepart_id"])]
             part.calculate_discount()  
             qty = item.get("quantity", 1)
 
@@ -2,9 +2,12 @@ from flask import Flask
 from flask_cors import  CORS
 from flask_restful import Api
 from core.config import Config
-from core.extensions import db, bcrypt, jwt ,migrate
+from core.extensions import db, bcrypt, jwt ,migrate, cache
 from apis.routes import register_routes
 from apis.stripe import init_stripe
+from utils.commands import register_commands
+from core.routing import init_routing
+from utils.pool_metrics import init_pool_metrics
 
 def create_app(config_class=Config):
     app = Flask(__name__)
@@ -12,9 +15,12 @@ def create_app(config_class=Config):
 
     # Init extensions
     db.init_app(app)
+    init_pool_metrics(app, db)
     bcrypt.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
+    cache.init_app(app)
+    init_routing(app)
     api = Api(app) 
     
     CORS(app, resources={r"/*": {"origins": app.config["FRONTEND_URL"]}}, supports_credentials=True)
@@ -25,6 +31,9 @@ def create_app(config_class=Config):
     # Initialize Stripe webhook
     init_stripe(app)
 
+    # CLI maintenance commands (flask <command>)
+    register_commands(app)
+
     return app
 
 
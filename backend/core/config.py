@@ -1,13 +1,44 @@
 from dotenv import load_dotenv
 from datetime import timedelta
 import os
+from core.routing import replica_binds
+from utils.pool_metrics import TimedQueuePool
 
 load_dotenv()
 
+
+def engine_options(url):
+    """
+    Connection pool settings (per environment through DB_POOL_* variables).
+    SQLite keeps the pools Flask-SQLAlchemy picks for it.
+    """
+    if not url or url.startswith("sqlite"):
+        return {}
+
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+    }
+
+
 class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Read replicas (comma separated URLs) for GET handlers marked @read_replica
+    # (binds do not inherit SQLALCHEMY_ENGINE_OPTIONS, so each gets its own pool settings)
+    SQLALCHEMY_BINDS = {
+        key: {"url": url, **engine_options(url)}
+        for key, url in replica_binds(os.getenv("DATABASE_REPLICA_URLS", "")).items()
+    }
+    # Clients that just wrote read from the primary for this long
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
 
     # Secrets
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
@@ -27,3 +58,27 @@ class Config:
     # Checkout
     STRIPE_SUCCESS_URL = os.getenv("STRIPE_SUCCESS_URL")
     STRIPE_CANCEL_URL = os.getenv("STRIPE_CANCEL_URL")
+
+    # Response cache (catalog listings)
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")   # memory, redis
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/1")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 300))
+
+    # HTTP caching of catalog reads (clients revalidate with If-None-Match)
+    CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+
+    # Compressed whole-catalog snapshot (/spareparts/snapshot), default <instance>/snapshots.
+    # Built by each web host into its own directory; ASYNC rebuilds in a background thread
+    # while the last good snapshot is served
+    CATALOG_SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR")
+    CATALOG_SNAPSHOT_ASYNC = os.getenv("CATALOG_SNAPSHOT_ASYNC", "true").lower() == "true"
+
+    # In-process typeahead index (/spareparts/suggest): full rebuild interval, picks up
+    # writes made by other workers (0 = only incremental updates)
+    SUGGEST_REBUILD_SECONDS = int(os.getenv("SUGGEST_REBUILD_SECONDS", 300))
+
+    # Write-behind reaction counters: clicks queue counter deltas that a celery beat
+    # task applies in batches every REACTION_FLUSH_SECONDS (see utils/celery_worker.py)
+    REACTIONS_WRITE_BEHIND = os.getenv("REACTIONS_WRITE_BEHIND", "false").lower() == "true"
@@ -0,0 +1,120 @@
+import logging
+import random
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+# ------------------ Read Replica Routing ------------------
+# Replicas are extra SQLALCHEMY_BINDS named "replica_<n>" (DATABASE_REPLICA_URLS).
+# Inside a GET handler marked with @read_replica, plain SELECTs go to one
+# replica (picked once per request). Everything else stays on the primary:
+#   - flushes / UPDATE / DELETE / session.connection()
+#   - any SELECT after the session has written something
+#   - requests from a user who wrote within REPLICA_STICKY_SECONDS
+#     (read-your-own-writes). The window is keyed on the JWT identity in the
+#     response cache backend, so it follows the SPA's bearer token across
+#     origins and workers (CACHE_BACKEND=redis when running several workers).
+#     Anonymous requests always go to a replica.
+
+REPLICA_BIND_PREFIX = "replica_"
+PRIMARY_KEY_PREFIX = "primary-until:"
+
+logger = logging.getLogger(__name__)
+
+
+def replica_binds(urls):
+    """SQLALCHEMY_BINDS entries for a comma separated list of replica URLs."""
+    if isinstance(urls, str):
+        urls = [u.strip() for u in urls.split(",")]
+    return {f"{REPLICA_BIND_PREFIX}{i}": url for i, url in enumerate(u for u in urls if u)}
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and isinstance(clause, Select) and not self._flushing and not self.info.get("wrote"):
+            engine = self._replica_engine()
+            if engine is not None:
+                return engine
+
+        if getattr(clause, "is_dml", False):
+            self.info["wrote"] = True
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine(self):
+        if not has_request_context() or not g.get("read_replica"):
+            return None
+
+        if "replica_bind" not in g:
+            keys = [k for k in self._db.engines if isinstance(k, str) and k.startswith(REPLICA_BIND_PREFIX)]
+            g.replica_bind = random.choice(keys) if keys else None
+
+        return self._db.engines[g.replica_bind] if g.replica_bind else None
+
+
+# A session lives for one app context, so once it wrote, its reads stay on the primary
+@event.listens_for(RoutingSession, "after_flush")
+def stick_to_primary(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def mark_primary_write(session):
+    if has_request_context():
+        g.primary_write = True
+
+
+def _request_identity():
+    """JWT identity of the current request, None without a valid token."""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def _sticky_store():
+    return current_app.extensions["response_cache"].backend
+
+
+def sticky_to_primary():
+    identity = _request_identity()
+    if identity is None:
+        return False
+
+    try:
+        until = _sticky_store().get(PRIMARY_KEY_PREFIX + str(identity))
+    except Exception as e:
+        logger.warning("Could not read the primary stickiness window: %s", e)
+        return True
+
+    return until is not None and until > time.time()
+
+
+def read_replica(view):
+    """Route this handler's reads to a replica unless the client must read its own writes."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = not sticky_to_primary()
+        return view(*args, **kwargs)
+
+    return wrapper
+
+
+def init_routing(app):
+    window = app.config.get("REPLICA_STICKY_SECONDS", 5)
+
+    @app.after_request
+    def stick_writer_to_primary(response):
+        if g.get("primary_write") and window > 0:
+            identity = _request_identity()
+            if identity is not None:
+                try:
+                    _sticky_store().set(PRIMARY_KEY_PREFIX + str(identity), time.time() + window, window)
+                except Exception as e:
+                    logger.warning("Could not record the primary stickiness window: %s", e)
+        return response
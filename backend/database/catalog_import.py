@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import logging
+import time
+from sqlalchemy import insert
+from database.models import SpareParts, VEHICLE_TYPES, generate_uuid, normalize_key
+from database.price_buckets import price_bucket_for
+from database.search import index_spareparts
+from database.catalog_version import bump_catalog_version
+from database.review_stats import STAT_COLUMNS
+from database.suggest import record_part_change
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------ BULK CATALOG IMPORT ---------------------------------
+# Supplier catalogs (CSV or NDJSON) are read as a stream, validated row by
+# row and written IMPORT_CHUNK_SIZE rows at a time: one multi-row INSERT
+# (COPY on Postgres) plus one search index update and one commit per chunk,
+# instead of an ORM add + flush + commit per part.
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_CHUNK_SIZE = 1000
+
+# Only the first errors are returned; the failed count covers every row
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_FIELDS = ("category", "vehicle_type", "brand", "buying_price", "marked_price")
+OPTIONAL_FIELDS = ("colour", "image", "description")
+
+# Every column an imported row fills in (the ORM listeners are bypassed)
+IMPORT_COLUMNS = (
+    "id", *REQUIRED_FIELDS, *OPTIONAL_FIELDS,
+    "discount_amount", "discount_percentage",
+    "category_key", "brand_key", "colour_key", "price_bucket",
+    "average_rating", *STAT_COLUMNS, "version",
+)
+
+_MIMETYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}
+
+
+def import_format(requested=None, mimetype=None, filename=None):
+    """csv / ndjson from ?format=, then the content type, then the file extension."""
+    if requested:
+        return requested.lower() if requested.lower() in IMPORT_FORMATS else None
+    if mimetype in _MIMETYPES:
+        return _MIMETYPES[mimetype]
+    if filename and "." in filename:
+        return _EXTENSIONS.get(filename.rsplit(".", 1)[1].lower())
+    return None
+
+
+# ---------------- Reading / Validation ----------------
+def read_rows(stream, fmt):
+    """Yield (line_number, row, error) from a binary stream without loading it whole."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+    line_number = 0
+    try:
+        for line_number, row, error in _parse_rows(text, fmt):
+            yield line_number, row, error
+    except UnicodeDecodeError:
+        # the decoder cannot resync: report once and stop reading
+        yield line_number + 1, None, "File must be UTF-8 encoded"
+
+
+def _parse_rows(text, fmt):
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Invalid JSON"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, row, None
+
+
+def _clean(value):
+    if isinstance(value, str):
+        value = value.strip()
+    return None if value in ("", None) else value
+
+
+def validate_row(row):
+    """Return (values, None) for a valid row, or (None, error)."""
+    values = {field: _clean(row.get(field)) for field in (*REQUIRED_FIELDS, *OPTIONAL_FIELDS)}
+
+    missing = [field for field in REQUIRED_FIELDS if values[field] is None]
+    if missing:
+        return None, f"Missing {', '.join(missing)}"
+
+    vehicle_type = str(values["vehicle_type"]).lower()
+    if vehicle_type not in VEHICLE_TYPES:
+        return None, f"Vehicle type must be one of: {', '.join(VEHICLE_TYPES)}"
+    values["vehicle_type"] = vehicle_type
+
+    for field in ("buying_price", "marked_price"):
+        try:
+            values[field] = float(values[field])
+        except (TypeError, ValueError):
+            return None, f"Invalid value for {field}"
+        if values[field] < 0:
+            return None, f"{field} must not be negative"
+
+    for field in ("category", "brand", "colour", "image", "description"):
+        if values[field] is not None:
+            values[field] = str(values[field])
+
+    return values, None
+
+
+# ---------------- Chunk Preparation ----------------
+def discount_columns(buying_prices, marked_prices):
+    """SpareParts.calculate_discount over whole columns: (amounts, percentages)."""
+    amounts = [
+        round(marked - buying, 2) if marked and buying else 0.0
+        for buying, marked in zip(buying_prices, marked_prices)
+    ]
+    percentages = [
+        round((amount / marked) * 100, 2) if marked and buying and marked > 0 else 0.0
+        for amount, buying, marked in zip(amounts, buying_prices, marked_prices)
+    ]
+    return amounts, percentages
+
+
+def prepare_chunk(connection, rows):
+    """Fill in the columns the SpareParts insert listeners would have computed."""
+    amounts, percentages = discount_columns(
+        [r["buying_price"] for r in rows],
+        [r["marked_price"] for r in rows],
+    )
+
+    for row, amount, percentage in zip(rows, amounts, percentages):
+        category_key = normalize_key(row["category"])
+        row.update(
+            id=generate_uuid(),
+            discount_amount=amount,
+            discount_percentage=percentage,
+            category_key=category_key,
+            brand_key=normalize_key(row["brand"]),
+            colour_key=normalize_key(row["colour"]),
+            price_bucket=price_bucket_for(connection, category_key, row["vehicle_type"], row["buying_price"]),
+            average_rating=0.0,
+            version=1,
+            **dict.fromkeys(STAT_COLUMNS, 0),
+        )
+
+    return rows
+
+
+def _copy_rows(connection, rows):
+    """Postgres (psycopg2): stream the chunk through COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in IMPORT_COLUMNS])
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY spareparts ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def write_chunk(connection, rows):
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+        _copy_rows(connection, rows)
+    else:
+        # executemany -> batched multi-row INSERT ... VALUES
+        connection.execute(insert(SpareParts.__table__), rows)
+
+
+# ---------------- Import ----------------
+def import_spareparts(session, stream, fmt, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import every valid row of `stream`; invalid rows are skipped and reported.
+    Each chunk is committed on its own, so a bad chunk only fails its own rows.
+    """
+    started = time.perf_counter()
+    report = {"inserted": 0, "failed": 0, "errors": []}
+
+    def fail(line_number, error):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_number, "error": error})
+
+    def flush(chunk):
+        if not chunk:
+            return
+        try:
+            connection = session.connection()
+            rows = prepare_chunk(connection, [values for _, values in chunk])
+            write_chunk(connection, rows)
+            index_spareparts(connection, [r["id"] for r in rows])
+            bump_catalog_version(connection)
+            # Core inserts skip the mapper events: queue the typeahead terms by hand
+            for r in rows:
+                record_part_change(session, r["id"], (r["brand"], r["category"], r["vehicle_type"], 0))
+            session.commit()
+            report["inserted"] += len(rows)
+        except Exception:
+            session.rollback()
+            # driver errors carry SQL and row values: logged, not returned
+            lines = f"lines {chunk[0][0]}-{chunk[-1][0]}"
+            logger.exception("Catalog import chunk failed (%s)", lines)
+            for line_number, _ in chunk:
+                fail(line_number, f"Database error: the chunk with {lines} was not imported")
+
+    chunk = []
+    for line_number, row, error in read_rows(stream, fmt):
+        if error is None:
+            values, error = validate_row(row)
+        if error is not None:
+            fail(line_number, error)
+            continue
+
+        chunk.append((line_number, values))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+
+    flush(chunk)
+
+    seconds = time.perf_counter() - started
+    report["seconds"] = round(seconds, 3)
+    report["rows_per_second"] = round(report["inserted"] / seconds, 1) if seconds > 0 else 0.0
+    report["errors_truncated"] = report["failed"] > len(report["errors"])
+
+    return report
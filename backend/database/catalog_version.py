@@ -0,0 +1,31 @@
+from sqlalchemy import select, update, insert
+from core.extensions import db
+
+# ------------------------------ CATALOG VERSION ---------------------------------
+# A single row counter bumped, in the same transaction, by every write that
+# changes what the public catalog returns. Shared by all workers, it scopes
+# the response cache keys and the catalog ETags.
+
+catalog_version = db.Table(
+    "catalog_version",
+    db.Column("id", db.Integer, primary_key=True),
+    db.Column("version", db.Integer, nullable=False, default=0),
+)
+
+
+def bump_catalog_version(connection):
+    result = connection.execute(
+        update(catalog_version)
+        .where(catalog_version.c.id == 1)
+        .values(version=catalog_version.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(catalog_version).values(id=1, version=1))
+
+
+def current_catalog_version(connection=None):
+    # through the session (not session.connection()) so GET handlers read it from their replica
+    executor = connection if connection is not None else db.session
+    return executor.execute(
+        select(catalog_version.c.version).where(catalog_version.c.id == 1)
+    ).scalar() or 0
@@ -1,16 +1,28 @@
 import uuid
 from sqlalchemy_serializer import SerializerMixin
-from sqlalchemy.orm import validates
+from sqlalchemy.orm import validates, Session, object_session
 from datetime import datetime , timedelta
 from sqlalchemy import func, select, update, event
 import secrets
 import hashlib
-from core.extensions import db, bcrypt 
+from core.extensions import db, bcrypt, cache
+from database.search import create_search_index, drop_search_index, index_spareparts, unindex_spareparts
+from database.price_buckets import price_bucket_for
+from database.catalog_version import bump_catalog_version, current_catalog_version
+from database.suggest import record_part_change, apply_pending, discard_pending
+from database.review_stats import apply_review_delta
 
 #------------------------------UUID Helper-------------------------------
 def generate_uuid():
     return str(uuid.uuid4())
 
+#------------------------------Filter Key Helper-------------------------------
+def normalize_key(value):
+    """Lower-cased, whitespace-collapsed form used by the indexed filter columns."""
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower() or None
+
 #------------------------------USERS MODEL---------------------------------
 class Users(db.Model, SerializerMixin):
     __tablename__ = "users"
@@ -157,6 +169,8 @@ class Users(db.Model, SerializerMixin):
         return "User"
     
 # ------------------------------ SPARE PARTS MODEL ---------------------------------
+VEHICLE_TYPES = ("sedan", "suv", "bus", "truck")
+
 class SpareParts(db.Model, SerializerMixin):
     __tablename__ = "spareparts"
 
@@ -177,6 +191,46 @@ class SpareParts(db.Model, SerializerMixin):
     average_rating = db.Column(db.Float, default=0.0)
     total_reviews = db.Column(db.Integer, default=0)
 
+    # Running totals of the 1-5 ratings (average_rating = rating_sum / rating_count),
+    # adjusted by deltas on every review write, see database/review_stats.py
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Star histogram: reviews per rating and reviews without one (same deltas)
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0)
+    comments_only_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Review totals changed since they were last published to the listings
+    # (catalog version), see publish_review_stats()
+    review_stats_dirty = db.Column(db.Boolean, nullable=False, default=False)
+
+    # Normalized (lower-cased) copies of the filterable columns.
+    # Kept in sync by the before_insert/before_update listeners.
+    category_key = db.Column(db.String, nullable=True)
+    brand_key = db.Column(db.String, nullable=True)
+    colour_key = db.Column(db.String, nullable=True)
+
+    # low / medium / high within its (category, vehicle_type), see database/price_buckets.py
+    price_bucket = db.Column(db.String, nullable=True)
+
+    # Bumped on every change to the part or its reviews (drives the detail ETag)
+    version = db.Column(db.Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.Index("ix_spareparts_category_vehicle_price", "category_key", "vehicle_type", "buying_price"),
+        db.Index("ix_spareparts_category_vehicle_bucket", "category_key", "vehicle_type", "price_bucket"),
+        db.Index("ix_spareparts_brand_key", "brand_key"),
+        db.Index("ix_spareparts_colour_key", "colour_key"),
+        # keyset pagination orders (sort key, id)
+        db.Index("ix_spareparts_price_id", "buying_price", "id"),
+        db.Index("ix_spareparts_rating_id", "average_rating", "id"),
+        db.Index("ix_spareparts_review_stats_dirty", "review_stats_dirty"),
+    )
+
     # -------------------------- RELATIONSHIPS --------------------------------
     order_items = db.relationship("OrderItems", back_populates="sparepart")
     reviews = db.relationship(
@@ -188,6 +242,13 @@ class SpareParts(db.Model, SerializerMixin):
     # ------------------------- SERIALIZE RULES -------------------------------
     serialize_rules = (
         "-order_items",
+        "-category_key",
+        "-brand_key",
+        "-colour_key",
+        "-version",
+        "-rating_sum",
+        "-rating_count",
+        "-review_stats_dirty",
         "-reviews.spareparts",
         "-reviews.users.reviews",
         "-reviews.likes.reviews",
@@ -196,13 +257,27 @@ class SpareParts(db.Model, SerializerMixin):
     # -------------------------- VALIDATIONS ----------------------------------
     @validates("vehicle_type")
     def validate_vehicle_type(self, key, value):
-        allowed = ["sedan", "suv", "bus", "truck"]
-        if value.lower() not in allowed:
-            raise ValueError(f"Vehicle type must be one of: {', '.join(allowed)}")
+        if value.lower() not in VEHICLE_TYPES:
+            raise ValueError(f"Vehicle type must be one of: {', '.join(VEHICLE_TYPES)}")
         return value.lower()
 
     # ------------------------ CUSTOM METHODS ---------------------------------
 
+    def normalize_filter_keys(self):
+        self.category_key = normalize_key(self.category)
+        self.brand_key = normalize_key(self.brand)
+        self.colour_key = normalize_key(self.colour)
+
+    def bump_version(self):
+        # SET version = version + 1 in the UPDATE itself: concurrent edits
+        # each get their own version (the attribute reloads after the flush)
+        self.version = type(self).version + 1
+
+    def assign_price_bucket(self, connection):
+        self.price_bucket = price_bucket_for(
+            connection, self.category_key, self.vehicle_type, self.buying_price
+        )
+
     def calculate_discount(self):
         if self.marked_price and self.buying_price:
             self.discount_amount = round(self.marked_price - self.buying_price, 2)
@@ -215,21 +290,6 @@ class SpareParts(db.Model, SerializerMixin):
             self.discount_amount = 0.0
             self.discount_percentage = 0.0
 
-    def update_review_stats(self):
-        reviews = getattr(self, "reviews", []) or []
-
-        self.total_reviews = len(reviews)
-
-        ratings = [
-            r.rating
-            for r in reviews
-            if isinstance(r.rating, int) and 1 <= r.rating <= 5
-        ]
-
-        self.average_rating = (
-            round(sum(ratings) / len(ratings), 1) if ratings else 0.0
-        )
-
 
 # ------------------------------ REVIEWS MODEL ---------------------------------
 class Reviews(db.Model, SerializerMixin):
@@ -242,9 +302,22 @@ class Reviews(db.Model, SerializerMixin):
     rating = db.Column(db.Integer, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Reaction counters, adjusted by atomic deltas in database/reactions.py
     total_likes = db.Column(db.Integer, default=0)
     total_dislikes = db.Column(db.Integer, default=0)
 
+    __table_args__ = (
+        # newest-first review pages per part (keyset on created_at, id)
+        db.Index("ix_reviews_sparepart_created", "sparepart_id", "created_at", "id"),
+        # highest / lowest rated and most helpful first
+        db.Index("ix_reviews_sparepart_rating", "sparepart_id", "rating", "created_at", "id"),
+        db.Index("ix_reviews_sparepart_likes", "sparepart_id", "total_likes", "created_at", "id"),
+        # admin moderation feed (newest first) and its user / rating filters
+        db.Index("ix_reviews_created", "created_at", "id"),
+        db.Index("ix_reviews_user_created", "user_id", "created_at", "id"),
+        db.Index("ix_reviews_rating_created", "rating", "created_at", "id"),
+    )
+
     # -------------------------- RELATIONSHIPS --------------------------------
     users = db.relationship("Users", back_populates="reviews")
     spareparts = db.relationship("SpareParts", back_populates="reviews")
@@ -269,27 +342,25 @@ class Reviews(db.Model, SerializerMixin):
             raise ValueError("Rating must be between 1 and 5")
         return value
 
-    # ------------------------ CUSTOM METHODS ---------------------------------
-    def update_reaction_stats(self):
-        reactions = getattr(self, "likes", []) or []
-
-        likes = 0
-        dislikes = 0
-
-        for r in reactions:
-            if r.is_like is True:
-                likes += 1
-            elif r.is_like is False:
-                dislikes += 1
-
-        self.total_likes = likes
-        self.total_dislikes = dislikes
-
     #----------------------Displaying User Name above Comment-----------------------------
     @property
     def user_display_name(self):
         return self.users.display_name if self.users else "User"
 
+    def to_lean_dict(self):
+        """Flat review (no nested user, part or reactions) for paginated listings."""
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "sparepart_id": self.sparepart_id,
+            "rating": self.rating,
+            "comment": self.comment,
+            "created_at": self.created_at.strftime(self.datetime_format) if self.created_at else None,
+            "total_likes": self.total_likes,
+            "total_dislikes": self.total_dislikes,
+            "user_display_name": self.user_display_name,
+        }
+
 
 # ------------------------------ REVIEW REACTIONS MODEL ---------------------------------
 class ReviewReactions(db.Model, SerializerMixin):
@@ -300,6 +371,13 @@ class ReviewReactions(db.Model, SerializerMixin):
     review_id = db.Column(db.String, db.ForeignKey("reviews.id"), nullable=False)
     is_like = db.Column(db.Boolean, nullable=False)
 
+    __table_args__ = (
+        # one reaction per user and review (the toggle relies on it)
+        db.UniqueConstraint("user_id", "review_id", name="uq_review_reactions_user_review"),
+        # admin reaction pages: WHERE review_id = ? AND id > ? ORDER BY id
+        db.Index("ix_review_reactions_review", "review_id", "id"),
+    )
+
     # -------------------------- RELATIONSHIPS --------------------------------
     users = db.relationship("Users", back_populates="likes")
     reviews = db.relationship("Reviews", back_populates="likes")
@@ -329,6 +407,23 @@ class ReviewReactions(db.Model, SerializerMixin):
             raise ValueError("is_like must be True or False")
 
         return value
+
+#------------------------------REVIEW REACTION DELTAS MODEL---------------------------------
+class ReviewReactionDeltas(db.Model):
+    """
+    Counter changes queued by reaction clicks in write-behind mode
+    (REACTIONS_WRITE_BEHIND), applied to the reviews in batches by
+    flush_reaction_deltas(). No foreign keys: it is a queue, and a removed
+    review just makes its deltas no-ops.
+    """
+    __tablename__ = "review_reaction_deltas"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    review_id = db.Column(db.String, nullable=False)
+    sparepart_id = db.Column(db.String, nullable=True)
+    likes = db.Column(db.Integer, nullable=False, default=0)
+    dislikes = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
   
 #------------------------------ORDERS MODEL---------------------------------
 class Orders(db.Model, SerializerMixin):
@@ -407,36 +502,94 @@ class OrderItems(db.Model, SerializerMixin):
 @event.listens_for(SpareParts, "before_insert")
 def sparepart_before_insert(mapper, connection, target):
     target.calculate_discount()
+    target.normalize_filter_keys()
+    target.assign_price_bucket(connection)
 
 @event.listens_for(SpareParts, "before_update")
 def sparepart_before_update(mapper, connection, target):
     target.calculate_discount()
+    target.normalize_filter_keys()
+    target.assign_price_bucket(connection)
+    if object_session(target).is_modified(target, include_collections=False):
+        target.bump_version()
+
+# Parts reach the update events when only a collection changed (eg. a new order
+# item points at them): nothing to reindex then
+def columns_changed(target):
+    state = db.inspect(target)
+    return state.pending or object_session(target).is_modified(target, include_collections=False)
+
+# Full text search index: kept in step with every spare part write
+@event.listens_for(SpareParts, "after_insert")
+@event.listens_for(SpareParts, "after_update")
+def sparepart_after_write(mapper, connection, target):
+    if columns_changed(target):
+        index_spareparts(connection, [target.id])
+
+@event.listens_for(SpareParts, "after_delete")
+def sparepart_after_delete(mapper, connection, target):
+    unindex_spareparts(connection, [target.id])
+
+# Typeahead index: terms are queued per session and applied once committed
+@event.listens_for(SpareParts, "after_insert")
+@event.listens_for(SpareParts, "after_update")
+def sparepart_suggest_write(mapper, connection, target):
+    if not columns_changed(target):
+        return
+    record_part_change(
+        object_session(target), target.id,
+        (target.brand, target.category, target.vehicle_type, target.total_reviews),
+    )
+
+@event.listens_for(SpareParts, "after_delete")
+def sparepart_suggest_delete(mapper, connection, target):
+    record_part_change(object_session(target), target.id, None)
+
+@event.listens_for(Session, "after_commit")
+def suggest_after_commit(session):
+    apply_pending(session)
+
+@event.listens_for(Session, "after_rollback")
+def suggest_after_rollback(session):
+    discard_pending(session)
+
+@event.listens_for(SpareParts.__table__, "after_create")
+def spareparts_table_created(table, connection, **kw):
+    create_search_index(connection)
+
+@event.listens_for(SpareParts.__table__, "before_drop")
+def spareparts_table_dropping(table, connection, **kw):
+    drop_search_index(connection)
+
+# Catalog version: any spare part write (admin CRUD, review stats...) bumps it
+# in the same transaction, invalidating cached responses and catalog ETags.
+@event.listens_for(Session, "after_flush")
+def catalog_after_flush(session, flush_context):
+    changed = (
+        any(isinstance(obj, SpareParts) for obj in (*session.new, *session.deleted))
+        or any(isinstance(obj, SpareParts) and session.is_modified(obj) for obj in session.dirty)
+    )
+    if changed:
+        bump_catalog_version(session.connection())
 
-# Reviews listeners
+cache.version_getter = current_catalog_version
+
+# Review statistics: one delta UPDATE of the part per review write
+# (totals, average and part version), whatever the number of reviews;
+# the listings pick the totals up on the next publish_review_stats()
 @event.listens_for(Reviews, "after_insert")
+def review_after_insert(mapper, connection, target):
+    apply_review_delta(connection, target.sparepart_id, reviews=1, new_rating=target.rating)
+
 @event.listens_for(Reviews, "after_update")
+def review_after_update(mapper, connection, target):
+    history = db.inspect(target).attrs.rating.history
+    old_rating = history.deleted[0] if history.deleted else target.rating
+    apply_review_delta(connection, target.sparepart_id, old_rating=old_rating, new_rating=target.rating)
+
 @event.listens_for(Reviews, "after_delete")
-def review_change(mapper, connection, target):
-    sparepart = getattr(target, "sparepart", None)
-    if sparepart:
-        try:
-            sparepart.update_review_stats()
-            # Do NOT call db.session.commit() here!
-        except Exception as e:
-            print(f"[review_change] Error updating review stats: {e}")
-
-# ReviewReactions listeners
-@event.listens_for(ReviewReactions, "after_insert")
-@event.listens_for(ReviewReactions, "after_update")
-@event.listens_for(ReviewReactions, "after_delete")
-def reaction_change(mapper, connection, target):
-    sparepart = getattr(getattr(target, "review", None), "sparepart", None)
-    if sparepart:
-        try:
-            sparepart.update_review_stats()
-            # Do NOT call db.session.commit() here!
-        except Exception as e:
-            print(f"[reaction_change] Error updating review stats for reaction: {e}")
+def review_after_delete(mapper, connection, target):
+    apply_review_delta(connection, target.sparepart_id, reviews=-1, old_rating=target.rating)
 
 
 # ---------------- OrderItems Event Listeners ----------------
@@ -0,0 +1,240 @@
+import time
+from datetime import datetime
+from itertools import groupby
+from statistics import quantiles
+from sqlalchemy import select, func, case, and_, table, column, update, delete, insert
+from core.extensions import db
+from database.catalog_version import bump_catalog_version
+
+# ------------------------------ PRICE BUCKETS ---------------------------------
+# Each spare part stores a low/medium/high price_bucket so ?price= is an
+# indexed equality lookup. Thresholds are the 1/3 and 2/3 price quantiles
+# per (category, vehicle_type), recomputed periodically by
+# refresh_price_buckets(); groups with too few parts fall back to the
+# hand tuned DEFAULT_PRICE_RANGES.
+
+DEFAULT_PRICE_RANGES = {
+    "tyre": {
+        "sedan": {"low": 15000, "medium": 30000},
+        "suv": {"low": 25000, "medium": 40000},
+        "truck": {"low": 35000, "medium": 45000},
+        "bus": {"low": 25000, "medium": 30000},
+    },
+    "rim": {
+        "sedan": {"low": 20000, "medium": 30000},
+        "suv": {"low": 25000, "medium": 35000},
+        "truck": {"low": 30000, "medium": 35000},
+        "bus": {"low": 25000, "medium": 30000},
+    },
+    "battery": {
+        "sedan": {"low": 20000, "medium": 30000},
+        "suv": {"low": 26000, "medium": 35000},
+        "truck": {"low": 26000, "medium": 35000},
+        "bus": {"low": 35000, "medium": 40000},
+    },
+    "oil filter": {
+        "default": {"low": 7500, "medium": 8500},
+    }
+}
+
+PRICE_BUCKETS = ("low", "medium", "high")
+
+# Groups need this many parts before their own quantiles replace the defaults
+MIN_QUANTILE_SAMPLE = 6
+
+# How long a process trusts its in-memory copy of the thresholds table
+THRESHOLDS_MAX_AGE_SECONDS = 300
+
+price_bucket_thresholds = db.Table(
+    "price_bucket_thresholds",
+    db.Column("category_key", db.String, primary_key=True),
+    db.Column("vehicle_type", db.String, primary_key=True),
+    db.Column("low", db.Float, nullable=False),
+    db.Column("medium", db.Float, nullable=False),
+    db.Column("sample_size", db.Integer, default=0),
+    db.Column("computed_at", db.DateTime, default=datetime.utcnow),
+)
+
+# lightweight view of spareparts (avoids importing the models here)
+_spareparts = table(
+    "spareparts",
+    column("category_key"),
+    column("vehicle_type"),
+    column("buying_price"),
+    column("price_bucket"),
+)
+
+_loaded = {"at": None, "values": {}}
+
+
+# ---------------- Bucketing ----------------
+def bucket_for(price, low, medium):
+    if price is None:
+        return None
+    if price < low:
+        return "low"
+    if price <= medium:
+        return "medium"
+    return "high"
+
+
+def default_thresholds(category_key, vehicle_type):
+    ranges = DEFAULT_PRICE_RANGES.get(category_key)
+    if not ranges:
+        return None
+
+    r = ranges.get(vehicle_type) or ranges.get("default")
+    return (r["low"], r["medium"]) if r else None
+
+
+def load_thresholds(connection, max_age=THRESHOLDS_MAX_AGE_SECONDS):
+    """(category_key, vehicle_type) -> (low, medium), cached in process for max_age seconds."""
+    now = time.monotonic()
+    if _loaded["at"] is None or now - _loaded["at"] > max_age:
+        rows = connection.execute(select(price_bucket_thresholds)).all()
+        _loaded["values"] = {(r.category_key, r.vehicle_type): (r.low, r.medium) for r in rows}
+        _loaded["at"] = now
+
+    return _loaded["values"]
+
+
+def reset_thresholds_cache():
+    _loaded["at"] = None
+    _loaded["values"] = {}
+
+
+def price_bucket_for(connection, category_key, vehicle_type, price):
+    """Bucket for a single part (used by the SpareParts insert/update listeners)."""
+    thresholds = (
+        load_thresholds(connection).get((category_key, vehicle_type))
+        or default_thresholds(category_key, vehicle_type)
+    )
+    return bucket_for(price, *thresholds) if thresholds else None
+
+
+def bucket_case(thresholds, price, sp=_spareparts):
+    """
+    SQL equivalent of bucket_for() for every (category_key, vehicle_type) in
+    `thresholds`; `price` is the price column (or a SQL expression) and `sp`
+    the spareparts table the statement targets.
+    """
+    whens = []
+    # a "default" vehicle type covers the rest of its category, so it goes last
+    for (category_key, vehicle_type), (low, medium) in sorted(
+        thresholds.items(), key=lambda item: item[0][1] == "default"
+    ):
+        scope = sp.c.category_key == category_key
+        if vehicle_type != "default":
+            scope = and_(scope, sp.c.vehicle_type == vehicle_type)
+        whens.extend([
+            (and_(scope, price < low), "low"),
+            (and_(scope, price <= medium), "medium"),
+            (scope, "high"),
+        ])
+
+    return case(*whens, else_=None) if whens else None
+
+
+def current_thresholds(connection):
+    """Stored thresholds, plus the hand tuned defaults for groups without any."""
+    thresholds = {
+        (category_key, vehicle_type): (r["low"], r["medium"])
+        for category_key, ranges in DEFAULT_PRICE_RANGES.items()
+        for vehicle_type, r in ranges.items()
+    }
+    thresholds.update(load_thresholds(connection))
+    return thresholds
+
+
+# ---------------- Periodic Refresh ----------------
+def compute_thresholds(connection):
+    """
+    One grouped pass over the current prices:
+    (category_key, vehicle_type) -> (low, medium, sample_size).
+    """
+    sp = _spareparts
+
+    if connection.dialect.name == "postgresql":
+        rows = connection.execute(
+            select(
+                sp.c.category_key,
+                sp.c.vehicle_type,
+                func.count().label("n"),
+                func.percentile_cont(1 / 3).within_group(sp.c.buying_price).label("low"),
+                func.percentile_cont(2 / 3).within_group(sp.c.buying_price).label("medium"),
+            ).group_by(sp.c.category_key, sp.c.vehicle_type)
+        )
+        return {(r.category_key, r.vehicle_type): (r.low, r.medium, r.n) for r in rows}
+
+    # No ordered-set aggregates: stream the prices sorted by group instead
+    rows = connection.execute(
+        select(sp.c.category_key, sp.c.vehicle_type, sp.c.buying_price)
+        .where(sp.c.buying_price.isnot(None))
+        .order_by(sp.c.category_key, sp.c.vehicle_type)
+    )
+
+    result = {}
+    for key, group in groupby(rows, key=lambda r: (r.category_key, r.vehicle_type)):
+        prices = [r.buying_price for r in group]
+        if len(prices) >= 2:
+            low, medium = quantiles(prices, n=3, method="inclusive")
+        else:
+            low = medium = prices[0]
+        result[key] = (low, medium, len(prices))
+
+    return result
+
+
+def refresh_price_buckets(connection):
+    """
+    Recompute the thresholds, store them, and re-bucket every part with one
+    set based UPDATE. Returns the thresholds that were applied.
+    """
+    computed = compute_thresholds(connection)
+
+    applied = {}
+    for key, (low, medium, n) in computed.items():
+        if n >= MIN_QUANTILE_SAMPLE:
+            applied[key] = (low, medium, n)
+        else:
+            fallback = default_thresholds(*key)
+            if fallback:
+                applied[key] = (*fallback, n)
+
+    now = datetime.utcnow()
+    connection.execute(delete(price_bucket_thresholds))
+    if applied:
+        connection.execute(insert(price_bucket_thresholds), [
+            {
+                "category_key": category_key,
+                "vehicle_type": vehicle_type,
+                "low": low,
+                "medium": medium,
+                "sample_size": n,
+                "computed_at": now,
+            }
+            for (category_key, vehicle_type), (low, medium, n) in applied.items()
+        ])
+
+    sp = _spareparts
+    thresholds = {key: (low, medium) for key, (low, medium, _) in applied.items()}
+
+    connection.execute(
+        update(sp).values(price_bucket=bucket_case(thresholds, sp.c.buying_price))
+    )
+
+    reset_thresholds_cache()
+
+    return {
+        f"{category_key}/{vehicle_type}": {"low": low, "medium": medium, "sample_size": n}
+        for (category_key, vehicle_type), (low, medium, n) in applied.items()
+    }
+
+
+def run_price_bucket_refresh(session):
+    """Refresh inside `session` and commit (bumping the catalog version)."""
+    connection = session.connection()
+    applied = refresh_price_buckets(connection)
+    bump_catalog_version(connection)
+    session.commit()
+    return applied
@@ -0,0 +1,241 @@
+from sqlalchemy import select, update, delete, insert, func, bindparam
+from sqlalchemy.exc import IntegrityError
+from database.models import Reviews, ReviewReactions, ReviewReactionDeltas, SpareParts, generate_uuid
+
+# ------------------------------ REVIEW REACTIONS ---------------------------------
+# A click on like / dislike is a toggle over the (user_id, review_id) row:
+#   1. DELETE the user's reaction RETURNING what it was
+#   2. same value as the click -> removed; otherwise INSERT the new one
+#      (ON CONFLICT DO NOTHING: a concurrent click already inserted it)
+#   3. one UPDATE of reviews.total_likes / total_dislikes by the deltas of
+#      the rows actually deleted / inserted
+# Every click is O(1) whatever the number of reactions, and the counters
+# follow the rows exactly, so concurrent double clicks never double count.
+#
+# Write-behind mode (REACTIONS_WRITE_BEHIND) replaces step 3 with an INSERT
+# into review_reaction_deltas, in the same transaction as the reaction row.
+# flush_reaction_deltas() (a celery beat task every few hundred ms) sums the
+# queued deltas per review and applies them in one batched UPDATE, so a burst
+# of clicks on a popular review no longer queues up on its row (and its
+# part's) lock; the counters lag the reactions by at most one flush.
+
+reactions = ReviewReactions.__table__
+reviews = Reviews.__table__
+spareparts = SpareParts.__table__
+deltas = ReviewReactionDeltas.__table__
+
+# deltas claimed per flush transaction
+FLUSH_BATCH_SIZE = 500
+
+
+def _delete_reaction(connection, user_id, review_id):
+    """Delete the user's reaction; returns its is_like (None if there was none)."""
+    where = (reactions.c.user_id == user_id, reactions.c.review_id == review_id)
+
+    if connection.dialect.delete_returning:
+        previous = connection.execute(delete(reactions).where(*where).returning(reactions.c.is_like)).scalar()
+    else:
+        previous = connection.execute(select(reactions.c.is_like).where(*where)).scalar()
+        if previous is not None:
+            connection.execute(delete(reactions).where(*where))
+
+    return None if previous is None else bool(previous)
+
+
+def _insert_reaction(connection, user_id, review_id, is_like):
+    """Insert the reaction unless a concurrent request did; returns whether it was inserted."""
+    values = {"id": generate_uuid(), "user_id": user_id, "review_id": review_id, "is_like": is_like}
+
+    if connection.dialect.name in ("postgresql", "sqlite"):
+        if connection.dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        statement = dialect_insert(reactions).values(**values).on_conflict_do_nothing(
+            index_elements=["user_id", "review_id"]
+        )
+        return connection.execute(statement).rowcount == 1
+
+    try:
+        with connection.begin_nested():
+            connection.execute(insert(reactions).values(**values))
+        return True
+    except IntegrityError:
+        return False
+
+
+def _record_reaction(connection, user_id, review_id, is_like):
+    """Toggle the reaction row; returns (action, likes delta, dislikes delta)."""
+    previous = _delete_reaction(connection, user_id, review_id)
+    inserted = previous != is_like and _insert_reaction(connection, user_id, review_id, is_like)
+    current = is_like if inserted else None
+
+    if previous is None:
+        action = "added" if inserted else "unchanged"
+    else:
+        action = "switched" if inserted else "removed"
+
+    likes_delta = (current is True) - (previous is True)
+    dislikes_delta = (current is False) - (previous is False)
+    return action, likes_delta, dislikes_delta
+
+
+def _bump_part_versions(connection, sparepart_ids):
+    # reactions are part of the part detail response (its ETag)
+    connection.execute(
+        update(spareparts)
+        .where(spareparts.c.id.in_(list(sparepart_ids)))
+        .values(version=spareparts.c.version + 1)
+    )
+
+
+def toggle_reaction(session, user_id, review_id, is_like, write_behind=False):
+    """
+    Apply a like (is_like=True) / dislike click and commit.
+    Returns {"action", "total_likes", "total_dislikes"}; action is
+    added / removed / switched, or unchanged when a concurrent click won.
+    With write_behind the counter change is queued instead of applied, and
+    the totals returned are the stored counters plus this click.
+    """
+    connection = session.connection()
+
+    action, likes_delta, dislikes_delta = _record_reaction(connection, user_id, review_id, is_like)
+
+    if write_behind:
+        # stored counters plus the deltas still queued for this review
+        pending = select(
+            func.coalesce(func.sum(deltas.c.likes), 0).label("likes"),
+            func.coalesce(func.sum(deltas.c.dislikes), 0).label("dislikes"),
+        ).where(deltas.c.review_id == review_id).subquery()
+        row = connection.execute(
+            select(
+                reviews.c.total_likes,
+                reviews.c.total_dislikes,
+                reviews.c.sparepart_id,
+                pending.c.likes.label("pending_likes"),
+                pending.c.dislikes.label("pending_dislikes"),
+            )
+            .where(reviews.c.id == review_id)
+        ).one()
+
+        if action != "unchanged":
+            connection.execute(insert(deltas).values(
+                review_id=review_id,
+                sparepart_id=row.sparepart_id,
+                likes=likes_delta,
+                dislikes=dislikes_delta,
+            ))
+
+        session.commit()
+
+        return {
+            "action": action,
+            "total_likes": (row.total_likes or 0) + row.pending_likes + likes_delta,
+            "total_dislikes": (row.total_dislikes or 0) + row.pending_dislikes + dislikes_delta,
+        }
+
+    statement = (
+        update(reviews)
+        .where(reviews.c.id == review_id)
+        .values(
+            total_likes=func.coalesce(reviews.c.total_likes, 0) + likes_delta,
+            total_dislikes=func.coalesce(reviews.c.total_dislikes, 0) + dislikes_delta,
+        )
+    )
+    if connection.dialect.update_returning:
+        row = connection.execute(
+            statement.returning(reviews.c.total_likes, reviews.c.total_dislikes, reviews.c.sparepart_id)
+        ).one()
+    else:
+        connection.execute(statement)
+        row = connection.execute(
+            select(reviews.c.total_likes, reviews.c.total_dislikes, reviews.c.sparepart_id)
+            .where(reviews.c.id == review_id)
+        ).one()
+
+    if action != "unchanged":
+        _bump_part_versions(connection, [row.sparepart_id])
+
+    session.commit()
+
+    return {"action": action, "total_likes": row.total_likes, "total_dislikes": row.total_dislikes}
+
+
+def _claim_deltas(connection, batch_size):
+    """Delete (claim) the oldest queued deltas; returns their rows."""
+    oldest = select(deltas.c.id).order_by(deltas.c.id).limit(batch_size).subquery()
+    upto = select(func.max(oldest.c.id)).scalar_subquery()
+    columns = (deltas.c.review_id, deltas.c.sparepart_id, deltas.c.likes, deltas.c.dislikes)
+
+    # a concurrent flush blocks on the claimed rows, then skips them
+    if connection.dialect.delete_returning:
+        return connection.execute(delete(deltas).where(deltas.c.id <= upto).returning(*columns)).all()
+
+    upto = connection.execute(select(upto)).scalar()
+    if upto is None:
+        return []
+    rows = connection.execute(select(*columns).where(deltas.c.id <= upto)).all()
+    connection.execute(delete(deltas).where(deltas.c.id <= upto))
+    return rows
+
+
+def flush_reaction_deltas(session, batch_size=FLUSH_BATCH_SIZE):
+    """
+    Apply the queued reaction deltas: summed per review, one executemany
+    UPDATE of the counters and one UPDATE of the part versions per batch.
+    Returns (deltas applied, reviews updated).
+    """
+    applied = updated = 0
+
+    while True:
+        connection = session.connection()
+        rows = _claim_deltas(connection, batch_size)
+
+        totals = {}
+        for row in rows:
+            total = totals.setdefault(row.review_id, [row.sparepart_id, 0, 0])
+            total[1] += row.likes
+            total[2] += row.dislikes
+
+        # a like and its undo within one flush never touch the review
+        changed = [
+            {"review": review_id, "likes": likes, "dislikes": dislikes}
+            for review_id, (_, likes, dislikes) in totals.items()
+            if likes or dislikes
+        ]
+        if changed:
+            connection.execute(
+                update(reviews)
+                .where(reviews.c.id == bindparam("review"))
+                .values(
+                    total_likes=func.coalesce(reviews.c.total_likes, 0) + bindparam("likes"),
+                    total_dislikes=func.coalesce(reviews.c.total_dislikes, 0) + bindparam("dislikes"),
+                ),
+                changed,
+            )
+            _bump_part_versions(connection, {totals[c["review"]][0] for c in changed})
+
+        session.commit()
+
+        applied += len(rows)
+        updated += len(changed)
+        if len(rows) < batch_size:
+            return applied, updated
+
+
+def reaction_label(is_like):
+    return None if is_like is None else ("like" if is_like else "dislike")
+
+
+def viewer_reactions(session, user_id, review_ids):
+    """{review id: "like" / "dislike"} for the viewer's reactions to these reviews, in one query."""
+    review_ids = list(review_ids)
+    if not user_id or not review_ids:
+        return {}
+
+    rows = session.execute(
+        select(reactions.c.review_id, reactions.c.is_like)
+        .where(reactions.c.user_id == user_id, reactions.c.review_id.in_(review_ids))
+    )
+    return {row.review_id: reaction_label(row.is_like) for row in rows}
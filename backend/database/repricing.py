@@ -0,0 +1,86 @@
+from sqlalchemy import update, case, cast, func, Numeric, and_
+from database.models import SpareParts
+from database.price_buckets import bucket_case, current_thresholds
+from database.catalog_version import bump_catalog_version
+
+# ------------------------------ BULK REPRICING ---------------------------------
+# Reprices every part matching a filter with a single UPDATE. The new prices,
+# the discount fields (same rules as SpareParts.calculate_discount), the price
+# bucket and the part version are all computed in SQL, then the catalog
+# version is bumped so cached listings are dropped.
+#
+#   percentage -> price * (1 + value / 100)
+#   absolute   -> price + value
+#   margin     -> buying_price = marked_price * (1 - value / 100)
+#                 (ie. the discount percentage becomes `value`)
+
+REPRICE_MODES = ("percentage", "absolute", "margin")
+REPRICE_TARGETS = ("buying_price", "marked_price", "both")
+
+
+def _round(expr):
+    # numeric cast: Postgres has no round(double precision, int)
+    return func.round(cast(expr, Numeric), 2)
+
+
+def _adjusted(column, mode, value):
+    if mode == "percentage":
+        expr = column * (1 + value / 100)
+    else:
+        expr = column + value
+    # never below zero
+    return case((expr < 0, 0.0), else_=_round(expr))
+
+
+def discount_expressions(buying, marked):
+    """SpareParts.calculate_discount as SQL over (new) price expressions."""
+    has_prices = and_(func.coalesce(marked, 0) != 0, func.coalesce(buying, 0) != 0)
+    amount = _round(marked - buying)
+
+    discount_amount = case((has_prices, amount), else_=0.0)
+    discount_percentage = case(
+        (and_(has_prices, marked > 0), _round(amount / marked * 100)),
+        else_=0.0,
+    )
+    return discount_amount, discount_percentage
+
+
+def reprice_spareparts(session, criteria, mode, value, target="buying_price"):
+    """Apply the adjustment to every part matching `criteria`; returns the affected row count."""
+    if mode not in REPRICE_MODES:
+        raise ValueError(f"mode must be one of: {', '.join(REPRICE_MODES)}")
+    if target not in REPRICE_TARGETS:
+        raise ValueError(f"target must be one of: {', '.join(REPRICE_TARGETS)}")
+    if mode == "margin" and not 0 <= value < 100:
+        raise ValueError("margin must be between 0 and 100")
+
+    buying, marked = SpareParts.buying_price, SpareParts.marked_price
+
+    if mode == "margin":
+        new_buying, new_marked = _round(marked * (1 - value / 100)), marked
+    else:
+        new_buying = _adjusted(buying, mode, value) if target in ("buying_price", "both") else buying
+        new_marked = _adjusted(marked, mode, value) if target in ("marked_price", "both") else marked
+
+    discount_amount, discount_percentage = discount_expressions(new_buying, new_marked)
+
+    connection = session.connection()
+    result = session.execute(
+        update(SpareParts)
+        .where(*criteria)
+        .values(
+            buying_price=new_buying,
+            marked_price=new_marked,
+            discount_amount=discount_amount,
+            discount_percentage=discount_percentage,
+            price_bucket=bucket_case(current_thresholds(connection), new_buying, SpareParts.__table__),
+            version=SpareParts.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount:
+        bump_catalog_version(connection)
+
+    session.commit()
+    return result.rowcount
@@ -0,0 +1,193 @@
+from sqlalchemy import select, update, case, cast, exists, func, or_, true, table, column, Numeric, Float, Boolean
+from database.catalog_version import bump_catalog_version
+
+# ------------------------------ REVIEW STATISTICS ---------------------------------
+# Each part stores running totals of its reviews:
+#   total_reviews  -> every review (comment-only ones included)
+#   rating_sum     -> sum of the 1-5 ratings
+#   rating_count   -> number of rated reviews
+#   average_rating -> rating_sum / rating_count, rounded to 1 decimal
+#   rating_<n>_count, comments_only_count -> the star histogram: reviews per
+#                     rating, and reviews without one
+#
+# A review write changes them with one UPDATE of deltas (SET x = x + :delta),
+# so it costs the same for the first review and the 50 000th, and concurrent
+# writes never overwrite each other. reconcile_review_stats() recomputes them
+# from the reviews table to correct any drift (raw SQL edits, older rows...).
+#
+# A review write bumps only its part's version (the detail ETag) and flags the
+# part review_stats_dirty. The listings see the new totals when
+# publish_review_stats() (celery beat, every REVIEW_STATS_PUBLISH_SECONDS)
+# clears the flags and bumps the catalog version once for all of them, so
+# review traffic never contends on the catalog_version row nor wipes the
+# response cache on every write.
+
+# histogram column per rating (None = comment only)
+HISTOGRAM_COLUMNS = {
+    **{rating: f"rating_{rating}_count" for rating in range(1, 6)},
+    None: "comments_only_count",
+}
+
+# every running total kept on spareparts
+STAT_COLUMNS = ("total_reviews", "rating_sum", "rating_count", *HISTOGRAM_COLUMNS.values())
+
+# lightweight views of spareparts / reviews (database.models imports this module)
+_spareparts = table(
+    "spareparts",
+    column("id"),
+    column("total_reviews"),
+    column("rating_sum"),
+    column("rating_count"),
+    column("average_rating"),
+    *[column(name) for name in HISTOGRAM_COLUMNS.values()],
+    column("version"),
+    column("review_stats_dirty", Boolean),
+)
+
+_reviews = table(
+    "reviews",
+    column("id"),
+    column("sparepart_id"),
+    column("rating"),
+)
+
+
+def _average(rating_sum, rating_count):
+    # numeric cast: Postgres has no round(double precision, int)
+    return case(
+        (rating_count > 0, cast(func.round(cast(rating_sum, Numeric) / rating_count, 1), Float)),
+        else_=0.0,
+    )
+
+
+def rating_delta(old_rating=None, new_rating=None):
+    """(sum delta, count delta) for a rating going from old_rating to new_rating (None = unrated)."""
+    return (
+        (new_rating or 0) - (old_rating or 0),
+        (new_rating is not None) - (old_rating is not None),
+    )
+
+
+def histogram_delta(reviews=0, old_rating=None, new_rating=None):
+    """{histogram column: delta} for a review added (+1), removed (-1) or edited (0)."""
+    delta = dict.fromkeys(HISTOGRAM_COLUMNS.values(), 0)
+    if reviews <= 0:
+        delta[HISTOGRAM_COLUMNS[old_rating]] -= 1
+    if reviews >= 0:
+        delta[HISTOGRAM_COLUMNS[new_rating]] += 1
+    return {name: value for name, value in delta.items() if value}
+
+
+def histogram(part):
+    """The star histogram of a part (model instance or row) as {"1".."5": count} plus the comment-only count."""
+    return {
+        "ratings": {str(rating): getattr(part, HISTOGRAM_COLUMNS[rating]) or 0 for rating in range(1, 6)},
+        "comments_only": getattr(part, HISTOGRAM_COLUMNS[None]) or 0,
+    }
+
+
+def apply_review_delta(connection, sparepart_id, reviews=0, old_rating=None, new_rating=None):
+    """
+    Adjust one part's totals (and bump its version) with a single UPDATE.
+    `reviews` is +1 / -1 for an added / removed review, 0 for an edit.
+    Changed totals reach the listings on the next publish_review_stats().
+    """
+    sp = _spareparts
+    sum_delta, count_delta = rating_delta(old_rating, new_rating)
+    buckets = histogram_delta(reviews, old_rating, new_rating)
+    stats_changed = bool(reviews or sum_delta or count_delta or buckets)
+
+    values = {"version": sp.c.version + 1}
+    if stats_changed:
+        # SET expressions read the pre-update values, so the average uses the new totals
+        new_sum = func.coalesce(sp.c.rating_sum, 0) + sum_delta
+        new_count = func.coalesce(sp.c.rating_count, 0) + count_delta
+        values.update(
+            total_reviews=func.coalesce(sp.c.total_reviews, 0) + reviews,
+            rating_sum=new_sum,
+            rating_count=new_count,
+            average_rating=_average(new_sum, new_count),
+            review_stats_dirty=True,
+            **{name: func.coalesce(sp.c[name], 0) + delta for name, delta in buckets.items()},
+        )
+
+    connection.execute(update(sp).where(sp.c.id == sparepart_id).values(**values))
+
+
+def publish_review_stats(session):
+    """
+    Make the review totals changed since the last run visible in the cached
+    listings: clear the dirty flags and bump the catalog version once.
+    Returns the number of parts published.
+    """
+    sp = _spareparts
+    connection = session.connection()
+
+    published = connection.execute(
+        update(sp).where(sp.c.review_stats_dirty == true()).values(review_stats_dirty=False)
+    ).rowcount
+
+    if published:
+        bump_catalog_version(connection)
+
+    session.commit()
+    return published
+
+
+def reconcile_review_stats(session, sparepart_ids=None):
+    """
+    Recompute the totals and histogram of every part (or `sparepart_ids`)
+    from one grouped aggregate over the reviews, touching only the parts
+    that drifted. Returns the number of corrected parts.
+    """
+    sp, reviews = _spareparts, _reviews
+    rating = reviews.c.rating
+
+    grouped = (
+        select(
+            reviews.c.sparepart_id,
+            func.count(reviews.c.id).label("total_reviews"),
+            func.coalesce(func.sum(rating), 0).label("rating_sum"),
+            func.count(rating).label("rating_count"),
+            *[
+                func.count(case((rating.is_(None) if value is None else rating == value, 1))).label(name)
+                for value, name in HISTOGRAM_COLUMNS.items()
+            ],
+        )
+        .group_by(reviews.c.sparepart_id)
+    )
+    if sparepart_ids is not None:
+        sparepart_ids = list(sparepart_ids)
+        grouped = grouped.where(reviews.c.sparepart_id.in_(sparepart_ids))
+    actual = grouped.subquery()
+
+    def drifted(expected):
+        return or_(*[func.coalesce(sp.c[name], -1) != expected(name) for name in STAT_COLUMNS])
+
+    # parts with reviews: UPDATE ... FROM the grouped counts
+    with_reviews = (
+        update(sp)
+        .where(sp.c.id == actual.c.sparepart_id, drifted(lambda name: actual.c[name]))
+        .values(
+            average_rating=_average(actual.c.rating_sum, actual.c.rating_count),
+            version=sp.c.version + 1,
+            **{name: actual.c[name] for name in STAT_COLUMNS},
+        )
+    )
+    # parts left without reviews
+    without_reviews = (
+        update(sp)
+        .where(~exists().where(reviews.c.sparepart_id == sp.c.id), drifted(lambda name: 0))
+        .values(average_rating=0.0, version=sp.c.version + 1, **dict.fromkeys(STAT_COLUMNS, 0))
+    )
+    if sparepart_ids is not None:
+        without_reviews = without_reviews.where(sp.c.id.in_(sparepart_ids))
+
+    connection = session.connection()
+    corrected = connection.execute(with_reviews).rowcount + connection.execute(without_reviews).rowcount
+
+    if corrected:
+        bump_catalog_version(connection)
+
+    session.commit()
+    return corrected
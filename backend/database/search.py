@@ -0,0 +1,221 @@
+import re
+import hashlib
+from sqlalchemy import text, bindparam
+
+# ------------------------------ FULL TEXT SEARCH INDEX ---------------------------------
+# An inverted index over the searchable spare part fields, kept in a side table:
+#   - SQLite   -> FTS5 virtual table "spareparts_fts"
+#   - Postgres -> "spareparts_search" (weighted tsvector + GIN index)
+# Rows are maintained incrementally from the SpareParts mapper events.
+
+SEARCH_FIELDS = ("brand", "category", "vehicle_type", "colour", "description")
+
+_available = {}
+
+
+def _dialect(connection):
+    return connection.dialect.name
+
+
+def _cache_key(connection):
+    return str(connection.engine.url)
+
+
+def _fts_rowid(sparepart_id):
+    """
+    Stable 63-bit FTS rowid derived from the string id.
+    (spareparts.rowid can't be used: SQLite may renumber it on VACUUM
+    because the primary key is not an INTEGER PRIMARY KEY.)
+    """
+    digest = hashlib.sha1(sparepart_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") & 0x7FFFFFFFFFFFFFFF
+
+
+# ---------------- DDL ----------------
+def create_search_index(connection):
+    """Create the dialect specific index table. Safe to call repeatedly."""
+    dialect = _dialect(connection)
+    available = True
+
+    if dialect == "sqlite":
+        try:
+            connection.execute(text(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS spareparts_fts USING fts5("
+                "sparepart_id UNINDEXED, brand, category, vehicle_type, colour, description, "
+                "prefix='2 3')"
+            ))
+        except Exception:
+            # SQLite build without FTS5
+            available = False
+
+    elif dialect == "postgresql":
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS spareparts_search ("
+            "sparepart_id VARCHAR PRIMARY KEY REFERENCES spareparts(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_spareparts_search_document "
+            "ON spareparts_search USING GIN (document)"
+        ))
+
+    else:
+        available = False
+
+    _available[_cache_key(connection)] = available
+    return available
+
+
+def drop_search_index(connection):
+    dialect = _dialect(connection)
+
+    if dialect == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS spareparts_fts"))
+    elif dialect == "postgresql":
+        connection.execute(text("DROP TABLE IF EXISTS spareparts_search"))
+
+    _available.pop(_cache_key(connection), None)
+
+
+def search_index_available(connection):
+    key = _cache_key(connection)
+
+    if key not in _available:
+        dialect = _dialect(connection)
+        found = None
+
+        if dialect == "sqlite":
+            found = connection.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE name = 'spareparts_fts'"
+            )).first()
+        elif dialect == "postgresql":
+            found = connection.execute(text(
+                "SELECT to_regclass('spareparts_search')"
+            )).scalar()
+
+        _available[key] = bool(found)
+
+    return _available[key]
+
+
+# ---------------- Incremental Maintenance ----------------
+_PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(brand, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(category, '') || ' ' || coalesce(vehicle_type, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(colour, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+
+
+def index_spareparts(connection, ids=None):
+    """(Re)index the given spare part ids, or the whole catalog when ids is None."""
+    if not search_index_available(connection):
+        return
+
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+
+    where = "" if ids is None else " WHERE id IN :ids"
+    params = {} if ids is None else {"ids": ids}
+
+    def statement(sql):
+        stmt = text(sql)
+        return stmt.bindparams(bindparam("ids", expanding=True)) if ids is not None else stmt
+
+    if _dialect(connection) == "sqlite":
+        rows = connection.execute(
+            statement("SELECT id, brand, category, vehicle_type, colour, description FROM spareparts" + where),
+            params,
+        ).all()
+
+        if ids is None:
+            connection.execute(text("DELETE FROM spareparts_fts"))
+        else:
+            connection.execute(
+                text("DELETE FROM spareparts_fts WHERE rowid = :rowid"),
+                [{"rowid": _fts_rowid(i)} for i in ids],
+            )
+
+        if rows:
+            connection.execute(
+                text(
+                    "INSERT INTO spareparts_fts "
+                    "(rowid, sparepart_id, brand, category, vehicle_type, colour, description) "
+                    "VALUES (:rowid, :id, :brand, :category, :vehicle_type, :colour, :description)"
+                ),
+                [{"rowid": _fts_rowid(r.id), **r._asdict()} for r in rows],
+            )
+
+    else:
+        connection.execute(
+            statement(
+                "INSERT INTO spareparts_search (sparepart_id, document) "
+                f"SELECT id, {_PG_DOCUMENT} FROM spareparts{where} "
+                "ON CONFLICT (sparepart_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            params,
+        )
+
+
+def unindex_spareparts(connection, ids):
+    """Remove spare parts from the index."""
+    ids = list(ids)
+    if not ids or not search_index_available(connection):
+        return
+
+    if _dialect(connection) == "sqlite":
+        connection.execute(
+            text("DELETE FROM spareparts_fts WHERE rowid = :rowid"),
+            [{"rowid": _fts_rowid(i)} for i in ids],
+        )
+    else:
+        connection.execute(
+            text("DELETE FROM spareparts_search WHERE sparepart_id IN :ids")
+            .bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+
+
+# ---------------- Querying ----------------
+def tokenize(query):
+    """Split free text into lower-cased word tokens (drops any query syntax)."""
+    return re.findall(r"\w+", (query or "").lower())
+
+
+def search_sparepart_ids(connection, query, limit=16, offset=0):
+    """
+    Ids matching every token of `query` (prefix match per token), best first.
+    Returns None when this database has no search index.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+
+    if not search_index_available(connection):
+        return None
+
+    params = {"limit": limit, "offset": offset}
+
+    if _dialect(connection) == "sqlite":
+        # "michelin"* "suv"* -> AND of prefix terms ranked by bm25,
+        # weighting brand over category / vehicle type over the rest
+        params["q"] = " ".join(f'"{t}"*' for t in tokens)
+        rows = connection.execute(text(
+            "SELECT sparepart_id FROM spareparts_fts "
+            "WHERE spareparts_fts MATCH :q "
+            "ORDER BY bm25(spareparts_fts, 0.0, 4.0, 2.0, 2.0, 1.0, 0.5), sparepart_id "
+            "LIMIT :limit OFFSET :offset"
+        ), params)
+
+    else:
+        params["q"] = " & ".join(f"{t}:*" for t in tokens)
+        rows = connection.execute(text(
+            "SELECT d.sparepart_id FROM spareparts_search d, to_tsquery('simple', :q) q "
+            "WHERE d.document @@ q "
+            "ORDER BY ts_rank(d.document, q) DESC, d.sparepart_id "
+            "LIMIT :limit OFFSET :offset"
+        ), params)
+
+    return [r[0] for r in rows]
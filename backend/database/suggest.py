@@ -0,0 +1,175 @@
+import time
+import heapq
+import threading
+from bisect import bisect_left, insort
+from sqlalchemy import text
+
+# ------------------------------ TYPEAHEAD INDEX ---------------------------------
+# In-process prefix index for the search box (/spareparts/suggest):
+#   - brands, categories and "brand category vehicle_type" phrases
+#   - each weighted by popularity: the parts behind it + their review counts
+#
+# Terms live in a sorted array of normalized keys, so a prefix lookup is a
+# bisect plus a short scan, with no database round trip. The index is built
+# once per process from the spareparts table, then kept in step with the
+# SpareParts mapper events (applied on commit, dropped on rollback).
+# Writes from other processes are picked up by the periodic rebuild
+# (SUGGEST_REBUILD_SECONDS).
+
+# cached answers per (prefix, limit); cleared on every change
+MAX_MEMO_ENTRIES = 4096
+
+PENDING_KEY = "suggest_pending"
+
+
+def _normalize(value):
+    return " ".join(str(value).split()).lower() if value else ""
+
+
+def part_terms(brand, category, vehicle_type):
+    """(key, kind, text, filters) for every term a part contributes."""
+    terms = []
+    if brand:
+        terms.append((_normalize(brand), "brand", brand, {"brand": brand}))
+    if category:
+        terms.append((_normalize(category), "category", category, {"category": category}))
+    if brand and category and vehicle_type:
+        phrase = f"{brand} {category} {vehicle_type}"
+        terms.append((
+            _normalize(phrase), "phrase", phrase,
+            {"brand": brand, "category": category, "vehicle_type": vehicle_type},
+        ))
+    return terms
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._parts = {}    # part id -> (terms, weight)
+            self._terms = {}    # "key\0kind" -> [text, kind, filters, weight, parts]
+            self._keys = []     # sorted "key\0kind"
+            self._memo = {}
+            self.built_at = None
+
+    # ---------------- Building ----------------
+    def rebuild(self, connection):
+        rows = connection.execute(text(
+            "SELECT id, brand, category, vehicle_type, total_reviews FROM spareparts"
+        )).all()
+
+        with self._lock:
+            self._parts, self._terms, self._memo = {}, {}, {}
+            for row in rows:
+                self._add(row.id, part_terms(row.brand, row.category, row.vehicle_type), row.total_reviews)
+            self._keys = sorted(self._terms)
+            self.built_at = time.monotonic()
+
+    def is_stale(self, max_age=None):
+        """Not built yet, or older than `max_age` seconds."""
+        return self.built_at is None or bool(max_age and time.monotonic() - self.built_at > max_age)
+
+    def ensure_built(self, connect, max_age=None):
+        """
+        Build on first use, and again once the index is older than `max_age`
+        seconds. `connect` returns the connection to build from; it is only
+        called when a (re)build is due, so a warm lookup never checks one out.
+        """
+        if self.is_stale(max_age):
+            self.rebuild(connect())
+
+    # ---------------- Incremental Maintenance ----------------
+    def apply(self, changes):
+        """changes: {part id: (brand, category, vehicle_type, total_reviews) or None for a delete}"""
+        with self._lock:
+            if self.built_at is None:
+                # not built yet: the first build reads everything anyway
+                return
+            for part_id, values in changes.items():
+                self._remove(part_id)
+                if values is not None:
+                    brand, category, vehicle_type, total_reviews = values
+                    self._add(part_id, part_terms(brand, category, vehicle_type), total_reviews, keep_sorted=True)
+            self._memo = {}
+
+    def _add(self, part_id, terms, total_reviews, keep_sorted=False):
+        weight = 1 + (total_reviews or 0)
+        self._parts[part_id] = (terms, weight)
+
+        for key, kind, term_text, filters in terms:
+            term_key = f"{key}\0{kind}"
+            term = self._terms.get(term_key)
+            if term is None:
+                self._terms[term_key] = [term_text, kind, filters, weight, 1]
+                if keep_sorted:
+                    insort(self._keys, term_key)
+            else:
+                term[3] += weight
+                term[4] += 1
+
+    def _remove(self, part_id):
+        entry = self._parts.pop(part_id, None)
+        if entry is None:
+            return
+
+        terms, weight = entry
+        for key, kind, _, _ in terms:
+            term_key = f"{key}\0{kind}"
+            term = self._terms[term_key]
+            term[3] -= weight
+            term[4] -= 1
+            if term[4] == 0:
+                del self._terms[term_key]
+                del self._keys[bisect_left(self._keys, term_key)]
+
+    # ---------------- Lookup ----------------
+    def suggest(self, prefix, limit=8):
+        """Most popular terms starting with `prefix`, as [{text, type, weight, filters}]."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+
+        with self._lock:
+            memo_key = (prefix, limit)
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+
+            matches = []
+            keys = self._keys
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                matches.append(self._terms[keys[i]])
+                i += 1
+
+            best = heapq.nsmallest(limit, matches, key=lambda t: (-t[3], len(t[0]), t[0]))
+            result = [
+                {"text": t[0], "type": t[1], "weight": t[3], "filters": t[2]}
+                for t in best
+            ]
+
+            if len(self._memo) >= MAX_MEMO_ENTRIES:
+                self._memo.clear()
+            self._memo[memo_key] = result
+            return result
+
+
+suggestions = SuggestIndex()
+
+
+# ---------------- Session Bookkeeping ----------------
+def record_part_change(session, part_id, values):
+    """Queue a part's terms (None: removed) until the session commits."""
+    session.info.setdefault(PENDING_KEY, {})[part_id] = values
+
+
+def apply_pending(session):
+    changes = session.info.pop(PENDING_KEY, None)
+    if changes:
+        suggestions.apply(changes)
+
+
+def discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
@@ -51,6 +51,21 @@ def get_metadata():
     return target_db.metadata
 
 
+# Full text search tables created in raw SQL (database/search.py, migration
+# d41e9a7b3c25), unknown to the metadata: FTS5 "spareparts_fts" and its
+# shadow tables on SQLite, "spareparts_search" on Postgres. Without this
+# autogenerate would emit DROPs for them.
+SEARCH_TABLE_PREFIXES = ('spareparts_fts', 'spareparts_search')
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith(SEARCH_TABLE_PREFIXES):
+        return False
+    if type_ == 'index' and object.table.name.startswith(SEARCH_TABLE_PREFIXES):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +80,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +109,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
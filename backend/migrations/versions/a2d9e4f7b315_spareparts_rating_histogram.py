@@ -0,0 +1,46 @@
+"""Star rating histogram on spare parts
+
+Revision ID: a2d9e4f7b315
+Revises: f3b8d1a6c594
+Create Date: 2026-10-18 20:21:54.806311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d9e4f7b315'
+down_revision = 'f3b8d1a6c594'
+branch_labels = None
+depends_on = None
+
+
+HISTOGRAM = {
+    'rating_1_count': 'rating = 1',
+    'rating_2_count': 'rating = 2',
+    'rating_3_count': 'rating = 3',
+    'rating_4_count': 'rating = 4',
+    'rating_5_count': 'rating = 5',
+    'comments_only_count': 'rating IS NULL',
+}
+
+
+def upgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        for name in HISTOGRAM:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the existing reviews (the same values reconcile_review_stats computes)
+    op.execute(
+        "UPDATE spareparts SET " + ", ".join(
+            f"{name} = (SELECT count(*) FROM reviews WHERE reviews.sparepart_id = spareparts.id AND {condition})"
+            for name, condition in HISTOGRAM.items()
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        for name in reversed(list(HISTOGRAM)):
+            batch_op.drop_column(name)
@@ -0,0 +1,26 @@
+"""Index reviews by part and creation time
+
+Revision ID: a8e3f5c1d702
+Revises: f2c4d6e8a913
+Create Date: 2026-10-18 14:21:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3f5c1d702'
+down_revision = 'f2c4d6e8a913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_sparepart_created', ['sparepart_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_sparepart_created')
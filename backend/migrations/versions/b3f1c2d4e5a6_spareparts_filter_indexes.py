@@ -0,0 +1,103 @@
+"""Normalized filter columns and indexes on spareparts
+
+Revision ID: b3f1c2d4e5a6
+Revises: a6240cdb8897
+Create Date: 2026-10-18 09:12:44.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1c2d4e5a6'
+down_revision = 'a6240cdb8897'
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+spareparts = sa.table(
+    'spareparts',
+    sa.column('id', sa.String()),
+    sa.column('category', sa.String()),
+    sa.column('brand', sa.String()),
+    sa.column('colour', sa.String()),
+    sa.column('vehicle_type', sa.String()),
+    sa.column('category_key', sa.String()),
+    sa.column('brand_key', sa.String()),
+    sa.column('colour_key', sa.String()),
+)
+
+
+def normalize_key(value):
+    # copy of models.normalize_key at this revision (migrations must not import the app)
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower() or None
+
+
+def backfill_filter_keys(connection):
+    update = (
+        spareparts.update()
+        .where(spareparts.c.id == sa.bindparam('_id'))
+        .values(
+            category_key=sa.bindparam('_category_key'),
+            brand_key=sa.bindparam('_brand_key'),
+            colour_key=sa.bindparam('_colour_key'),
+            vehicle_type=sa.bindparam('_vehicle_type'),
+        )
+    )
+
+    last_id = None
+    while True:
+        query = sa.select(
+            spareparts.c.id, spareparts.c.category, spareparts.c.brand,
+            spareparts.c.colour, spareparts.c.vehicle_type,
+        ).order_by(spareparts.c.id).limit(BACKFILL_BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(spareparts.c.id > last_id)
+
+        rows = connection.execute(query).all()
+        if not rows:
+            break
+
+        connection.execute(update, [
+            {
+                '_id': row.id,
+                '_category_key': normalize_key(row.category),
+                '_brand_key': normalize_key(row.brand),
+                '_colour_key': normalize_key(row.colour),
+                '_vehicle_type': row.vehicle_type.strip().lower() if row.vehicle_type else row.vehicle_type,
+            }
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+
+def upgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('category_key', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('brand_key', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('colour_key', sa.String(), nullable=True))
+
+    # Backfill existing rows with the same normalization as models.normalize_key
+    # (trim, collapse inner whitespace, lower-case), which SQL can't express
+    # portably: done in Python, BACKFILL_BATCH_SIZE rows at a time.
+    backfill_filter_keys(op.get_bind())
+
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.create_index('ix_spareparts_category_vehicle_price', ['category_key', 'vehicle_type', 'buying_price'], unique=False)
+        batch_op.create_index('ix_spareparts_brand_key', ['brand_key'], unique=False)
+        batch_op.create_index('ix_spareparts_colour_key', ['colour_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_index('ix_spareparts_colour_key')
+        batch_op.drop_index('ix_spareparts_brand_key')
+        batch_op.drop_index('ix_spareparts_category_vehicle_price')
+        batch_op.drop_column('colour_key')
+        batch_op.drop_column('brand_key')
+        batch_op.drop_column('category_key')
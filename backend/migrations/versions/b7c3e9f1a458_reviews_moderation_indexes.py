@@ -0,0 +1,30 @@
+"""Index reviews for the admin moderation feed
+
+Revision ID: b7c3e9f1a458
+Revises: a2d9e4f7b315
+Create Date: 2026-10-18 20:57:31.649270
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c3e9f1a458'
+down_revision = 'a2d9e4f7b315'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_reviews_user_created', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_reviews_rating_created', ['rating', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_rating_created')
+        batch_op.drop_index('ix_reviews_user_created')
+        batch_op.drop_index('ix_reviews_created')
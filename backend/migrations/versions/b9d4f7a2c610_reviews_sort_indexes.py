@@ -0,0 +1,28 @@
+"""Index reviews by part for rating and helpfulness sorts
+
+Revision ID: b9d4f7a2c610
+Revises: a8e3f5c1d702
+Create Date: 2026-10-18 16:05:12.430917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9d4f7a2c610'
+down_revision = 'a8e3f5c1d702'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.create_index('ix_reviews_sparepart_rating', ['sparepart_id', 'rating', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_reviews_sparepart_likes', ['sparepart_id', 'total_likes', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_reviews_sparepart_likes')
+        batch_op.drop_index('ix_reviews_sparepart_rating')
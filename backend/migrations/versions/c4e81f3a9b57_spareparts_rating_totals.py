@@ -0,0 +1,40 @@
+"""Running rating totals on spare parts
+
+Revision ID: c4e81f3a9b57
+Revises: b9d4f7a2c610
+Create Date: 2026-10-18 16:48:37.602183
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e81f3a9b57'
+down_revision = 'b9d4f7a2c610'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('rating_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the existing reviews (the same values reconcile_review_stats computes)
+    op.execute(
+        "UPDATE spareparts SET "
+        "total_reviews = (SELECT count(*) FROM reviews WHERE reviews.sparepart_id = spareparts.id), "
+        "rating_sum = (SELECT coalesce(sum(rating), 0) FROM reviews WHERE reviews.sparepart_id = spareparts.id), "
+        "rating_count = (SELECT count(rating) FROM reviews WHERE reviews.sparepart_id = spareparts.id)"
+    )
+    op.execute(
+        "UPDATE spareparts SET average_rating = CASE WHEN rating_count > 0 "
+        "THEN CAST(round(CAST(rating_sum AS NUMERIC) / rating_count, 1) AS FLOAT) ELSE 0.0 END"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_column('rating_count')
+        batch_op.drop_column('rating_sum')
@@ -0,0 +1,28 @@
+"""Keyset pagination indexes on spareparts
+
+Revision ID: c7d2e8f90a1b
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-18 10:03:27.551904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e8f90a1b'
+down_revision = 'b3f1c2d4e5a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.create_index('ix_spareparts_price_id', ['buying_price', 'id'], unique=False)
+        batch_op.create_index('ix_spareparts_rating_id', ['average_rating', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_index('ix_spareparts_rating_id')
+        batch_op.drop_index('ix_spareparts_price_id')
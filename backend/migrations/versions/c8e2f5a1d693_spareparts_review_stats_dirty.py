@@ -0,0 +1,28 @@
+"""Flag parts whose review totals are not yet published to the listings
+
+Revision ID: c8e2f5a1d693
+Revises: b7c3e9f1a458
+Create Date: 2026-10-18 21:42:08.315907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e2f5a1d693'
+down_revision = 'b7c3e9f1a458'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('review_stats_dirty', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.create_index('ix_spareparts_review_stats_dirty', ['review_stats_dirty'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_index('ix_spareparts_review_stats_dirty')
+        batch_op.drop_column('review_stats_dirty')
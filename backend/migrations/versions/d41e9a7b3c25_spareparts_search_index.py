@@ -0,0 +1,90 @@
+"""Full text search index over spareparts
+
+Revision ID: d41e9a7b3c25
+Revises: c7d2e8f90a1b
+Create Date: 2026-10-18 11:26:05.904113
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41e9a7b3c25'
+down_revision = 'c7d2e8f90a1b'
+branch_labels = None
+depends_on = None
+
+
+# The DDL and the initial indexing are inlined (as database/search.py did them
+# at this revision) so later changes to the app module can't alter this migration.
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(brand, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(category, '') || ' ' || coalesce(vehicle_type, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(colour, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'D')"
+)
+
+
+def fts_rowid(sparepart_id):
+    # stable 63-bit rowid derived from the string id
+    digest = hashlib.sha1(sparepart_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") & 0x7FFFFFFFFFFFFFFF
+
+
+def upgrade():
+    # SQLite: FTS5 virtual table, Postgres: tsvector table + GIN index
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        try:
+            with bind.begin_nested():
+                bind.execute(sa.text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS spareparts_fts USING fts5("
+                    "sparepart_id UNINDEXED, brand, category, vehicle_type, colour, description, "
+                    "prefix='2 3')"
+                ))
+        except sa.exc.OperationalError:
+            # SQLite build without FTS5: search falls back to LIKE
+            return
+
+        rows = bind.execute(sa.text(
+            "SELECT id, brand, category, vehicle_type, colour, description FROM spareparts"
+        )).all()
+        if rows:
+            bind.execute(
+                sa.text(
+                    "INSERT INTO spareparts_fts "
+                    "(rowid, sparepart_id, brand, category, vehicle_type, colour, description) "
+                    "VALUES (:rowid, :id, :brand, :category, :vehicle_type, :colour, :description)"
+                ),
+                [{"rowid": fts_rowid(r.id), **r._asdict()} for r in rows],
+            )
+
+    elif bind.dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS spareparts_search ("
+            "sparepart_id VARCHAR PRIMARY KEY REFERENCES spareparts(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_spareparts_search_document "
+            "ON spareparts_search USING GIN (document)"
+        )
+        op.execute(
+            "INSERT INTO spareparts_search (sparepart_id, document) "
+            f"SELECT id, {PG_DOCUMENT} FROM spareparts "
+            "ON CONFLICT (sparepart_id) DO UPDATE SET document = EXCLUDED.document"
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS spareparts_fts")
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP TABLE IF EXISTS spareparts_search")
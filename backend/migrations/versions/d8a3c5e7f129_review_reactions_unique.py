@@ -0,0 +1,41 @@
+"""One reaction per user and review
+
+Revision ID: d8a3c5e7f129
+Revises: c4e81f3a9b57
+Create Date: 2026-10-18 17:32:09.845311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8a3c5e7f129'
+down_revision = 'c4e81f3a9b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # keep a single reaction per (user, review) before adding the constraint
+    op.execute(
+        "DELETE FROM review_reactions WHERE id NOT IN "
+        "(SELECT min(id) FROM review_reactions GROUP BY user_id, review_id)"
+    )
+
+    # counters are maintained by deltas from now on: start them from the rows
+    op.execute(
+        "UPDATE reviews SET "
+        "total_likes = (SELECT count(*) FROM review_reactions r "
+        "WHERE r.review_id = reviews.id AND r.is_like = true), "
+        "total_dislikes = (SELECT count(*) FROM review_reactions r "
+        "WHERE r.review_id = reviews.id AND r.is_like = false)"
+    )
+
+    with op.batch_alter_table('review_reactions', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_review_reactions_user_review', ['user_id', 'review_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('review_reactions', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_review_reactions_user_review', type_='unique')
@@ -0,0 +1,26 @@
+"""Index review reactions by review for the admin reaction pages
+
+Revision ID: e1f7b3c9d482
+Revises: d8a3c5e7f129
+Create Date: 2026-10-18 19:12:40.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f7b3c9d482'
+down_revision = 'd8a3c5e7f129'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('review_reactions', schema=None) as batch_op:
+        batch_op.create_index('ix_review_reactions_review', ['review_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('review_reactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_review_reactions_review')
@@ -0,0 +1,133 @@
+"""Stored price buckets on spareparts
+
+Revision ID: e5a0b6c8d217
+Revises: d41e9a7b3c25
+Create Date: 2026-10-18 12:40:51.220764
+
+"""
+from datetime import datetime
+from itertools import groupby
+from statistics import quantiles
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a0b6c8d217'
+down_revision = 'd41e9a7b3c25'
+branch_labels = None
+depends_on = None
+
+
+# The initial bucketing is inlined (as database/price_buckets.py did it at this
+# revision) so later changes to the app module can't alter this migration.
+DEFAULT_PRICE_RANGES = {
+    "tyre": {
+        "sedan": {"low": 15000, "medium": 30000},
+        "suv": {"low": 25000, "medium": 40000},
+        "truck": {"low": 35000, "medium": 45000},
+        "bus": {"low": 25000, "medium": 30000},
+    },
+    "rim": {
+        "sedan": {"low": 20000, "medium": 30000},
+        "suv": {"low": 25000, "medium": 35000},
+        "truck": {"low": 30000, "medium": 35000},
+        "bus": {"low": 25000, "medium": 30000},
+    },
+    "battery": {
+        "sedan": {"low": 20000, "medium": 30000},
+        "suv": {"low": 26000, "medium": 35000},
+        "truck": {"low": 26000, "medium": 35000},
+        "bus": {"low": 35000, "medium": 40000},
+    },
+    "oil filter": {
+        "default": {"low": 7500, "medium": 8500},
+    }
+}
+
+MIN_QUANTILE_SAMPLE = 6
+
+
+def initial_thresholds(bind):
+    """(category_key, vehicle_type) -> (low, medium, sample_size): price terciles, or the defaults for small groups."""
+    rows = bind.execute(sa.text(
+        "SELECT category_key, vehicle_type, buying_price FROM spareparts "
+        "WHERE buying_price IS NOT NULL ORDER BY category_key, vehicle_type"
+    ))
+
+    applied = {}
+    for key, group in groupby(rows, key=lambda r: (r.category_key, r.vehicle_type)):
+        prices = [r.buying_price for r in group]
+        if len(prices) >= MIN_QUANTILE_SAMPLE:
+            low, medium = quantiles(prices, n=3, method="inclusive")
+            applied[key] = (low, medium, len(prices))
+            continue
+
+        ranges = DEFAULT_PRICE_RANGES.get(key[0]) or {}
+        r = ranges.get(key[1]) or ranges.get("default")
+        if r:
+            applied[key] = (r["low"], r["medium"], len(prices))
+
+    return applied
+
+
+def bucket_parts(bind, thresholds):
+    for (category_key, vehicle_type), (low, medium, _) in thresholds.items():
+        bind.execute(
+            sa.text(
+                "UPDATE spareparts SET price_bucket = CASE "
+                "WHEN buying_price IS NULL THEN NULL "
+                "WHEN buying_price < :low THEN 'low' "
+                "WHEN buying_price <= :medium THEN 'medium' "
+                "ELSE 'high' END "
+                "WHERE category_key = :category_key AND vehicle_type = :vehicle_type"
+            ),
+            {"low": low, "medium": medium, "category_key": category_key, "vehicle_type": vehicle_type},
+        )
+
+
+def upgrade():
+    op.create_table('price_bucket_thresholds',
+    sa.Column('category_key', sa.String(), nullable=False),
+    sa.Column('vehicle_type', sa.String(), nullable=False),
+    sa.Column('low', sa.Float(), nullable=False),
+    sa.Column('medium', sa.Float(), nullable=False),
+    sa.Column('sample_size', sa.Integer(), nullable=True),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('category_key', 'vehicle_type')
+    )
+
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('price_bucket', sa.String(), nullable=True))
+        batch_op.create_index('ix_spareparts_category_vehicle_bucket', ['category_key', 'vehicle_type', 'price_bucket'], unique=False)
+
+    # Compute the initial thresholds and bucket the existing catalog
+    bind = op.get_bind()
+    thresholds = initial_thresholds(bind)
+
+    if thresholds:
+        now = datetime.utcnow()
+        bind.execute(
+            sa.text(
+                "INSERT INTO price_bucket_thresholds "
+                "(category_key, vehicle_type, low, medium, sample_size, computed_at) "
+                "VALUES (:category_key, :vehicle_type, :low, :medium, :sample_size, :computed_at)"
+            ),
+            [
+                {
+                    "category_key": category_key, "vehicle_type": vehicle_type,
+                    "low": low, "medium": medium, "sample_size": n, "computed_at": now,
+                }
+                for (category_key, vehicle_type), (low, medium, n) in thresholds.items()
+            ],
+        )
+        bucket_parts(bind, thresholds)
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_index('ix_spareparts_category_vehicle_bucket')
+        batch_op.drop_column('price_bucket')
+
+    op.drop_table('price_bucket_thresholds')
@@ -0,0 +1,35 @@
+"""Per part and catalog wide versions
+
+Revision ID: f2c4d6e8a913
+Revises: e5a0b6c8d217
+Create Date: 2026-10-18 13:58:12.407391
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c4d6e8a913'
+down_revision = 'e5a0b6c8d217'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('spareparts', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    op.drop_table('catalog_version')
@@ -0,0 +1,32 @@
+"""Queue of reaction counter deltas for write-behind mode
+
+Revision ID: f3b8d1a6c594
+Revises: e1f7b3c9d482
+Create Date: 2026-10-18 19:48:05.271934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d1a6c594'
+down_revision = 'e1f7b3c9d482'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('review_reaction_deltas',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('review_id', sa.String(), nullable=False),
+    sa.Column('sparepart_id', sa.String(), nullable=True),
+    sa.Column('likes', sa.Integer(), nullable=False),
+    sa.Column('dislikes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('review_reaction_deltas')
@@ -1,10 +1,15 @@
 import pytest
+import tempfile
+from contextlib import contextmanager
 from app import create_app
-from core.extensions import db as _db
+from core.extensions import db as _db, cache
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker, scoped_session
 from flask_jwt_extended import create_access_token
 
-from database.models import Users, SpareParts
+from database.models import Users, SpareParts, Reviews, ReviewReactions
+from database.price_buckets import reset_thresholds_cache
+from database.suggest import suggestions
 
 
 # ================== APP ==================
@@ -18,7 +23,9 @@ def test_app():
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
         TESTING=True,
         JWT_SECRET_KEY="test-secret",
-        PROPAGATE_EXCEPTIONS=True
+        PROPAGATE_EXCEPTIONS=True,
+        CATALOG_SNAPSHOT_DIR=tempfile.mkdtemp(prefix="catalog-snapshots-"),
+        CATALOG_SNAPSHOT_ASYNC=False
     )
 
     with app.app_context():
@@ -46,6 +53,11 @@ def session(test_app):
         Session = scoped_session(sessionmaker(bind=connection))
         _db.session = Session
 
+        # cached catalog responses / thresholds must not leak between tests
+        cache.clear()
+        reset_thresholds_cache()
+        suggestions.reset()
+
         yield Session
 
         transaction.rollback()
@@ -53,6 +65,28 @@ def session(test_app):
         Session.remove()
 
 
+# ================== QUERY COUNTER ==================
+
+@pytest.fixture
+def count_queries(session):
+    """`with count_queries() as statements:` collects the SQL run on the test connection."""
+    @contextmanager
+    def _count():
+        statements = []
+        connection = session.connection()
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", listener)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", listener)
+
+    return _count
+
+
 # ================== CLIENT ==================
 
 @pytest.fixture
@@ -120,4 +154,35 @@ def spare_part(session):
     session.commit()
     session.refresh(part)
 
-    return part
\ No newline at end of file
+    return part
+
+
+# ================== REVIEWS FIXTURE ==================
+
+@pytest.fixture
+def add_reviews(session):
+    """add_reviews(part, count): `count` reviews by new users, each with reactions from other reviewers."""
+    def _add(part, count, start=0):
+        # one bcrypt hash for all of them
+        password = Users(email="x@example.com")
+        password.set_password("password123")
+
+        reviewers = [
+            Users(email=f"reviewer.{i}@example.com", password_hash=password.password_hash)
+            for i in range(start, start + count)
+        ]
+        session.add_all(reviewers)
+        session.flush()
+
+        for i, reviewer in enumerate(reviewers):
+            review = Reviews(user_id=reviewer.id, sparepart_id=part.id, rating=i % 5 + 1, comment="ok")
+            session.add(review)
+            session.flush()
+            # every other reviewer reacts to this review
+            session.add_all(
+                ReviewReactions(user_id=other.id, review_id=review.id, is_like=bool(j % 4))
+                for j, other in enumerate(reviewers) if other is not reviewer and j % 2
+            )
+        session.commit()
+
+    return _add
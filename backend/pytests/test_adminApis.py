@@ -1,4 +1,11 @@
 import pytest
+import io
+import json
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from utils.pool_metrics import TimedQueuePool, instrument_engine, pool_metrics
+from database.models import Orders, OrderItems, Reviews, SpareParts
 
 
 # ===================== ADMIN SETUP ========================
@@ -83,6 +90,180 @@ def test_admin_create_sparepart(client, session, user, auth_header):
     assert res.status_code == 201
 
 
+def test_admin_import_spareparts_csv(client, session, user, auth_header):
+    make_admin(session, user)
+
+    csv_data = (
+        "category,vehicle_type,brand,colour,buying_price,marked_price,description\n"
+        "Tyre,SUV,Michelin,Black,1000,1250,All terrain\n"
+        "rim,sedan,Enkei,,2000,2000,\n"
+        "rim,boat,Enkei,,2000,2500,\n"
+        "battery,truck,Varta,,abc,2500,\n"
+    )
+
+    res = client.post(
+        "/admin/spareparts/import",
+        headers=auth_header(user),
+        data={"file": (io.BytesIO(csv_data.encode()), "catalog.csv")},
+        content_type="multipart/form-data",
+    )
+    report = res.get_json()
+
+    assert res.status_code == 201
+    assert report["inserted"] == 2
+    assert report["failed"] == 2
+    assert [e["line"] for e in report["errors"]] == [4, 5]
+    assert "rows_per_second" in report
+
+    tyre = SpareParts.query.filter_by(brand="Michelin").one()
+    assert (tyre.discount_amount, tyre.discount_percentage) == (250, 20)
+    assert (tyre.category_key, tyre.vehicle_type, tyre.price_bucket) == ("tyre", "suv", "low")
+
+    # visible to the (cached) listing and the search index straight away
+    assert client.get("/spareparts?category=tyre").get_json()["total"] == 1
+    assert client.get("/spareparts/search?q=michelin").get_json()["items"][0]["id"] == tyre.id
+
+
+def test_admin_import_database_error_is_not_echoed(client, session, user, auth_header, monkeypatch):
+    make_admin(session, user)
+
+    def broken_write(connection, rows):
+        raise RuntimeError("INSERT INTO spareparts VALUES ('secret-row')")
+
+    monkeypatch.setattr("database.catalog_import.write_chunk", broken_write)
+    csv_data = (
+        "category,vehicle_type,brand,buying_price,marked_price\n"
+        "tyre,suv,Michelin,1000,1250\n"
+        "rim,sedan,Enkei,2000,2000\n"
+    )
+    res = client.post(
+        "/admin/spareparts/import",
+        headers=auth_header(user),
+        data=csv_data,
+        content_type="text/csv",
+    )
+    report = res.get_json()
+
+    assert (report["inserted"], report["failed"]) == (0, 2)
+    assert report["errors"][0] == {"line": 2, "error": "Database error: the chunk with lines 2-3 was not imported"}
+    assert "secret" not in res.get_data(as_text=True)
+
+
+def test_admin_import_rejects_non_utf8_file(client, session, user, auth_header):
+    make_admin(session, user)
+
+    csv_data = (
+        "category,vehicle_type,brand,buying_price,marked_price,description\n"
+        "tyre,suv,Michelin,1000,1250,Pneu \xe9t\xe9\n"
+    ).encode("latin-1")
+    res = client.post(
+        "/admin/spareparts/import",
+        headers=auth_header(user),
+        data={"file": (io.BytesIO(csv_data), "catalog.csv")},
+        content_type="multipart/form-data",
+    )
+    report = res.get_json()
+
+    assert res.status_code == 400
+    assert (report["inserted"], report["failed"]) == (0, 1)
+    assert report["errors"] == [{"line": 1, "error": "File must be UTF-8 encoded"}]
+
+
+def test_admin_import_spareparts_ndjson(client, session, user, auth_header):
+    make_admin(session, user)
+
+    rows = [
+        {"category": "battery", "vehicle_type": "bus", "brand": "Varta", "buying_price": 30000, "marked_price": 36000},
+        {"category": "battery", "vehicle_type": "bus", "brand": "Bosch"},
+    ]
+    body = "\n".join(json.dumps(r) for r in rows) + "\nnot json\n"
+
+    res = client.post(
+        "/admin/spareparts/import",
+        headers=auth_header(user),
+        data=body,
+        content_type="application/x-ndjson",
+    )
+    report = res.get_json()
+
+    assert res.status_code == 201
+    assert report["inserted"] == 1
+    assert report["errors"] == [
+        {"line": 2, "error": "Missing buying_price, marked_price"},
+        {"line": 3, "error": "Invalid JSON"},
+    ]
+
+    res = client.post("/admin/spareparts/import", headers=auth_header(user), data="x", content_type="text/plain")
+    assert res.status_code == 400
+
+
+def test_admin_reprice_spareparts(client, session, user, auth_header):
+    make_admin(session, user)
+
+    for brand, buying, marked in (("Michelin", 1000, 1250), ("Pirelli", 2000, 2000)):
+        session.add(SpareParts(category="tyre", vehicle_type="suv", brand=brand, buying_price=buying, marked_price=marked))
+    session.add(SpareParts(category="rim", vehicle_type="suv", brand="Enkei", buying_price=500, marked_price=600))
+    session.commit()
+
+    etag = client.get("/spareparts?category=tyre").headers["ETag"]
+
+    res = client.post(
+        "/admin/spareparts/reprice",
+        headers=auth_header(user),
+        json={"category": "TYRE", "mode": "percentage", "value": 10},
+    )
+
+    assert res.status_code == 200
+    assert res.get_json()["updated"] == 2
+
+    session.expire_all()
+    michelin = SpareParts.query.filter_by(brand="Michelin").one()
+    assert (michelin.buying_price, michelin.marked_price) == (1100, 1250)
+    assert (michelin.discount_amount, michelin.discount_percentage) == (150, 12)
+    assert michelin.version == 2
+    assert SpareParts.query.filter_by(brand="Enkei").one().buying_price == 500
+
+    # same discount fields the ORM path computes
+    expected = SpareParts(buying_price=michelin.buying_price, marked_price=michelin.marked_price)
+    expected.calculate_discount()
+    assert (expected.discount_amount, expected.discount_percentage) == (michelin.discount_amount, michelin.discount_percentage)
+
+    # cached listings are invalidated
+    assert client.get("/spareparts?category=tyre", headers={"If-None-Match": etag}).status_code == 200
+
+    res = client.post(
+        "/admin/spareparts/reprice",
+        headers=auth_header(user),
+        json={"brand": "pirelli", "mode": "margin", "value": 25},
+    )
+    assert res.get_json()["updated"] == 1
+
+    session.expire_all()
+    pirelli = SpareParts.query.filter_by(brand="Pirelli").one()
+    assert (pirelli.buying_price, pirelli.discount_percentage) == (1500, 25)
+
+    assert client.post("/admin/spareparts/reprice", headers=auth_header(user), json={"mode": "absolute", "value": 5}).status_code == 400
+    assert client.post("/admin/spareparts/reprice", headers=auth_header(user), json={"brand": "x", "mode": "double", "value": 5}).status_code == 400
+
+
+def test_admin_reprice_database_error_is_not_echoed(client, session, user, auth_header, monkeypatch):
+    make_admin(session, user)
+
+    def broken_reprice(*args, **kwargs):
+        raise RuntimeError("UPDATE spareparts SET buying_price = 'secret'")
+
+    monkeypatch.setattr("apis.admin_resources.reprice_spareparts", broken_reprice)
+    res = client.post(
+        "/admin/spareparts/reprice",
+        headers=auth_header(user),
+        json={"brand": "Pirelli", "mode": "absolute", "value": 5},
+    )
+
+    assert res.status_code == 500
+    assert res.get_json() == {"error": "Could not reprice spare parts"}
+    assert "secret" not in res.get_data(as_text=True)
+
+
 def test_admin_update_sparepart(client, session, user, auth_header, spare_part):
     make_admin(session, user)
 
@@ -105,6 +286,50 @@ def test_admin_delete_sparepart(client, session, user, auth_header, spare_part):
 
     assert res.status_code == 200
 
+def test_admin_cache_stats(client, session, user, auth_header, spare_part):
+    make_admin(session, user)
+
+    client.get("/spareparts")
+    client.get("/spareparts")
+
+    res = client.get("/admin/cache/stats", headers=auth_header(user))
+    data = res.get_json()
+
+    assert res.status_code == 200
+    assert data["hits"] == 1
+    assert data["misses"] == 1
+
+def test_admin_pool_stats(client, session, user, auth_header):
+    make_admin(session, user)
+
+    res = client.get("/admin/db/pool", headers=auth_header(user))
+    primary = res.get_json()["engines"]["primary"]
+
+    assert res.status_code == 200
+    assert {"in_use", "overflow", "checkout_wait_ms", "timeouts"} <= set(primary)
+
+
+def test_pool_metrics_track_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    instrument_engine(engine)
+
+    held = engine.connect()
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    metrics = pool_metrics({None: engine})["primary"]
+    assert (metrics["in_use"], metrics["checked_out"], metrics["size"]) == (1, 1, 1)
+    assert metrics["timeouts"] == 1
+    assert metrics["checkout_wait_ms"]["samples"] == 2
+    assert metrics["checkout_wait_ms"]["max"] >= 50
+
+    held.close()
+    assert pool_metrics({None: engine})["primary"]["in_use"] == 0
+    engine.dispose()
+
 # ================= ADMIN REVIEWS ==========================
 def test_admin_get_reviews(client, session, user, auth_header):
     make_admin(session, user)
@@ -128,6 +353,74 @@ def test_admin_get_reviews_by_sparepart(client, session, user, auth_header, spar
     assert res.status_code == 200
 
 
+def test_admin_review_listings_query_count_is_constant(client, session, user, auth_header, spare_part, count_queries, add_reviews):
+    make_admin(session, user)
+    headers = auth_header(user)
+
+    counts = []
+    for start, count in ((0, 3), (3, 30)):
+        add_reviews(spare_part, count, start=start)
+        with count_queries() as all_reviews:
+            res = client.get("/admin/reviews", headers=headers)
+            assert res.status_code == 200
+        with count_queries() as part_reviews:
+            res = client.get(f"/admin/reviews/sparepart/{spare_part.id}", headers=headers)
+            assert res.status_code == 200
+        counts.append((len(all_reviews), len(part_reviews)))
+
+    reviews = res.get_json()
+    assert len(reviews) == 33
+    assert reviews[0]["user_display_name"].endswith("@example.com)")
+    assert counts[0] == counts[1]
+    assert "likes" not in reviews[0]
+    assert reviews[0]["my_reaction"] is None
+    # admin user + reviews joined with their authors and parts (+ the admin's reactions)
+    assert max(counts[1]) <= 3
+
+
+def test_admin_review_feed_filters_and_pages(client, session, user, auth_header, spare_part, add_reviews):
+    make_admin(session, user)
+    headers = auth_header(user)
+    add_reviews(spare_part, 10)                     # ratings 1..5 twice, all commented
+    other = SpareParts(category="rim", vehicle_type="bus", brand="Alcoa", buying_price=1, marked_price=2)
+    session.add(other)
+    session.flush()
+    session.add(Reviews(user_id=user.id, sparepart_id=other.id, rating=5, created_at=datetime(2020, 1, 1)))
+    session.commit()
+
+    def feed(query=""):
+        res = client.get(f"/admin/reviews?{query}", headers=headers)
+        assert res.status_code == 200
+        return res.get_json()
+
+    pages, cursor = [], ""
+    while True:
+        data = feed(f"per_page=4&cursor={cursor}")
+        pages.append(data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    items = [r for page in pages for r in page]
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert len({r["id"] for r in items}) == 11
+    assert items[-1]["sparepart_id"] == other.id   # newest first
+
+    def count(query):
+        return len(feed(query)["items"])
+
+    assert count("min_rating=4&max_rating=5") == 5
+    assert count("max_rating=1") == 2
+    assert count(f"sparepart_id={other.id}") == 1
+    assert count(f"user_id={user.id}") == 1
+    assert count("has_comment=0") == 1
+    assert count("has_comment=1") == 10
+    assert count("until=2021-01-01") == 1
+    assert count(f"since=2021-01-01&sparepart_id={spare_part.id}&min_rating=5") == 2
+
+    for query in ("since=yesterday", "min_rating=9", "cursor=bogus"):
+        assert client.get(f"/admin/reviews?{query}", headers=headers).status_code == 400
+
+
 def test_admin_review_reactions(client, session, user, auth_header):
     make_admin(session, user)
 
@@ -138,6 +431,35 @@ def test_admin_review_reactions(client, session, user, auth_header):
 
     assert res.status_code in [200, 404]
 
+
+def test_admin_review_reactions_pages(client, session, user, auth_header, spare_part, add_reviews):
+    make_admin(session, user)
+    add_reviews(spare_part, 9)
+    review = Reviews.query.filter_by(sparepart_id=spare_part.id).order_by(Reviews.rating).first()
+    review.total_likes, review.total_dislikes = 3, 1
+    session.commit()
+    url = f"/admin/reviews/{review.id}/reactions?per_page=3"
+
+    pages, cursor = [], None
+    while True:
+        data = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=auth_header(user)).get_json()
+        pages.append(data["reactions"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    reactions = [r for page in pages for r in page]
+    assert [len(page) for page in pages] == [3, 1]
+    assert sorted(r["user_id"] for r in reactions) == sorted(l.user_id for l in review.likes)
+    assert all(r["email"].startswith("reviewer.") for r in reactions)
+    assert (data["total_likes"], data["total_dislikes"]) == (3, 1)
+
+    assert client.get(url + "&cursor=bogus", headers=auth_header(user)).status_code == 400
+
+    user.role = "buyer"
+    session.commit()
+    assert client.get(url, headers=auth_header(user)).status_code == 403
+
 # ===================== ADMIN ORDERS =======================
 def test_admin_get_orders(client, session, user, auth_header):
     make_admin(session, user)
@@ -150,6 +472,38 @@ def test_admin_get_orders(client, session, user, auth_header):
     assert res.status_code == 200
 
 
+def test_admin_orders_stream_ndjson(client, session, user, auth_header, spare_part):
+    make_admin(session, user)
+
+    for i in range(3):
+        order = Orders(user_id=user.id, street=f"{i} Main", city="Nairobi", country="Kenya")
+        order.order_items = [OrderItems(sparepart_id=spare_part.id, quantity=i + 1, unit_price=100, subtotal=100 * (i + 1))]
+        session.add(order)
+    session.commit()
+
+    expected = client.get("/admin/orders", headers=auth_header(user)).get_json()["orders"]
+
+    res = client.get("/admin/orders", headers={**auth_header(user), "Accept": "application/x-ndjson"})
+
+    assert res.status_code == 200
+    assert res.mimetype == "application/x-ndjson"
+    assert res.is_streamed
+    assert [json.loads(line) for line in res.get_data(as_text=True).splitlines()] == expected
+
+
+def test_admin_reviews_stream_query_param(client, session, user, auth_header, spare_part):
+    make_admin(session, user)
+    session.add(Reviews(user_id=user.id, sparepart_id=spare_part.id, rating=4, comment="ok"))
+    session.commit()
+
+    res = client.get("/admin/reviews?stream=1", headers=auth_header(user))
+    lines = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+
+    assert res.mimetype == "application/x-ndjson"
+    assert lines == client.get("/admin/reviews", headers=auth_header(user)).get_json()["items"]
+    assert lines[0]["comment"] == "ok"
+
+
 def test_admin_update_order(client, session, user, auth_header):
     make_admin(session, user)
 
@@ -1,4 +1,15 @@
 import pytest
+import gzip
+import json
+from flask import g
+from sqlalchemy.orm import scoped_session, sessionmaker
+from app import create_app
+from core.config import Config
+from core.extensions import db as _db
+from core.routing import RoutingSession, replica_binds
+from flask_jwt_extended import create_access_token
+from datetime import datetime, timedelta
+from database.models import SpareParts, Users, Reviews
 
 
 # ======================== AUTH ============================
@@ -68,6 +79,8 @@ def test_get_spareparts_list(client, spare_part):
 
     assert res.status_code == 200
     assert "items" in data
+    # star histogram counters ship with each listed part
+    assert {f"rating_{n}_count" for n in range(1, 6)} | {"comments_only_count"} <= set(data["items"][0])
 
 
 def test_get_single_sparepart(client, spare_part):
@@ -79,6 +92,440 @@ def test_filter_spareparts(client, spare_part):
     res = client.get("/spareparts?category=tyre")
     assert res.status_code == 200
 
+
+def test_filter_spareparts_exact_is_case_insensitive(client, spare_part):
+    res = client.get("/spareparts?category=TYRE&brand=toyota&vehicle_type=Sedan")
+    data = res.get_json()
+
+    assert res.status_code == 200
+    assert [p["id"] for p in data["items"]] == [spare_part.id]
+
+    res = client.get("/spareparts?brand=toy")
+    assert res.get_json()["total"] == 0
+
+
+def test_filter_spareparts_prefix_and_contains(client, spare_part):
+    res = client.get("/spareparts?brand=toy&match=prefix")
+    assert res.get_json()["total"] == 1
+
+    res = client.get("/spareparts?brand=yot&match=prefix")
+    assert res.get_json()["total"] == 0
+
+    res = client.get("/spareparts?brand=yot&match=contains")
+    assert res.get_json()["total"] == 1
+
+def test_spareparts_cursor_pagination(client, session):
+    for price in (300, 100, 200):
+        session.add(SpareParts(
+            category="rim", vehicle_type="suv", brand="Enkei",
+            buying_price=price, marked_price=price + 50
+        ))
+    session.commit()
+
+    res = client.get("/spareparts?category=rim&per_page=2&cursor=&include_total=1")
+    first = res.get_json()
+
+    assert res.status_code == 200
+    assert first["total"] == 3
+    assert [p["buying_price"] for p in first["items"]] == [100, 200]
+    assert first["next_cursor"]
+
+    res = client.get(f"/spareparts?category=rim&per_page=2&cursor={first['next_cursor']}")
+    second = res.get_json()
+
+    assert [p["buying_price"] for p in second["items"]] == [300]
+    assert second["next_cursor"] is None
+    assert "total" not in second
+
+
+def test_spareparts_cursor_rejects_foreign_sort(client, session):
+    for price in (100, 200):
+        session.add(SpareParts(
+            category="rim", vehicle_type="suv", brand="Enkei",
+            buying_price=price, marked_price=price + 50
+        ))
+    session.commit()
+
+    cursor = client.get("/spareparts?per_page=1&cursor=").get_json()["next_cursor"]
+
+    res = client.get(f"/spareparts?per_page=1&sort=-rating&cursor={cursor}")
+    assert res.status_code == 400
+
+    res = client.get("/spareparts?cursor=not-a-cursor")
+    assert res.status_code == 400
+
+def test_spareparts_listing_is_cached_until_catalog_changes(client, session, spare_part):
+    first = client.get("/spareparts?category=tyre")
+    second = client.get("/spareparts?category=TYRE&page=1")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+
+    spare_part.brand = "Bridgestone"
+    session.commit()
+
+    third = client.get("/spareparts?category=tyre")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.get_json()["items"][0]["brand"] == "Bridgestone"
+
+def test_search_spareparts_ranked(client, session):
+    michelin = SpareParts(
+        category="tyre", vehicle_type="suv", brand="Michelin",
+        buying_price=100, marked_price=150, description="All terrain tyre"
+    )
+    other = SpareParts(
+        category="tyre", vehicle_type="sedan", brand="Dunlop",
+        buying_price=100, marked_price=150, description="Quiet, michelin beater"
+    )
+    session.add_all([michelin, other])
+    session.commit()
+
+    res = client.get("/spareparts/search?q=michelin suv tyre")
+    assert res.status_code == 200
+    assert [p["id"] for p in res.get_json()["items"]] == [michelin.id]
+
+    # brand matches rank above description matches
+    res = client.get("/spareparts/search?q=mich")
+    assert [p["id"] for p in res.get_json()["items"]] == [michelin.id, other.id]
+
+
+def test_search_index_follows_updates_and_deletes(client, session, spare_part):
+    assert client.get("/spareparts/search?q=toyota").get_json()["items"]
+
+    spare_part.brand = "Hankook"
+    session.commit()
+    assert client.get("/spareparts/search?q=toyota").get_json()["items"] == []
+    assert client.get("/spareparts/search?q=hankook").get_json()["items"]
+
+    session.delete(spare_part)
+    session.commit()
+    assert client.get("/spareparts/search?q=hankook").get_json()["items"] == []
+
+    assert client.get("/spareparts/search?q=").status_code == 400
+
+def test_spareparts_suggest(client, session, spare_part):
+    popular = SpareParts(
+        category="Tyre", vehicle_type="suv", brand="Michelin",
+        buying_price=100, marked_price=150, total_reviews=5
+    )
+    session.add(popular)
+    session.commit()
+
+    res = client.get("/spareparts/suggest?prefix=T")
+    assert res.status_code == 200
+    # the category of both parts outranks the Toyota terms; shorter terms first on a tie
+    assert [(s["type"], s["text"], s["weight"]) for s in res.get_json()["suggestions"]] == [
+        ("category", "tyre", 7), ("brand", "Toyota", 1), ("phrase", "Toyota tyre sedan", 1),
+    ]
+
+    res = client.get("/spareparts/suggest?prefix=michelin t")
+    assert res.get_json()["suggestions"] == [{
+        "text": "Michelin Tyre suv", "type": "phrase", "weight": 6,
+        "filters": {"brand": "Michelin", "category": "Tyre", "vehicle_type": "suv"},
+    }]
+
+    # kept in step with writes, without a rebuild
+    spare_part.brand = "Hankook"
+    session.commit()
+    assert client.get("/spareparts/suggest?prefix=toy").get_json()["suggestions"] == []
+    assert client.get("/spareparts/suggest?prefix=hank").get_json()["suggestions"][0]["text"] == "Hankook"
+
+    session.delete(popular)
+    session.commit()
+    assert client.get("/spareparts/suggest?prefix=mich").get_json()["suggestions"] == []
+    assert client.get("/spareparts/suggest?prefix=").get_json()["suggestions"] == []
+
+def test_warm_suggest_runs_no_statements(client, session, spare_part, count_queries, monkeypatch):
+    assert client.get("/spareparts/suggest?prefix=toy").get_json()["suggestions"]
+
+    def no_connection(*args, **kwargs):
+        raise AssertionError("a warm suggest request must not check out a connection")
+
+    with count_queries() as statements:
+        monkeypatch.setattr(_db.session, "connection", no_connection)
+        res = client.get("/spareparts/suggest?prefix=toyota")
+        monkeypatch.undo()
+
+    assert res.status_code == 200
+    assert res.get_json()["suggestions"][0]["text"] == "Toyota"
+    assert statements == []
+
+def test_spareparts_batch_keeps_request_order(client, session, spare_part):
+    other = SpareParts(
+        category="brake pad", vehicle_type="suv", brand="Bosch",
+        buying_price=100, marked_price=150
+    )
+    session.add(other)
+    session.commit()
+
+    res = client.get(f"/spareparts/batch?ids={other.id},unknown,{spare_part.id}&ids={other.id}")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert [p["id"] for p in data["items"]] == [other.id, spare_part.id]
+    assert data["items"][0]["brand"] == "Bosch"
+    assert data["missing"] == ["unknown"]
+
+    assert client.get("/spareparts/batch").status_code == 400
+
+
+def test_checkout_loads_cart_in_one_query(client, session, auth_headers, spare_part, monkeypatch, count_queries):
+    import stripe
+
+    parts = [spare_part] + [
+        SpareParts(category="filter", vehicle_type="sedan", brand=f"Brand {i}", buying_price=10 + i, marked_price=20 + i)
+        for i in range(3)
+    ]
+    session.add_all(parts[1:])
+    session.commit()
+
+    created = {}
+    monkeypatch.setattr(
+        stripe.checkout.Session, "create",
+        lambda **kwargs: created.update(kwargs) or type("CheckoutSession", (), {"url": "https://stripe.test/pay"})(),
+    )
+
+    cart = {
+        "items": [{"sparepart_id": p.id, "quantity": 2} for p in parts],
+        "street": "1 Road", "city": "Nairobi", "country": "Kenya",
+    }
+
+    with count_queries() as statements:
+        res = client.post("/create-checkout-session", json=cart, headers=auth_headers)
+
+    assert res.status_code == 200
+    assert len(created["line_items"]) == 4
+    part_selects = [s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM spareparts" in s]
+    assert len(part_selects) == 1
+
+    cart["items"].append({"sparepart_id": "unknown"})
+    res = client.post("/create-checkout-session", json=cart, headers=auth_headers)
+    assert res.status_code == 404
+    assert res.get_json()["missing"] == ["unknown"]
+
+    # empty / missing ids are a bad request, not a server error
+    for bad in ({"sparepart_id": ""}, {"sparepart_id": None}, {"sparepart_id": 0}, {"quantity": 1}):
+        cart["items"] = [{"sparepart_id": spare_part.id}, bad]
+        res = client.post("/create-checkout-session", json=cart, headers=auth_headers)
+        assert res.status_code == 400
+
+def test_spareparts_facets_match_listing(client, session):
+    session.add_all([
+        SpareParts(category="tyre", vehicle_type="suv", brand="Michelin", colour="Black",
+                   buying_price=20000, marked_price=22000),
+        SpareParts(category="tyre", vehicle_type="suv", brand="michelin", colour="black",
+                   buying_price=45000, marked_price=50000),
+        SpareParts(category="tyre", vehicle_type="sedan", brand="Dunlop",
+                   buying_price=10000, marked_price=12000),
+        SpareParts(category="rim", vehicle_type="suv", brand="Enkei",
+                   buying_price=10000, marked_price=12000),
+    ])
+    session.commit()
+
+    res = client.get("/spareparts/facets?category=tyre")
+    data = res.get_json()
+
+    assert res.status_code == 200
+    assert data["total"] == client.get("/spareparts?category=tyre").get_json()["total"] == 3
+    assert data["facets"]["brand"][0] == {"value": "michelin", "label": "Michelin", "count": 2}
+    assert data["facets"]["colour"] == [{"value": "black", "label": "Black", "count": 2}]
+    assert {v["value"]: v["count"] for v in data["facets"]["price"]} == {"low": 2, "high": 1}
+
+    res = client.get("/spareparts/facets?category=tyre&vehicle_type=suv&price=high")
+    data = res.get_json()
+    assert data["total"] == client.get("/spareparts?category=tyre&vehicle_type=suv&price=high").get_json()["total"] == 1
+
+def test_sparepart_detail_conditional_get(client, session, auth_headers, spare_part):
+    res = client.get(f"/spareparts/{spare_part.id}")
+    etag = res.headers["ETag"]
+
+    assert res.status_code == 200
+    assert "must-revalidate" in res.headers["Cache-Control"]
+
+    res = client.get(f"/spareparts/{spare_part.id}", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+
+    # a new review changes the detail response, so the ETag must change
+    client.post(f"/reviews/{spare_part.id}", headers=auth_headers, json={"rating": 4})
+
+    res = client.get(f"/spareparts/{spare_part.id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+    assert client.get("/spareparts/missing").status_code == 404
+
+
+def test_sparepart_detail_pages_reviews(client, session, spare_part):
+    start = datetime(2026, 1, 1)
+    for i in range(5):
+        reviewer = Users(email=f"reviewer.{i}@example.com")
+        reviewer.set_password("password123")
+        session.add(reviewer)
+        session.flush()
+        session.add(Reviews(
+            user_id=reviewer.id, sparepart_id=spare_part.id,
+            rating=i + 1, comment=f"review {i}", created_at=start + timedelta(days=i)
+        ))
+    session.commit()
+
+    res = client.get(f"/spareparts/{spare_part.id}?reviews_limit=2")
+    data = res.get_json()
+
+    assert res.status_code == 200
+    assert data["id"] == spare_part.id
+    assert [r["comment"] for r in data["reviews"]] == ["review 4", "review 3"]
+    assert data["reviews"][0]["user_display_name"] == "Reviewer 4"
+    assert "users" not in data["reviews"][0] and "likes" not in data["reviews"][0]
+    assert set(data["rating_summary"]) == {"average_rating", "total_reviews", "histogram"}
+    assert data["rating_summary"]["histogram"] == {"ratings": {str(n): 1 for n in range(1, 6)}, "comments_only": 0}
+
+    comments = [r["comment"] for r in data["reviews"]]
+    cursor = data["reviews_next_cursor"]
+    while cursor:
+        data = client.get(f"/spareparts/{spare_part.id}?reviews_limit=2&reviews_cursor={cursor}").get_json()
+        comments += [r["comment"] for r in data["reviews"]]
+        cursor = data["reviews_next_cursor"]
+
+    assert comments == [f"review {i}" for i in range(4, -1, -1)]
+
+    res = client.get(f"/spareparts/{spare_part.id}?reviews_cursor=bogus")
+    assert res.status_code == 400
+
+def test_spareparts_listing_conditional_get(client, session, spare_part):
+    etag = client.get("/spareparts?category=tyre").headers["ETag"]
+
+    res = client.get("/spareparts?category=TYRE", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+
+    res = client.get("/spareparts?category=rim", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+    spare_part.marked_price = 1500
+    session.commit()
+
+    res = client.get("/spareparts?category=tyre", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+def test_spareparts_snapshot(client, session, spare_part):
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip"})
+    etag = res.headers["ETag"]
+
+    assert res.status_code == 200
+    assert res.headers["Content-Encoding"] == "gzip"
+    snapshot = json.loads(gzip.decompress(res.data))
+    res.close()
+
+    listing = client.get("/spareparts").get_json()["items"]
+    assert snapshot["items"] == listing
+
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert res.status_code == 304
+
+    # clients without gzip get the same document uncompressed
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in res.headers
+    assert json.loads(res.get_data())["items"] == snapshot["items"]
+
+    # a catalog change produces a new snapshot
+    spare_part.marked_price = 1500
+    session.commit()
+
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert res.status_code == 200
+    assert json.loads(gzip.decompress(res.data))["items"][0]["marked_price"] == 1500
+    res.close()
+
+def test_stale_snapshot_is_served_while_rebuilding(client, session, spare_part, monkeypatch, tmp_path):
+    from utils import snapshot
+
+    monkeypatch.setitem(client.application.config, "CATALOG_SNAPSHOT_ASYNC", True)
+    monkeypatch.setitem(client.application.config, "CATALOG_SNAPSHOT_DIR", str(tmp_path))
+    started = []
+    monkeypatch.setattr(snapshot, "_start_thread", lambda target, *args: started.append((target, args)))
+
+    # nothing to serve yet: the first snapshot is built before answering
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip"})
+    first = json.loads(gzip.decompress(res.data))
+    res.close()
+    assert started == []
+
+    spare_part.marked_price = 1500
+    session.commit()
+
+    # the last good snapshot is served, and only one rebuild is started
+    for _ in range(2):
+        res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip"})
+        assert json.loads(gzip.decompress(res.data))["version"] == first["version"]
+        res.close()
+    assert len(started) == 1
+
+    target, args = started[0]
+    target(*args)
+
+    res = client.get("/spareparts/snapshot", headers={"Accept-Encoding": "gzip"})
+    assert json.loads(gzip.decompress(res.data))["items"][0]["marked_price"] == 1500
+    res.close()
+    assert len(started) == 1
+
+def test_get_handlers_read_from_replica(tmp_path, monkeypatch):
+    class ReplicaConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_BINDS = replica_binds(f"sqlite:///{tmp_path / 'replica.db'}")
+        CATALOG_SNAPSHOT_DIR = str(tmp_path / "snapshots")
+        JWT_SECRET_KEY = "test-secret"
+
+    # the extra bind registers a metadata on the shared db; keep it out of the test app
+    monkeypatch.setattr(_db, "metadatas", dict(_db.metadatas))
+    app = create_app(ReplicaConfig)
+
+    with app.app_context():
+        for engine in _db.engines.values():
+            _db.metadata.create_all(engine)
+
+        routing = scoped_session(sessionmaker(class_=RoutingSession, db=_db))
+        monkeypatch.setattr(_db, "session", routing)
+
+        # written to the primary only; the (empty) replica never saw it
+        part = SpareParts(category="tyre", vehicle_type="suv", brand="Michelin", buying_price=100, marked_price=120)
+        buyer = Users(email="buyer@example.com", email_verified=True)
+        buyer.set_password("password123")
+        routing.add_all([part, buyer])
+        routing.commit()
+        part_id = part.id
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(buyer.id))}"}
+        routing.remove()
+
+    # one app context per request, as in production (g does not leak between requests)
+    client = app.test_client()
+    assert client.get("/spareparts").get_json()["total"] == 0
+    assert client.get("/spareparts", headers=headers).get_json()["total"] == 0
+
+    # read-your-own-writes: after a write the same bearer token reads the
+    # primary (no cookie involved, the SPA sends none cross-origin)
+    res = client.post(f"/reviews/{part_id}", headers=headers, json={"rating": 5})
+    assert res.status_code == 201
+    assert not client.get_cookie("tts_primary_until")
+
+    assert client.get("/spareparts", headers=headers).get_json()["total"] == 1
+    assert len(client.get(f"/reviews/{part_id}", headers=headers).get_json()["items"]) == 1
+
+    # other clients keep reading the replica
+    assert client.get("/spareparts").get_json()["total"] == 0
+
+    # once a session has written, its reads stay on the primary
+    with app.test_request_context("/spareparts"):
+        g.read_replica = True
+        session = RoutingSession(_db)
+        assert session.query(SpareParts).count() == 0
+
+        session.add(SpareParts(category="rim", vehicle_type="suv", brand="Enkei", buying_price=50, marked_price=60))
+        session.flush()
+        assert session.query(SpareParts).count() == 2
+        session.rollback()
+        session.close()
+
+
 # ======================== REVIEWS ========================
 def test_create_review(client, auth_headers, spare_part):
     res = client.post(
@@ -113,6 +560,61 @@ def test_create_review_duplicate(client, auth_headers, spare_part):
 def test_get_reviews(client, spare_part):
     res = client.get(f"/reviews/{spare_part.id}")
     assert res.status_code == 200
+    assert res.get_json() == {"items": [], "next_cursor": None, "per_page": 20, "sort": "newest"}
+
+
+def test_get_reviews_keyset_pages_and_sorts(client, session, spare_part):
+    start = datetime(2026, 1, 1)
+    ratings = [3, None, 5, 1, 5]
+    for i, rating in enumerate(ratings):
+        reviewer = Users(email=f"reviewer.{i}@example.com")
+        reviewer.set_password("password123")
+        session.add(reviewer)
+        session.flush()
+        session.add(Reviews(
+            user_id=reviewer.id, sparepart_id=spare_part.id, rating=rating,
+            comment=f"review {i}", created_at=start + timedelta(days=i), total_likes=i % 3
+        ))
+    session.commit()
+
+    def walk(sort):
+        comments, cursor = [], ""
+        while cursor is not None:
+            data = client.get(f"/reviews/{spare_part.id}?sort={sort}&per_page=2&cursor={cursor}").get_json()
+            assert len(data["items"]) <= 2
+            comments += [r["comment"] for r in data["items"]]
+            cursor = data["next_cursor"]
+        return [int(c.split()[1]) for c in comments]
+
+    assert walk("newest") == [4, 3, 2, 1, 0]
+    assert walk("oldest") == [0, 1, 2, 3, 4]
+    # comment-only reviews have no rating to sort by
+    assert walk("highest") == [4, 2, 0, 3]
+    assert walk("lowest") == [3, 0, 2, 4]
+    assert walk("helpful") == [2, 4, 1, 3, 0]
+
+    # a cursor only continues the sort it came from
+    cursor = client.get(f"/reviews/{spare_part.id}?sort=highest&per_page=1").get_json()["next_cursor"]
+    assert client.get(f"/reviews/{spare_part.id}?sort=oldest&cursor={cursor}").status_code == 400
+
+
+def test_get_reviews_query_count_is_constant(client, spare_part, count_queries, add_reviews):
+    add_reviews(spare_part, 3)
+    with count_queries() as few:
+        res = client.get(f"/reviews/{spare_part.id}?per_page=100")
+    assert len(res.get_json()["items"]) == 3
+
+    add_reviews(spare_part, 40, start=3)
+    with count_queries() as many:
+        res = client.get(f"/reviews/{spare_part.id}?per_page=100")
+    items = res.get_json()["items"]
+    assert len(items) == 43
+    assert all(r["user_display_name"].startswith("Reviewer") for r in items)
+    # no reaction lists, only the (anonymous) viewer's own reaction
+    assert all("likes" not in r and r["my_reaction"] is None for r in items)
+
+    # part + reviews page + authors
+    assert len(many) == len(few) <= 3
 
 
 def test_edit_review(client, auth_headers, spare_part):
@@ -147,6 +649,55 @@ def test_delete_review(client, auth_headers, spare_part):
 
     assert res.status_code == 200
 
+def test_review_reaction_toggle(client, session, auth_headers, spare_part, add_reviews):
+    add_reviews(spare_part, 1)
+    review = Reviews.query.filter_by(sparepart_id=spare_part.id).one()
+    url = f"/reviews/{review.id}/react"
+    version = spare_part.version
+
+    def click(is_like):
+        data = client.post(url, headers=auth_headers, json={"is_like": is_like}).get_json()
+        return data["action"], data["review"]["total_likes"], data["review"]["total_dislikes"]
+
+    assert click(True) == ("added", 1, 0)
+    assert click(False) == ("switched", 0, 1)
+    assert click(False) == ("removed", 0, 0)
+    assert click(True) == ("added", 1, 0)
+
+    session.expire_all()
+    assert [r.is_like for r in review.likes] == [True]
+    assert spare_part.version == version + 4
+
+    # the listing carries the viewer's own reaction next to the counts
+    mine = client.get(f"/reviews/{spare_part.id}", headers=auth_headers).get_json()["items"][0]
+    assert (mine["my_reaction"], mine["total_likes"]) == ("like", 1)
+    assert client.get(f"/reviews/{spare_part.id}").get_json()["items"][0]["my_reaction"] is None
+
+    assert client.post(url, headers=auth_headers, json={}).status_code == 400
+
+
+def test_cached_listing_has_no_stale_reaction_counts(client, session, auth_headers, spare_part, add_reviews):
+    add_reviews(spare_part, 1)
+    review = Reviews.query.filter_by(sparepart_id=spare_part.id).one()
+    likes = review.total_likes or 0
+
+    assert client.get("/spareparts").headers["X-Cache"] == "MISS"
+    detail = client.get(f"/spareparts/{spare_part.id}")
+    etag = detail.headers["ETag"]
+
+    client.post(f"/reviews/{review.id}/react", headers=auth_headers, json={"is_like": True})
+
+    # a reaction bumps only the part: the cached page stays valid, it embeds no reviews
+    res = client.get("/spareparts")
+    assert res.headers["X-Cache"] == "HIT"
+    assert [item["id"] for item in res.get_json()["items"]] == [spare_part.id]
+    assert all("reviews" not in item for item in res.get_json()["items"])
+
+    # the part detail reflects the reaction
+    res = client.get(f"/spareparts/{spare_part.id}", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.get_json()["reviews"][0]["total_likes"] == likes + 1
+
 # ======================== ORDERS =========================
 def test_get_orders(client, auth_headers):
     res = client.get("/orders", headers=auth_headers)
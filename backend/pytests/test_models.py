@@ -4,10 +4,18 @@ from database.models import (
     SpareParts,
     Reviews,
     ReviewReactions,
+    ReviewReactionDeltas,
     Orders,
     OrderItems,
     generate_uuid
 )
+from database.price_buckets import run_price_bucket_refresh
+from database.review_stats import reconcile_review_stats, publish_review_stats, histogram
+from database.catalog_version import current_catalog_version
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from database import reactions
+from apis.serializers import SPAREPART, SPAREPART_WITHOUT_REVIEWS, REVIEW, ORDER, ORDER_ITEM, USER, benchmark
 
 # ---------------------- UUID Helper ----------------------
 def test_generate_uuid():
@@ -63,7 +71,145 @@ def test_sparepart_invalid_vehicle_type_raises():
     assert "Vehicle type must be one of:" in str(excinfo.value)
 
 
+def test_sparepart_edit_bumps_version_in_sql(session, spare_part):
+    # another writer bumped the row since this session loaded it
+    session.execute(update(SpareParts.__table__).where(SpareParts.id == spare_part.id).values(version=5))
+    assert spare_part.version == 1
+
+    spare_part.description = "Edited"
+    session.commit()
+
+    assert spare_part.version == 6
+
+
+def test_sparepart_price_bucket_defaults(session):
+    part = SpareParts(
+        category="Tyre", vehicle_type="suv", brand="Michelin",
+        buying_price=30000, marked_price=35000,
+    )
+    session.add(part)
+    session.commit()
+
+    assert part.price_bucket == "medium"
+
+    part.buying_price = 41000
+    session.commit()
+    assert part.price_bucket == "high"
+
+
+def test_refresh_price_buckets_uses_quantiles(session):
+    parts = [
+        SpareParts(category="rim", vehicle_type="bus", brand="Alcoa",
+                   buying_price=price, marked_price=price + 10)
+        for price in (10, 20, 30, 40, 50, 60)
+    ]
+    session.add_all(parts)
+    session.commit()
+
+    # defaults put every cheap rim in the low bucket
+    assert {p.price_bucket for p in parts} == {"low"}
+
+    applied = run_price_bucket_refresh(session)
+    session.expire_all()
+
+    assert applied["rim/bus"]["sample_size"] == 6
+    assert [p.price_bucket for p in parts] == ["low", "low", "medium", "medium", "high", "high"]
+
+    # new parts pick up the refreshed thresholds
+    part = SpareParts(category="rim", vehicle_type="bus", brand="Alcoa",
+                      buying_price=35, marked_price=45)
+    session.add(part)
+    session.commit()
+    assert part.price_bucket == "medium"
+
+
 # ---------------------- REVIEWS MODEL ----------------------
+def test_review_writes_adjust_part_totals(session, spare_part, add_reviews, count_queries):
+    def stats():
+        session.refresh(spare_part)
+        return spare_part.total_reviews, spare_part.rating_sum, spare_part.rating_count, spare_part.average_rating
+
+    def stars():
+        counts = histogram(spare_part)
+        return [counts["ratings"][str(n)] for n in range(1, 6)], counts["comments_only"]
+
+    add_reviews(spare_part, 3)                      # ratings 1, 2, 3
+    assert stats() == (3, 6, 3, 2.0)
+    assert stars() == ([1, 1, 1, 0, 0], 0)
+
+    reviews = Reviews.query.filter_by(sparepart_id=spare_part.id).order_by(Reviews.rating).all()
+    reviews[0].rating = 5                            # 1 -> 5
+    reviews[1].rating = None                         # 2 -> comment only
+    session.commit()
+    assert stats() == (3, 8, 2, 4.0)
+    assert stars() == ([0, 0, 1, 0, 1], 1)
+
+    session.delete(reviews[2])                       # drops a 3
+    session.commit()
+    assert stats() == (2, 5, 1, 5.0)
+    assert stars() == ([0, 0, 0, 0, 1], 1)
+
+    # one review more costs the same whatever the review count: one delta UPDATE
+    add_reviews(spare_part, 20, start=10)
+    with count_queries() as statements:
+        session.add(Reviews(user_id=reviews[2].user_id, sparepart_id=spare_part.id, rating=4))
+        session.commit()
+    assert not any("FROM reviews" in s for s in statements)
+    assert stats()[:3] == (23, 5 + 60 + 4, 22)
+
+
+def test_review_writes_publish_to_the_catalog_in_batches(session, spare_part, add_reviews, count_queries):
+    catalog = current_catalog_version(session.connection())
+    version = spare_part.version
+
+    # review writes bump the part only, never the shared catalog version
+    with count_queries() as statements:
+        add_reviews(spare_part, 3)
+    assert not any("catalog_version" in s for s in statements)
+    assert current_catalog_version(session.connection()) == catalog
+
+    session.refresh(spare_part)
+    assert spare_part.version > version
+    assert spare_part.review_stats_dirty
+
+    # one catalog bump publishes every changed part
+    assert publish_review_stats(session) == 1
+    assert current_catalog_version(session.connection()) == catalog + 1
+    session.refresh(spare_part)
+    assert not spare_part.review_stats_dirty
+
+    assert publish_review_stats(session) == 0
+    assert current_catalog_version(session.connection()) == catalog + 1
+
+
+def test_reconcile_review_stats_fixes_drift(session, spare_part, add_reviews):
+    add_reviews(spare_part, 4)                      # ratings 1..4
+    untouched = SpareParts(category="rim", vehicle_type="bus", brand="Alcoa", buying_price=1, marked_price=2)
+    emptied = SpareParts(category="rim", vehicle_type="truck", brand="Alcoa", buying_price=1, marked_price=2)
+    session.add_all([untouched, emptied])
+    session.commit()
+
+    session.execute(
+        update(SpareParts).where(SpareParts.id == spare_part.id)
+        .values(total_reviews=0, rating_sum=99, rating_count=1, average_rating=1.0, rating_5_count=7)
+    )
+    # counters left behind by reviews deleted with raw SQL
+    session.execute(
+        update(SpareParts).where(SpareParts.id == emptied.id)
+        .values(total_reviews=2, rating_count=1, rating_sum=3, rating_3_count=1, comments_only_count=1)
+    )
+    session.commit()
+
+    assert reconcile_review_stats(session) == 2
+    session.refresh(spare_part)
+    assert (spare_part.total_reviews, spare_part.rating_sum, spare_part.rating_count, spare_part.average_rating) == (4, 10, 4, 2.5)
+    assert histogram(spare_part) == {"ratings": {"1": 1, "2": 1, "3": 1, "4": 1, "5": 0}, "comments_only": 0}
+    session.refresh(emptied)
+    assert (emptied.total_reviews, emptied.rating_3_count, emptied.comments_only_count) == (0, 0, 0)
+
+    assert reconcile_review_stats(session) == 0
+
+
 def test_review_rating_validation():
     review = Reviews(user_id="u1", sparepart_id="s1", rating=5)
     assert review.rating == 5
@@ -87,6 +233,68 @@ def test_review_reaction_invalid_is_like_raises():
     assert "is_like must be True or False" in str(excinfo.value)
 
 
+def test_review_reactions_are_unique_per_user(session, spare_part, add_reviews):
+    add_reviews(spare_part, 2)
+    review = Reviews.query.filter_by(sparepart_id=spare_part.id).first()
+    other_user = ReviewReactions.query.filter_by(review_id=review.id).first().user_id
+
+    session.add(ReviewReactions(user_id=other_user, review_id=review.id, is_like=False))
+    with pytest.raises(IntegrityError):
+        session.commit()
+    session.rollback()
+
+
+def test_concurrent_reaction_click_does_not_double_count(session, spare_part, user, monkeypatch):
+    reader = Users(email="reader@example.com", password_hash="x")
+    review = Reviews(user_id=user.id, sparepart_id=spare_part.id, rating=4)
+    session.add_all([reader, review])
+    session.commit()
+
+    assert reactions.toggle_reaction(session, reader.id, review.id, True)["action"] == "added"
+
+    # a second click racing the first one: its DELETE saw no row, its INSERT conflicts
+    monkeypatch.setattr(reactions, "_delete_reaction", lambda connection, user_id, review_id: None)
+    result = reactions.toggle_reaction(session, reader.id, review.id, True)
+
+    assert result == {"action": "unchanged", "total_likes": 1, "total_dislikes": 0}
+    assert ReviewReactions.query.filter_by(review_id=review.id).count() == 1
+
+
+def test_write_behind_reactions_are_flushed_in_batches(session, spare_part, add_reviews):
+    add_reviews(spare_part, 3)
+    session.query(ReviewReactions).delete()
+    session.commit()
+    first, second, third = Reviews.query.order_by(Reviews.rating).all()
+    readers = [Users(email=f"reader.{i}@example.com", password_hash="x") for i in range(4)]
+    session.add_all(readers)
+    session.commit()
+    version = spare_part.version
+
+    for reader in readers:
+        result = reactions.toggle_reaction(session, reader.id, first.id, True, write_behind=True)
+    reactions.toggle_reaction(session, readers[0].id, second.id, False, write_behind=True)
+    reactions.toggle_reaction(session, readers[1].id, third.id, True, write_behind=True)
+    undo = reactions.toggle_reaction(session, readers[1].id, third.id, True, write_behind=True)
+
+    # the reply counts the queued deltas: it matches what the flush will store
+    assert result == {"action": "added", "total_likes": 4, "total_dislikes": 0}
+    assert undo == {"action": "removed", "total_likes": 0, "total_dislikes": 0}
+
+    # reactions are recorded, counters untouched until the flush
+    assert ReviewReactions.query.count() == 5
+    session.expire_all()
+    assert (first.total_likes, second.total_dislikes) == (0, 0)
+    assert spare_part.version == version
+
+    assert reactions.flush_reaction_deltas(session, batch_size=4) == (7, 2)
+
+    session.expire_all()
+    assert (first.total_likes, second.total_dislikes, third.total_likes) == (4, 1, 0)
+    assert spare_part.version == version + 2
+    assert ReviewReactionDeltas.query.count() == 0
+    assert reactions.flush_reaction_deltas(session) == (0, 0)
+
+
 # ---------------------- ORDERS MODEL ----------------------
 def test_order_total_calculation():
     order = Orders(
@@ -106,3 +314,47 @@ def test_order_total_calculation():
 
     assert order.total_price == 180.0
 
+
+# ---------------------- COMPILED SERIALIZERS ----------------------
+def test_compiled_serializers_match_to_dict(session):
+    user = Users(email="jane.doe@example.com")
+    user.set_password("password123")
+    part = SpareParts(category="tyre", vehicle_type="suv", brand="Michelin", buying_price=100, marked_price=120)
+    session.add_all([user, part])
+    session.flush()
+
+    review = Reviews(user_id=user.id, sparepart_id=part.id, rating=5, comment="Great")
+    order = Orders(user_id=user.id, street="1 Main", city="Nairobi", country="Kenya")
+    session.add_all([review, order])
+    session.flush()
+    session.add_all([
+        ReviewReactions(user_id=user.id, review_id=review.id, is_like=True),
+        OrderItems(order_id=order.id, sparepart_id=part.id, quantity=2, unit_price=100, subtotal=200),
+    ])
+    session.commit()
+
+    assert SPAREPART(part) == part.to_dict()
+    assert SPAREPART_WITHOUT_REVIEWS(part) == part.to_dict(rules=("-reviews",))
+    assert REVIEW(review) == review.to_dict()
+    assert ORDER(order) == order.to_dict()
+    assert ORDER_ITEM(order.order_items[0]) == order.order_items[0].to_dict()
+    assert USER(user) == user.to_dict()
+
+    # flat plans serialize Core rows the same way
+    row = session.execute(SPAREPART_WITHOUT_REVIEWS.select()).one()
+    assert SPAREPART_WITHOUT_REVIEWS(row) == part.to_dict(rules=("-reviews",))
+
+    assert benchmark(REVIEW, [review], number=2)["identical"] is True
+
+
+# ---------------------- CELERY TASKS ----------------------
+def test_celery_tasks_share_one_app_per_worker(monkeypatch):
+    import app as app_module
+    from utils import celery_worker
+
+    built = []
+    monkeypatch.setattr(celery_worker, "_flask_app", None)
+    monkeypatch.setattr(app_module, "create_app", lambda: built.append(object()) or built[-1])
+
+    assert celery_worker.flask_app() is celery_worker.flask_app()
+    assert len(built) == 1
@@ -0,0 +1,168 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def params_digest(params):
+    return hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+# ------------------------------ BACKENDS ---------------------------------
+class MemoryCacheBackend:
+    """In-process LRU cache with a per-entry TTL."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._store = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._store[key]
+                return None
+
+            # mark as most recently used
+            self._store.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._store[key] = (value, time.monotonic() + ttl)
+            self._store.move_to_end(key)
+
+            # evict least recently used
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._store.clear()
+
+    def size(self):
+        return len(self._store)
+
+
+class RedisCacheBackend:
+    """
+    Redis-protocol backend (Redis, Valkey, KeyDB...), shared by all workers.
+    Eviction is left to the server's maxmemory-policy (eg. allkeys-lru);
+    every entry is written with a TTL.
+    """
+
+    def __init__(self, url, prefix="tts:cache:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl):
+        self._client.setex(self.prefix + key, int(max(ttl, 1)), json.dumps(value))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self._client.scan_iter(match=self.prefix + "*"):
+            self._client.delete(key)
+
+    def size(self):
+        return sum(1 for _ in self._client.scan_iter(match=self.prefix + "*"))
+
+
+# ------------------------------ RESPONSE CACHE ---------------------------------
+class ResponseCache:
+    """
+    Response cache for catalog reads.
+
+    Entries are namespaced by the catalog version (read through
+    `version_getter`): bumping the version on any spare part write makes
+    every older entry unreachable, and the stale entries simply age out
+    through LRU/TTL.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryCacheBackend()
+        self.ttl = 300
+        self.enabled = True
+        self.version_getter = lambda: 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get("CACHE_ENABLED", True)
+        self.ttl = app.config.get("CACHE_TTL_SECONDS", 300)
+
+        if app.config.get("CACHE_BACKEND", "memory") == "redis":
+            self.backend = RedisCacheBackend(app.config["CACHE_REDIS_URL"])
+        else:
+            self.backend = MemoryCacheBackend(app.config.get("CACHE_MAX_ENTRIES", 1024))
+
+        app.extensions["response_cache"] = self
+
+    # ---------------- Versioning ----------------
+    def catalog_version(self):
+        return self.version_getter()
+
+    # ---------------- Keys ----------------
+    def make_key(self, namespace, params, version=None):
+        """Stable key from normalized params, scoped to the (current) catalog version."""
+        if version is None:
+            version = self.catalog_version()
+        return f"{namespace}:v{version}:{params_digest(params)}"
+
+    # ---------------- Read / Write ----------------
+    def get(self, key):
+        if not self.enabled:
+            return None
+
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        if self.enabled:
+            self.backend.set(key, value, ttl or self.ttl)
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": self.backend.size(),
+            "catalog_version": self.catalog_version(),
+        }
@@ -1,13 +1,40 @@
 import os
-from celery import Celery
+from celery import Celery, Task
 from dotenv import load_dotenv
+from flask import has_app_context
 
 load_dotenv()
 
+# One Flask app (and so one engine / connection pool) per worker process,
+# built on the first task and shared by every task after it
+_flask_app = None
+
+
+def flask_app():
+    global _flask_app
+    if _flask_app is None:
+        from app import create_app
+        _flask_app = create_app()
+    return _flask_app
+
+
+class ContextTask(Task):
+    """Runs each task inside the worker's shared Flask app context."""
+
+    def __call__(self, *args, **kwargs):
+        # eager / inline calls from a request already have one
+        if has_app_context():
+            return self.run(*args, **kwargs)
+
+        with flask_app().app_context():
+            return self.run(*args, **kwargs)
+
+
 celery = Celery(
     "worker",
     broker=os.getenv("CELERY_BROKER_URL"),
-    backend=os.getenv("CELERY_RESULT_BACKEND")
+    backend=os.getenv("CELERY_RESULT_BACKEND"),
+    task_cls=ContextTask,
 )
 
 celery.conf.update(
@@ -18,5 +45,32 @@ celery.conf.update(
     enable_utc=True,
 )
 
+# Periodic jobs (run with: celery -A utils.celery_worker beat)
+celery.conf.beat_schedule = {
+    "refresh-price-buckets": {
+        "task": "utils.tasks.refresh_price_buckets_task",
+        "schedule": float(os.getenv("PRICE_BUCKET_REFRESH_SECONDS", 3600)),
+    },
+    "reconcile-review-stats": {
+        "task": "utils.tasks.reconcile_review_stats_task",
+        "schedule": float(os.getenv("REVIEW_STATS_RECONCILE_SECONDS", 86400)),
+    },
+    # review totals reach the cached listings with at most this delay
+    "publish-review-stats": {
+        "task": "utils.tasks.publish_review_stats_task",
+        "schedule": float(os.getenv("REVIEW_STATS_PUBLISH_SECONDS", 30)),
+        "options": {"expires": 60},
+    },
+}
+
+# Write-behind reaction counters: apply the queued deltas every few hundred ms
+if os.getenv("REACTIONS_WRITE_BEHIND", "false").lower() == "true":
+    celery.conf.beat_schedule["flush-reaction-deltas"] = {
+        "task": "utils.tasks.flush_reaction_deltas_task",
+        "schedule": float(os.getenv("REACTION_FLUSH_SECONDS", 0.25)),
+        # a missed flush is superseded by the next one
+        "options": {"expires": 5},
+    }
+
 # Import all tasks so Celery registers them
 import utils.tasks  
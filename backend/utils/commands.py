@@ -0,0 +1,56 @@
+import click
+from core.extensions import db
+from database.price_buckets import run_price_bucket_refresh
+from database.review_stats import reconcile_review_stats, publish_review_stats
+from database.reactions import flush_reaction_deltas
+from database.models import Users, SpareParts, Reviews, Orders, OrderItems
+from apis.serializers import benchmark, SPAREPART, REVIEW, ORDER, ORDER_ITEM, USER
+
+
+def register_commands(app):
+    @app.cli.command("refresh-price-buckets")
+    def refresh_price_buckets_command():
+        """Recompute price bucket thresholds and re-bucket every spare part."""
+        applied = run_price_bucket_refresh(db.session)
+
+        for group, thresholds in sorted(applied.items()):
+            click.echo(f"{group}: low < {thresholds['low']:.2f} <= medium <= {thresholds['medium']:.2f} (n={thresholds['sample_size']})")
+
+        click.echo(f"Refreshed price buckets for {len(applied)} groups")
+
+    @app.cli.command("reconcile-review-stats")
+    def reconcile_review_stats_command():
+        """Recompute every part's review totals, star histogram and average from its reviews (fixes drift)."""
+        corrected = reconcile_review_stats(db.session)
+        click.echo(f"Corrected review stats of {corrected} spare parts")
+
+    @app.cli.command("publish-review-stats")
+    def publish_review_stats_command():
+        """Publish the review totals changed since the last run to the cached listings."""
+        published = publish_review_stats(db.session)
+        click.echo(f"Published review stats of {published} spare parts")
+
+    @app.cli.command("flush-reaction-deltas")
+    def flush_reaction_deltas_command():
+        """Apply the reaction counter deltas queued in write-behind mode."""
+        applied, updated = flush_reaction_deltas(db.session)
+        click.echo(f"Applied {applied} reaction deltas to {updated} reviews")
+
+    @app.cli.command("benchmark-serializers")
+    @click.option("--limit", default=200, help="Rows per model")
+    @click.option("--number", default=20, help="Passes per serializer")
+    def benchmark_serializers_command(limit, number):
+        """Compare SerializerMixin.to_dict() with the compiled serializers on current data."""
+        for model, serializer in (
+            (SpareParts, SPAREPART),
+            (Reviews, REVIEW),
+            (Orders, ORDER),
+            (OrderItems, ORDER_ITEM),
+            (Users, USER),
+        ):
+            result = benchmark(serializer, model.query.limit(limit).all(), number=number)
+            speedup = result["to_dict"] / result["compiled"] if result["compiled"] else 0
+            click.echo(
+                f"{model.__name__}: {result['rows']} rows, to_dict {result['to_dict'] * 1000:.2f} ms, "
+                f"compiled {result['compiled'] * 1000:.2f} ms ({speedup:.1f}x), identical={result['identical']}"
+            )
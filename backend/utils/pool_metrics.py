@@ -0,0 +1,142 @@
+import threading
+import time
+import weakref
+from collections import deque
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# ------------------ Connection Pool Metrics ------------------
+# Per engine (primary + replica binds): connections in use / overflow from
+# the pool events, and how long requests waited for a connection, timed in
+# TimedQueuePool (there is no "before checkout" pool event).
+
+WAIT_SAMPLES = 1000
+
+
+class PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds):
+        with self.lock:
+            self.waits.append(seconds)
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self):
+        with self.lock:
+            waits = sorted(self.waits)
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkout_wait_ms": {
+                    "samples": len(waits),
+                    "avg": round(sum(waits) / len(waits) * 1000, 3) if waits else 0.0,
+                    "p95": round(waits[min(int(len(waits) * 0.95), len(waits) - 1)] * 1000, 3) if waits else 0.0,
+                    "max": round(self.max_wait * 1000, 3),
+                },
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that times every checkout, including waits for a free connection."""
+
+    stats = None
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; the numbers carry on
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        if self.stats is None:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self.stats.lock:
+                self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+
+_engine_stats = weakref.WeakKeyDictionary()
+
+
+def instrument_engine(engine):
+    if engine in _engine_stats:
+        return
+
+    stats = _engine_stats[engine] = PoolStats()
+    engine.pool.stats = stats
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with stats.lock:
+            stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with stats.lock:
+            stats.checkouts += 1
+            stats.in_use += 1
+            stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with stats.lock:
+            stats.checkins += 1
+            stats.in_use = max(stats.in_use - 1, 0)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        with stats.lock:
+            stats.invalidations += 1
+
+
+def pool_metrics(engines):
+    """{bind: stats} for every engine, with the pool's own sizing where it has one."""
+    result = {}
+
+    for key, engine in engines.items():
+        pool = engine.pool
+        stats = _engine_stats.get(engine)
+        if stats is None:
+            continue
+
+        metrics = stats.snapshot()
+        metrics.update(
+            pool=type(pool).__name__,
+            size=pool.size() if hasattr(pool, "size") else None,
+            checked_out=pool.checkedout() if hasattr(pool, "checkedout") else metrics["in_use"],
+            overflow=max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+            max_overflow=getattr(pool, "_max_overflow", None),
+            timeout=pool.timeout() if hasattr(pool, "timeout") else None,
+        )
+        result[key or "primary"] = metrics
+
+    return result
+
+
+def init_pool_metrics(app, db):
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
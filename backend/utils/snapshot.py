@@ -0,0 +1,206 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from flask import current_app
+from core.extensions import db
+from database.models import SpareParts
+from database.catalog_version import current_catalog_version
+from apis.serializers import SPAREPART_WITHOUT_REVIEWS
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# ------------------ Catalog Snapshot ------------------
+# The whole public catalog (listing items, default price order) as one
+# pre-compressed JSON document per catalog version:
+#
+#   <dir>/catalog-v<version>.json.gz   (+ .json.br when brotli is installed)
+#   <dir>/catalog.json                 manifest of the current snapshot
+#
+# Files are written to a temp name and renamed into place, so readers never
+# see a partial snapshot and concurrent builds are harmless.
+#
+# Each web host builds into its own directory (the one it serves from), in a
+# background thread: a request for a stale snapshot gets the last good one
+# while a single rebuild per process runs. Only the very first request, with
+# nothing to serve yet, waits for a build.
+
+MANIFEST = "catalog.json"
+ENCODINGS = {"br": ".json.br", "gzip": ".json.gz"}
+SNAPSHOT_BATCH_SIZE = 1000
+
+_build_lock = threading.Lock()
+
+
+def snapshot_dir():
+    return current_app.config.get("CATALOG_SNAPSHOT_DIR") or os.path.join(current_app.instance_path, "snapshots")
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _catalog_chunks(session, version):
+    """The snapshot JSON document, produced in pieces straight from Core rows."""
+    rows = session.execute(
+        SPAREPART_WITHOUT_REVIEWS.select()
+        .order_by(SpareParts.buying_price, SpareParts.id)
+        .execution_options(yield_per=SNAPSHOT_BATCH_SIZE)
+    )
+
+    yield '{"version":%d,"generated_at":%s,"items":[' % (version, json.dumps(datetime.utcnow().isoformat()))
+    for i, row in enumerate(rows):
+        yield ("," if i else "") + json.dumps(SPAREPART_WITHOUT_REVIEWS(row), separators=(",", ":"))
+    yield "]}"
+
+
+def build_catalog_snapshot(session, directory):
+    """Write the snapshot of the current catalog version and point the manifest at it."""
+    os.makedirs(directory, exist_ok=True)
+
+    version = current_catalog_version(session.connection())
+    previous = load_manifest(directory)
+    base = f"catalog-v{version}"
+    tmp = f".{os.getpid()}-{threading.get_ident()}.tmp"
+
+    digest = hashlib.sha256()
+    size = 0
+    gz_path = os.path.join(directory, base + ENCODINGS["gzip"])
+    br_path = os.path.join(directory, base + ENCODINGS["br"])
+
+    compressor = brotli.Compressor(quality=9) if brotli else None
+    br_file = open(br_path + tmp, "wb") if compressor else None
+
+    try:
+        with gzip.open(gz_path + tmp, "wb", compresslevel=9) as gz_file:
+            for chunk in _catalog_chunks(session, version):
+                data = chunk.encode()
+                digest.update(data)
+                size += len(data)
+                gz_file.write(data)
+                if compressor:
+                    br_file.write(compressor.process(data))
+
+        if compressor:
+            br_file.write(compressor.finish())
+            br_file.close()
+            os.replace(br_path + tmp, br_path)
+
+        os.replace(gz_path + tmp, gz_path)
+    except Exception:
+        for path in (gz_path + tmp, br_path + tmp):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+    finally:
+        if br_file and not br_file.closed:
+            br_file.close()
+
+    manifest = {
+        "version": version,
+        "sha256": digest.hexdigest(),
+        "size": size,
+        "files": {
+            encoding: base + suffix
+            for encoding, suffix in ENCODINGS.items()
+            if os.path.exists(os.path.join(directory, base + suffix))
+        },
+    }
+
+    manifest_path = os.path.join(directory, MANIFEST)
+    with open(manifest_path + tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(manifest_path + tmp, manifest_path)
+
+    _remove_old_snapshots(directory, manifest, previous)
+    return manifest
+
+
+def _remove_old_snapshots(directory, manifest, previous=None):
+    # the previous files stay until the next build: a request may have read the old manifest
+    keep = set(manifest["files"].values()) | set((previous or {}).get("files", {}).values())
+    for name in os.listdir(directory):
+        if name.startswith("catalog-v") and not name.endswith(".tmp") and name not in keep:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def _rebuild(app, directory):
+    try:
+        with app.app_context():
+            build_catalog_snapshot(db.session, directory)
+    except Exception as e:
+        logger.warning("Catalog snapshot build failed: %s", e)
+    finally:
+        _build_lock.release()
+
+
+def _start_thread(target, *args):
+    threading.Thread(target=target, args=args, daemon=True).start()
+
+
+def refresh_in_background(directory=None):
+    """Start a rebuild unless one is already running in this process; returns whether it started."""
+    if not _build_lock.acquire(blocking=False):
+        return False
+
+    try:
+        _start_thread(_rebuild, current_app._get_current_object(), directory or snapshot_dir())
+    except Exception:
+        _build_lock.release()
+        raise
+    return True
+
+
+def current_snapshot(session, version):
+    """
+    Manifest to serve for `version`. A stale snapshot is served as is while
+    a background rebuild runs (inline when CATALOG_SNAPSHOT_ASYNC is off);
+    without any snapshot the first one is built before answering.
+    """
+    directory = snapshot_dir()
+    manifest = load_manifest(directory)
+
+    if manifest is not None and manifest["version"] != version:
+        if current_app.config.get("CATALOG_SNAPSHOT_ASYNC"):
+            refresh_in_background(directory)
+            return manifest
+
+    if manifest is None or manifest["version"] != version:
+        with _build_lock:
+            manifest = load_manifest(directory)
+            if manifest is None or manifest["version"] != version:
+                manifest = build_catalog_snapshot(session, directory)
+
+    return manifest
+
+
+def schedule_snapshot_refresh():
+    """
+    Rebuild after an admin catalog change: in the background when
+    CATALOG_SNAPSHOT_ASYNC is set, otherwise inline.
+    """
+    if current_app.config.get("CATALOG_SNAPSHOT_ASYNC"):
+        refresh_in_background()
+        return
+
+    try:
+        build_catalog_snapshot(db.session, snapshot_dir())
+    except Exception as e:
+        # the endpoint rebuilds on demand, an admin change must not fail on this
+        db.session.rollback()
+        logger.warning("Catalog snapshot build failed: %s", e)
@@ -1,6 +1,9 @@
 from utils.celery_worker import celery
 from utils.brevo_email import send_otp_email
 
+# Tasks run inside the worker's shared Flask app context (ContextTask in
+# utils/celery_worker.py), so they use db.session directly.
+
 @celery.task(name="utils.tasks.send_email_task")
 def send_email_task(user_email: str, otp_code: str):
     """
@@ -10,3 +13,54 @@ def send_email_task(user_email: str, otp_code: str):
     # Prints OTP in worker logs
     success = send_otp_email(user_email, otp_code)
     return success
+
+@celery.task(name="utils.tasks.refresh_price_buckets_task")
+def refresh_price_buckets_task():
+    """
+    Periodic (celery beat) refresh of the per category / vehicle type
+    price bucket thresholds.
+    """
+    from core.extensions import db
+    from database.price_buckets import run_price_bucket_refresh
+
+    applied = run_price_bucket_refresh(db.session)
+
+    return len(applied)
+
+@celery.task(name="utils.tasks.reconcile_review_stats_task")
+def reconcile_review_stats_task():
+    """
+    Periodic (celery beat) correction of drifted review totals / averages.
+    """
+    from core.extensions import db
+    from database.review_stats import reconcile_review_stats
+
+    corrected = reconcile_review_stats(db.session)
+
+    return corrected
+
+@celery.task(name="utils.tasks.publish_review_stats_task")
+def publish_review_stats_task():
+    """
+    Periodic (celery beat) publication of the changed review totals to the
+    cached listings (one catalog version bump).
+    """
+    from core.extensions import db
+    from database.review_stats import publish_review_stats
+
+    published = publish_review_stats(db.session)
+
+    return published
+
+@celery.task(name="utils.tasks.flush_reaction_deltas_task")
+def flush_reaction_deltas_task():
+    """
+    Periodic (celery beat, write-behind mode) application of the queued
+    reaction counter deltas.
+    """
+    from core.extensions import db
+    from database.reactions import flush_reaction_deltas
+
+    applied, updated = flush_reaction_deltas(db.session)
+
+    return applied
@@ -157,6 +157,8 @@ const BuyerItemDetails = () => {
 
   const [item, setItem] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [reviewsCursor, setReviewsCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
 
@@ -166,14 +168,22 @@ const BuyerItemDetails = () => {
   const [editRating, setEditRating] = useState(0);
   const [editComment, setEditComment] = useState("");
 
-  /* ---------- Fetch Item + Reviews ---------- */
+  // my_reaction is the viewer's own reaction ("like" / "dislike" / null),
+  // sent when the reviews are fetched with the viewer's token
+  const formatReview = (r) => ({
+    ...r,
+    user_reaction: r.my_reaction === "like" ? true : r.my_reaction === "dislike" ? false : null,
+    display_name: r.user_display_name || "User",
+  });
+
+  /* ---------- Fetch Item + Reviews (first page) ---------- */
   const fetchItemAndReviews = async () => {
     setLoading(true);
     setError(false);
     try {
       const [itemRes, reviewsRes] = await Promise.all([
         fetch(`${config.API_BASE_URL}/spareparts/${id}`),
-        fetch(`${config.API_BASE_URL}/reviews/${id}`),
+        authFetch(`${config.API_BASE_URL}/reviews/${id}`),
       ]);
 
       if (!itemRes.ok || !reviewsRes.ok) throw new Error("Failed to fetch data");
@@ -181,22 +191,9 @@ const BuyerItemDetails = () => {
       const itemData = await itemRes.json();
       const reviewData = await reviewsRes.json();
 
-      const reviewsWithReaction = reviewData.map((r) => {
-        const userReaction = r.likes?.find((l) => l.user_id === currentUserId);
-        return {
-          ...r,
-          user_reaction:
-            userReaction === undefined
-              ? null
-              : userReaction.is_like
-              ? true
-              : false,
-          display_name: r.user_display_name || "User",
-        };
-      });
-
       setItem(itemData);
-      setReviews(reviewsWithReaction);
+      setReviews(reviewData.items.map(formatReview));
+      setReviewsCursor(reviewData.next_cursor);
     } catch (err) {
       console.error(err);
       setError(true);
@@ -205,11 +202,37 @@ const BuyerItemDetails = () => {
     }
   };
 
+  /* ---------- Next Page of Reviews ---------- */
+  const loadMoreReviews = async () => {
+    if (!reviewsCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await authFetch(
+        `${config.API_BASE_URL}/reviews/${id}?cursor=${encodeURIComponent(reviewsCursor)}`
+      );
+      if (!res.ok) throw new Error("Failed to load more reviews");
+
+      const data = await res.json();
+      setReviews((prev) => [...prev, ...data.items.map(formatReview)]);
+      setReviewsCursor(data.next_cursor);
+    } catch (err) {
+      toast.error(err.message || "Failed to load more reviews");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchItemAndReviews();
   }, [id]);
 
   const averageRating = Number(item?.average_rating || 0);
+  // only one page of reviews is loaded: the counts come from the part
+  const ratingCount = Object.values(item?.rating_summary?.histogram?.ratings || {}).reduce(
+    (sum, count) => sum + count,
+    0
+  );
+  const totalReviews = item?.rating_summary?.total_reviews ?? reviews.length;
   const userReview = reviews.find((r) => r.user_id === currentUserId);
 
   /* ---------- Review Actions ---------- */
@@ -365,7 +388,7 @@ const BuyerItemDetails = () => {
           <div style={{ display: "flex", alignItems: "center", gap: 5 }}>
             <StarRating value={averageRating} readonly size={22} />
             <span>
-              {averageRating.toFixed(1)} ({reviews.filter((r) => r.rating != null).length})
+              {averageRating.toFixed(1)} ({ratingCount})
             </span>
           </div>
           <button onClick={() => addItem(item)}>Add To Cart</button>
@@ -390,7 +413,7 @@ const BuyerItemDetails = () => {
       )}
 
       <div className="reviews-section">
-        <h3>Customer Reviews ({reviews.filter((r) => r.comment?.trim()).length})</h3>
+        <h3>Customer Reviews ({totalReviews})</h3>
         {sortedReviews.map((r) => (
           <div key={r.id} className="review-card">
             {editingReviewId === r.id ? (
@@ -440,6 +463,11 @@ const BuyerItemDetails = () => {
             )}
           </div>
         ))}
+        {reviewsCursor && (
+          <button className="load-more-btn" onClick={loadMoreReviews} disabled={loadingMore}>
+            {loadingMore ? "Loading..." : "Load more reviews"}
+          </button>
+        )}
       </div>
     </div>
   );
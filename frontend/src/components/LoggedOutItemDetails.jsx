@@ -111,9 +111,17 @@ const LoggedOutItemDetails = () => {
 
   const [item, setItem] = useState(null);
   const [reviews, setReviews] = useState([]);
+  const [reviewsCursor, setReviewsCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(false);
 
+  const formatReview = (r) => ({
+    ...r,
+    display_name: r.user_display_name || "User",
+    comment: r.comment || "",
+  });
+
   const fetchItemAndReviews = async () => {
     setLoading(true);
     setError(false);
@@ -125,18 +133,11 @@ const LoggedOutItemDetails = () => {
       const itemData = await itemRes.json();
 
       const reviewsRes = await fetch(`${config.API_BASE_URL}/reviews/${id}`);
-      const reviewData = reviewsRes.ok ? await reviewsRes.json() : [];
-
-      const reviewsFormatted = Array.isArray(reviewData)
-        ? reviewData.map((r) => ({
-            ...r,
-            display_name: r.user_display_name || "User",
-            comment: r.comment || r.text || "",
-          }))
-        : [];
+      const reviewData = reviewsRes.ok ? await reviewsRes.json() : { items: [], next_cursor: null };
 
       setItem(itemData);
-      setReviews(reviewsFormatted);
+      setReviews(reviewData.items.map(formatReview));
+      setReviewsCursor(reviewData.next_cursor);
     } catch (err) {
       console.error(err);
       setError(true);
@@ -146,6 +147,25 @@ const LoggedOutItemDetails = () => {
     }
   };
 
+  const loadMoreReviews = async () => {
+    if (!reviewsCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await fetch(
+        `${config.API_BASE_URL}/reviews/${id}?cursor=${encodeURIComponent(reviewsCursor)}`
+      );
+      if (!res.ok) throw new Error("Failed to load more reviews");
+
+      const data = await res.json();
+      setReviews((prev) => [...prev, ...data.items.map(formatReview)]);
+      setReviewsCursor(data.next_cursor);
+    } catch (err) {
+      toast.error(err.message || "Failed to load more reviews");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     fetchItemAndReviews();
   }, [id]);
@@ -156,6 +176,8 @@ const LoggedOutItemDetails = () => {
   if (!item) return <ErrorState onRetry={fetchItemAndReviews} />;
 
   const averageRating = Number(item?.average_rating || 0);
+  // only one page of reviews is loaded: the count comes from the part
+  const totalReviews = item.rating_summary?.total_reviews ?? reviews.length;
 
   return (
     <div className="item-details">
@@ -181,8 +203,7 @@ const LoggedOutItemDetails = () => {
           <div style={{ display: "flex", alignItems: "center", gap: 5 }}>
             <StarRating value={averageRating} size={22} />
             <span>
-              {averageRating.toFixed(1)} (
-              {reviews.filter((r) => r.comment?.trim()).length})
+              {averageRating.toFixed(1)} ({totalReviews})
             </span>
           </div>
         </div>
@@ -190,8 +211,7 @@ const LoggedOutItemDetails = () => {
 
     <div className="reviews-section">
      <h3>
-       Customer Reviews (
-      {reviews.filter((r) => r.comment?.trim()).length})
+       Customer Reviews ({totalReviews})
      </h3>
 
    {reviews.length === 0 ? (
@@ -224,6 +244,11 @@ const LoggedOutItemDetails = () => {
       </div>
     ))
   )}
+   {reviewsCursor && (
+    <button className="load-more-btn" onClick={loadMoreReviews} disabled={loadingMore}>
+      {loadingMore ? "Loading..." : "Load more reviews"}
+    </button>
+   )}
   </div>
     </div>
   );
@@ -140,23 +140,18 @@ const AdminItemDetails = () => {
       const reviewData = reviewsRes.ok ? await reviewsRes.json() : [];
 
       const reviewsWithReaction = Array.isArray(reviewData)
-        ? reviewData.map((r) => {
-            const userReaction = r.likes?.find(
-              (l) => l.user_id === currentUserId
-            );
-
-            return {
-              ...r,
-              user_reaction:
-                userReaction === undefined
-                  ? null
-                  : userReaction.is_like
-                  ? true
-                  : false,
-              display_name: r.user_display_name || "User",
-              comment: r.comment || r.text || "",
-            };
-          })
+        ? reviewData.map((r) => ({
+            ...r,
+            // the admin's own reaction: "like" / "dislike" / null
+            user_reaction:
+              r.my_reaction === "like"
+                ? true
+                : r.my_reaction === "dislike"
+                ? false
+                : null,
+            display_name: r.user_display_name || "User",
+            comment: r.comment || r.text || "",
+          }))
         : [];
 
       setItem(itemData);
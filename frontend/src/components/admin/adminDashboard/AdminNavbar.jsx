@@ -5,6 +5,9 @@ import { useAuth } from "../../../contexts/AuthContext";
 import config from "../../../config";
 import "../../../styles/admin/adminNavbar.css";
 
+// The badge shows at most "9+": one small page of the feed is enough to count
+const REVIEW_BADGE_PAGE = 11;
+
 const AdminNavbar = () => {
   const { logout, authFetch, user } = useAuth();
   const [showDropdown, setShowDropdown] = useState(false);
@@ -55,22 +58,21 @@ const AdminNavbar = () => {
   };
 
   // -------------------- REVIEW NOTIFICATIONS --------------------
-  const calculateReviewNotifications = (data = null) => {
-    const reviews = data || JSON.parse(localStorage.getItem("admin_reviews_cache")) || [];
-    const seen = JSON.parse(localStorage.getItem("admin_seen_review_ids")) || [];
-    const seenSet = new Set(seen);
-
-    const unseen = reviews.filter((r) => !seenSet.has(r.id)).length;
-    setNewReviewsCount(unseen);
-  };
-
+  // New reviews are the ones posted after the newest review the admin has seen
+  // (admin_reviews_seen_at); the feed is filtered server side with ?since=
   const fetchReviewNotifications = async () => {
     if (!user) return;
     try {
-      const res = await authFetch(`${config.API_BASE_URL}/admin/reviews`);
+      const seenAt = localStorage.getItem("admin_reviews_seen_at");
+      const params = new URLSearchParams({ per_page: REVIEW_BADGE_PAGE });
+      if (seenAt) params.set("since", seenAt);
+
+      const res = await authFetch(`${config.API_BASE_URL}/admin/reviews?${params}`);
+      if (!res.ok) throw new Error("Failed to fetch reviews");
       const data = await res.json();
-      localStorage.setItem("admin_reviews_cache", JSON.stringify(data));
-      calculateReviewNotifications(data);
+
+      // since is inclusive: skip the last seen review itself
+      setNewReviewsCount(data.items.filter((r) => !seenAt || r.created_at > seenAt).length);
     } catch (err) {
       console.error(err);
     }
@@ -78,10 +80,12 @@ const AdminNavbar = () => {
 
   const markReviewsAsSeen = async () => {
     try {
-      const res = await authFetch(`${config.API_BASE_URL}/admin/reviews`);
+      const res = await authFetch(`${config.API_BASE_URL}/admin/reviews?per_page=1`);
       const data = await res.json();
-      const allIds = data.map((r) => r.id);
-      localStorage.setItem("admin_seen_review_ids", JSON.stringify(allIds));
+      if (data.items.length) {
+        localStorage.setItem("admin_reviews_seen_at", data.items[0].created_at);
+      }
+      setNewReviewsCount(0);
       window.dispatchEvent(new Event("admin_reviews_updated"));
     } catch (err) {
       console.error(err);
@@ -94,14 +98,14 @@ const AdminNavbar = () => {
     fetchReviewNotifications();
 
     const handleOrders = () => calculateOrderNotifications();
-    const handleReviews = () => calculateReviewNotifications();
+    const handleReviews = () => fetchReviewNotifications();
 
     window.addEventListener("admin_orders_updated", handleOrders);
     window.addEventListener("admin_reviews_updated", handleReviews);
 
     const handleStorage = (e) => {
       if (e.key === "admin_orders_cache" || e.key === "admin_seen_order_ids") calculateOrderNotifications();
-      if (e.key === "admin_reviews_cache" || e.key === "admin_seen_review_ids") calculateReviewNotifications();
+      if (e.key === "admin_reviews_seen_at") fetchReviewNotifications();
     };
     window.addEventListener("storage", handleStorage);
 
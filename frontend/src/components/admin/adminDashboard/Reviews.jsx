@@ -36,6 +36,8 @@ const EmptyState = () => (
 const Reviews = () => {
   const { authFetch, user } = useAuth();
   const [reviews, setReviews] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
 
@@ -49,16 +51,8 @@ const Reviews = () => {
     ).padStart(2, "0")}/${date.getFullYear()}`;
   };
 
-  const hasReviewsChanged = (newData) => {
-    const prev = reviewsRef.current;
-    if (newData.length !== prev.length) return true;
-    const prevMap = new Map(prev.map((r) => [r.id, r.created_at]));
-    for (let r of newData) {
-      if (!prevMap.has(r.id) || prevMap.get(r.id) !== r.created_at) return true;
-    }
-    return false;
-  };
-
+  // The feed is paged newest first: the initial load takes the first page,
+  // polling only prepends the reviews posted since, older pages load on demand
   const fetchReviews = async (isInitial = false) => {
     if (!user) {
       if (isInitial) setLoading(false);
@@ -72,11 +66,19 @@ const Reviews = () => {
       const res = await authFetch(`${config.API_BASE_URL}/admin/reviews`);
       if (!res.ok) throw new Error("Failed to fetch reviews");
       const data = await res.json();
-      if (hasReviewsChanged(data)) {
-        setReviews(data);
-        reviewsRef.current = data;
-        localStorage.setItem("admin_reviews_cache", JSON.stringify(data));
-        window.dispatchEvent(new Event("admin_reviews_updated"));
+
+      if (isInitial || !reviewsRef.current.length) {
+        reviewsRef.current = data.items;
+        setReviews(data.items);
+        setNextCursor(data.next_cursor);
+        return;
+      }
+
+      const known = new Set(reviewsRef.current.map((r) => r.id));
+      const fresh = data.items.filter((r) => !known.has(r.id));
+      if (fresh.length) {
+        reviewsRef.current = [...fresh, ...reviewsRef.current];
+        setReviews(reviewsRef.current);
       }
     } catch (err) {
       setError(err.message);
@@ -85,13 +87,33 @@ const Reviews = () => {
     }
   };
 
+  const loadMoreReviews = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await authFetch(
+        `${config.API_BASE_URL}/admin/reviews?cursor=${encodeURIComponent(nextCursor)}`
+      );
+      if (!res.ok) throw new Error("Failed to fetch reviews");
+      const data = await res.json();
+
+      reviewsRef.current = [...reviewsRef.current, ...data.items];
+      setReviews(reviewsRef.current);
+      setNextCursor(data.next_cursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The navbar badge counts the reviews newer than the newest one seen here
   const markReviewsAsSeen = (data) => {
     if (!data || data.length === 0) return;
-    const existing = JSON.parse(localStorage.getItem("admin_seen_review_ids")) || [];
-    const allIds = data.map((r) => r.id);
-    const hasNew = allIds.some((id) => !existing.includes(id));
-    if (!hasNew) return;
-    localStorage.setItem("admin_seen_review_ids", JSON.stringify(allIds));
+    const newest = data[0].created_at;
+    const seenAt = localStorage.getItem("admin_reviews_seen_at");
+    if (seenAt && seenAt >= newest) return;
+    localStorage.setItem("admin_reviews_seen_at", newest);
     window.dispatchEvent(new Event("admin_reviews_updated"));
   };
 
@@ -121,7 +143,8 @@ const Reviews = () => {
   return (
     <div className="reviews-container">
       <div className="reviews-summary">
-        <strong>Total Reviews:</strong> {reviews.length}
+        <strong>Showing:</strong> {reviews.length}{" "}
+        {nextCursor ? "most recent reviews" : "reviews"}
       </div>
 
       {reviews.map((r) => (
@@ -172,6 +195,12 @@ const Reviews = () => {
           </div>
         </Link>
       ))}
+
+      {nextCursor && (
+        <button className="load-more-btn" onClick={loadMoreReviews} disabled={loadingMore}>
+          {loadingMore ? "Loading..." : "Load older reviews"}
+        </button>
+      )}
     </div>
   );
 };
@@ -67,7 +67,7 @@ const mockReviews = [
     comment: "Good product",
     total_likes: 2,
     total_dislikes: 1,
-    likes: [],
+    my_reaction: null,
     created_at: new Date().toISOString(),
     user_display_name: "John",
   },
@@ -85,19 +85,22 @@ beforeEach(() => {
         json: async () => mockItem,
       });
     }
-    if (url.includes("/reviews/")) {
+  });
+
+  // reviews are fetched with the viewer's token (for my_reaction)
+  authFetchMock.mockImplementation((url) => {
+    if (url.startsWith("http://test-api/reviews/1")) {
       return Promise.resolve({
         ok: true,
-        json: async () => mockReviews,
+        json: async () => ({ items: mockReviews, next_cursor: null }),
       });
     }
-  });
-
-  authFetchMock.mockResolvedValue({
-    ok: true,
-    json: async () => ({
-      review: { total_likes: 3, total_dislikes: 0 },
-    }),
+    return Promise.resolve({
+      ok: true,
+      json: async () => ({
+        review: { total_likes: 3, total_dislikes: 0 },
+      }),
+    });
   });
 });
 
@@ -118,6 +121,38 @@ describe("BuyerItemDetails", () => {
     expect(screen.getByText(/John/i)).toBeInTheDocument();
   });
 
+  it("loads the next page of reviews", async () => {
+    const olderReview = {
+      ...mockReviews[0],
+      id: 11,
+      user_id: 3,
+      comment: "Older review",
+      user_display_name: "Jane",
+    };
+
+    authFetchMock.mockImplementation((url) => {
+      if (url.includes("cursor=page2")) {
+        return Promise.resolve({
+          ok: true,
+          json: async () => ({ items: [olderReview], next_cursor: null }),
+        });
+      }
+      return Promise.resolve({
+        ok: true,
+        json: async () => ({ items: mockReviews, next_cursor: "page2" }),
+      });
+    });
+
+    renderComponent();
+
+    await screen.findByText(/Good product/i);
+    fireEvent.click(screen.getByText(/Load more reviews/i));
+
+    expect(await screen.findByText(/Older review/i)).toBeInTheDocument();
+    expect(screen.getByText(/Good product/i)).toBeInTheDocument();
+    expect(screen.queryByText(/Load more reviews/i)).not.toBeInTheDocument();
+  });
+
   it("adds item to cart", async () => {
     renderComponent();
 
@@ -139,7 +174,10 @@ describe("BuyerItemDetails", () => {
     fireEvent.click(screen.getByText(/Submit Review/i));
 
     await waitFor(() => {
-      expect(authFetchMock).toHaveBeenCalled();
+      expect(authFetchMock).toHaveBeenCalledWith(
+        "http://test-api/reviews/1",
+        expect.objectContaining({ method: "POST" })
+      );
     });
   });
 
@@ -151,12 +189,9 @@ describe("BuyerItemDetails", () => {
     expect(await screen.findByText(/Something went wrong/i)).toBeInTheDocument();
 
     // restore success
-    global.fetch = vi.fn((url) => {
-      if (url.includes("/spareparts/")) {
-        return Promise.resolve({ ok: true, json: async () => mockItem });
-      }
-      return Promise.resolve({ ok: true, json: async () => mockReviews });
-    });
+    global.fetch = vi.fn(() =>
+      Promise.resolve({ ok: true, json: async () => mockItem })
+    );
 
     fireEvent.click(screen.getByText(/Retry/i));
 
@@ -175,7 +210,30 @@ describe("BuyerItemDetails", () => {
     fireEvent.click(likeBtn);
 
     await waitFor(() => {
-      expect(authFetchMock).toHaveBeenCalled();
+      expect(authFetchMock).toHaveBeenCalledWith(
+        "http://test-api/reviews/10/react",
+        expect.objectContaining({ method: "POST" })
+      );
     });
   });
+
+  it("highlights the viewer's own reaction", async () => {
+    authFetchMock.mockImplementation(() =>
+      Promise.resolve({
+        ok: true,
+        json: async () => ({
+          items: [{ ...mockReviews[0], my_reaction: "dislike" }],
+          next_cursor: null,
+        }),
+      })
+    );
+
+    renderComponent();
+
+    await screen.findByText(/Good product/i);
+
+    const [likeBtn, dislikeBtn] = document.querySelectorAll(".review-reactions button");
+    expect(dislikeBtn).toHaveClass("active");
+    expect(likeBtn).not.toHaveClass("active");
+  });
 });
\ No newline at end of file